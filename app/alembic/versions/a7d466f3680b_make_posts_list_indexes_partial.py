@@ -0,0 +1,47 @@
+"""make posts list indexes partial
+
+Revision ID: a7d466f3680b
+Revises: f19b6d3e8a52
+Create Date: 2026-01-21 10:42:17.318542
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d466f3680b'
+down_revision: Union[str, Sequence[str], None] = 'f19b6d3e8a52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 삭제된 게시글은 목록 조회에서 항상 제외되므로 인덱스에서도 제외한다 (autogenerate 가 조건 변경을 감지하지 못해 직접 작성)
+    op.drop_index('ix_posts_created_at_id', table_name='posts')
+    op.create_index(
+        'ix_posts_created_at_id',
+        'posts',
+        ['created_at', 'id'],
+        unique=False,
+        postgresql_where=sa.text('is_delete = false'),
+    )
+    op.drop_index('ix_posts_updated_at_id', table_name='posts')
+    op.create_index(
+        'ix_posts_updated_at_id',
+        'posts',
+        ['updated_at', 'id'],
+        unique=False,
+        postgresql_where=sa.text('is_delete = false'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_posts_updated_at_id', table_name='posts', postgresql_where=sa.text('is_delete = false'))
+    op.create_index('ix_posts_updated_at_id', 'posts', ['updated_at', 'id'], unique=False)
+    op.drop_index('ix_posts_created_at_id', table_name='posts', postgresql_where=sa.text('is_delete = false'))
+    op.create_index('ix_posts_created_at_id', 'posts', ['created_at', 'id'], unique=False)
@@ -1,34 +1,107 @@
+import logging
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
+from fastapi.security.utils import get_authorization_scheme_param
 from pydantic_settings import BaseSettings
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app import crud
 from app.core.config import get_setting
-from app.core.database import get_session
+from app.core.database import async_session, get_session, has_recent_write, mark_recent_write, replica_router
+from app.core.db_metrics import route_label, track_db_route
+from app.core.redis_client import RedisAsyncDep  # noqa: TC001
 from app.core.security import verify_access_token
 from app.models import User
+from app.schemas import Principal
+
+logger = logging.getLogger(__name__)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/v1/auth/login")
 
 
-AsyncSessionDep = Annotated[AsyncSession, Depends(get_session)]
+# 라우트 함수가 끝나면 바로 연결을 반환하도록 function scope 로 사용 (get_session 참고)
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_session, scope="function")]
+
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+async def _is_recent_writer(request: Request, cache: RedisAsyncDep) -> bool:
+    scheme, token = get_authorization_scheme_param(request.headers.get("Authorization"))
+    if scheme.lower() != "bearer" or not (data := verify_access_token(token)):
+        return False
+
+    try:
+        return await has_recent_write(cache, int(data["sub"]))
+    except RedisError:
+        # 확인할 수 없으면 자신이 쓴 내용을 놓치지 않도록 primary 사용
+        return True
+
+
+async def get_read_session(request: Request, cache: RedisAsyncDep):
+    """
+    읽기 전용 라우트용 세션 - replica 가 있으면 round-robin 으로 선택하고, 없거나 모두 응답하지 않으면 primary.
+    최근에 쓰기 요청을 보낸 사용자는 복제 지연으로 자신이 쓴 내용을 못 보는 일이 없도록 primary 를 사용한다.
+    (read-your-writes)
+    """
+    session_factory = replica_router.choose()
+    if session_factory is None or await _is_recent_writer(request, cache):
+        session_factory = async_session
 
+    with track_db_route(route_label(request)):
+        async with session_factory() as session:
+            yield session
+
+
+async def get_current_principal(
+    *, request: Request, session: AsyncSessionDep, cache: RedisAsyncDep, token: TokenDep
+) -> Principal:
+    """
+    토큰의 사용자 정보를 캐시에서 조회한다. (캐시 miss 시에만 DB 조회)
+    user.id 등 기본 정보만 필요한 라우트는 ORM 객체 대신 이 의존성을 사용한다.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Not authenticated",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
 
-async def get_current_user(*, session: AsyncSessionDep, token: TokenDep):
     data = verify_access_token(token)
     if not data:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise credentials_exception
+
+    principal = await crud.get_principal(session=session, user_id=int(data["sub"]))
+    if not principal or not principal.is_active or principal.is_delete:
+        raise credentials_exception
+
+    # 쓰기 요청이면 잠시 동안 이 사용자의 조회도 primary 로 보낸다 (get_read_session)
+    if replica_router.replicas and request.method not in SAFE_METHODS:
+        try:
+            await mark_recent_write(cache, principal.id)
+        except RedisError:
+            logger.warning("mark recent write failed", exc_info=True)
+
+    return principal
+
+
+async def get_current_superuser(*, principal: AuthPrincipalDep) -> Principal:
+    if not principal.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough privileges")
+    return principal
+
 
-    user = await session.get(User, data["sub"])
+async def get_current_user(*, session: AsyncSessionDep, principal: AuthPrincipalDep) -> User:
+    user = await session.get(User, principal.id)
     return user
 
 
 TokenDep = Annotated[str, Depends(oauth2_scheme)]
+# 읽기 전용 라우트용 - 최근에 쓰기 요청을 보낸 사용자가 아니면 replica 세션
+AsyncReadSessionDep = Annotated[AsyncSession, Depends(get_read_session, scope="function")]
+AuthPrincipalDep = Annotated[Principal, Depends(get_current_principal)]
 AuthUserDep = Annotated[User, Depends(get_current_user)]
+SuperuserPrincipalDep = Annotated[Principal, Depends(get_current_superuser)]
 SettingDep = Annotated[BaseSettings, Depends(get_setting)]
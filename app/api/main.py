@@ -1,12 +1,15 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from app.constants import APITagName
+from app.core.db_metrics import check_query_guard
 
-from .routes import auth, post, post_comment, user
+from .routes import admin, auth, post, post_comment, user
 
-api_v1_router = APIRouter()
+# 모든 라우트의 쿼리 수/N+1 검사 (라우트 함수가 끝난 뒤 검사하도록 function scope)
+api_v1_router = APIRouter(dependencies=[Depends(check_query_guard, scope="function")])
 
 api_v1_router.include_router(auth.router, prefix="/auth", tags=[APITagName.AUTH])
 api_v1_router.include_router(user.router, prefix="/user", tags=[APITagName.USER])
 api_v1_router.include_router(post.router, prefix="/posts", tags=[APITagName.POST])
 api_v1_router.include_router(post_comment.router, prefix="/post-comments", tags=[APITagName.POST])
+api_v1_router.include_router(admin.router, prefix="/admin", tags=[APITagName.ADMIN])
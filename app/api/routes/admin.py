@@ -0,0 +1,18 @@
+from fastapi import APIRouter, status
+
+from app.api.deps import SuperuserPrincipalDep  # noqa: TC001
+from app.core.db_metrics import slow_query_log
+from app.schemas import SlowQueryRead
+
+router = APIRouter()
+
+
+@router.get("/slow-queries", response_model=list[SlowQueryRead])
+async def get_slow_queries(_: SuperuserPrincipalDep):
+    # 요청을 처리한 프로세스(worker)의 기록만 반환
+    return slow_query_log.recent()
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries(_: SuperuserPrincipalDep):
+    slow_query_log.reset()
@@ -1,28 +1,32 @@
 import string
 from typing import Annotated
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm  # noqa: TCH002
-from fastapi_mail import FastMail, MessageSchema, MessageType
 from nanoid import generate
 
 from app import crud
-from app.api.deps import AsyncSessionDep, SettingDep  # noqa: TCH001
+from app.api.deps import AsyncSessionDep  # noqa: TCH001
 from app.constants import EmailVerificationAction
+from app.core.rate_limit import RateLimit
 from app.core.redis_client import RedisAsyncDep  # noqa: TC001
-from app.core.security import create_access_token, verify_password
-from app.schemas import BearerAccessToken, SendCodeRequest, VerificationCodeCreate
+from app.core.security import create_access_token, password_hasher
+from app.schemas import BearerAccessToken, MailCreate, SendCodeRequest, VerificationCodeCreate
 
 router = APIRouter()
 
 
-@router.post("/login", response_model=BearerAccessToken)
+@router.post(
+    "/login",
+    response_model=BearerAccessToken,
+    dependencies=[Depends(RateLimit("login", "ip")), Depends(RateLimit("login", "email"))],
+)
 async def login(*, session: AsyncSessionDep, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
     user = await crud.get_user_by_email(session=session, email=form_data.username)
 
     if not user:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
-    if not verify_password(form_data.password, user.hashed_password):
+    if not await password_hasher.verify(form_data.password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Incorrect email or password")
 
     access_token = create_access_token(sub=str(user.id), data={"id": user.id})
@@ -31,15 +35,17 @@ async def login(*, session: AsyncSessionDep, form_data: Annotated[OAuth2Password
     return bearer_access_token
 
 
-@router.post("/send-code", status_code=status.HTTP_202_ACCEPTED)
+@router.post(
+    "/send-code",
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(RateLimit("send_code", "ip")), Depends(RateLimit("send_code", "email"))],
+)
 async def send_verification_code(
     session: AsyncSessionDep,
     cache: RedisAsyncDep,
-    settings: SettingDep,
-    background_tasks: BackgroundTasks,
     request: SendCodeRequest,
 ):
-    user = await crud.get_user_by_email(session=session, email=request.email)
+    user = await crud.get_user_by_email(session=session, email=request.email, include_deleted=True)
 
     match request.action:
         case EmailVerificationAction.SIGNUP if not user:
@@ -52,11 +58,13 @@ async def send_verification_code(
                 "verification_code": code,
             }
 
-            message = MessageSchema(
-                subject=data["title"], recipients=[request.email], template_body=data, subtype=MessageType.html
+            mail_in = MailCreate(
+                subject=data["title"],
+                recipients=[request.email],
+                template_name="system_mail/verification_code.html",
+                template_body=data,
             )
-            fm = FastMail(settings.EMAIL)
-            background_tasks.add_task(fm.send_message, message, template_name="system_mail/verification_code.html")
+            await crud.enqueue_mail(cache=cache, mail_in=mail_in)
             return {"Code": "OK"}
 
         case _:
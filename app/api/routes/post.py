@@ -1,47 +1,111 @@
 from typing import Annotated
 
-from fastapi import APIRouter, HTTPException, Query, Response, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
 
 from app import crud
-from app.api.deps import AsyncSessionDep, AuthUserDep  # noqa: TC001
+from app.api.deps import AsyncReadSessionDep, AsyncSessionDep, AuthPrincipalDep, AuthUserDep  # noqa: TC001
+from app.constants import NEXT_CURSOR_HEADER
+from app.core.db_metrics import QueryBudget
+from app.core.rate_limit import RateLimit
+from app.core.redis_client import RedisAsyncDep  # noqa: TC001
+from app.core.trending import get_trending_short_ids, record_post_activity, remove_post_trending
+from app.core.view_counter import increment_post_view
 from app.schemas import (
+    PostBatchGetRequest,
+    PostBatchGetResponse,
     PostCreate,
     PostEdit,
     PostFilterParams,
     PostRead,
+    PostSearchParams,
+    PostSearchRead,
+    PostSuggestParams,
+    PostSuggestRead,
+    PostSummaryRead,
+    PostTrendingParams,
     PostWrite,
 )
 
 router = APIRouter()
 
 
-@router.get("", response_model=list[PostRead])
-async def get_posts(session: AsyncSessionDep, post_filter_params: Annotated[PostFilterParams, Query()]):
-    posts = await crud.get_post_list(session=session, params=post_filter_params)
-    return posts
+@router.get("", response_model=list[PostSummaryRead], dependencies=[Depends(QueryBudget(2))])
+async def get_posts(
+    session: AsyncReadSessionDep, response: Response, post_filter_params: Annotated[PostFilterParams, Query()]
+):
+    page = await crud.get_post_page(session=session, params=post_filter_params)
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
 
+    return page.items
 
-@router.get("/{short_id}", response_model=PostRead)
-async def get_post(session: AsyncSessionDep, short_id: str):
-    post = await crud.get_post_by_short_id(session=session, short_id=short_id)
+
+@router.get("/search", response_model=list[PostSearchRead], dependencies=[Depends(QueryBudget(2))])
+async def search_posts(
+    session: AsyncReadSessionDep, response: Response, search_params: Annotated[PostSearchParams, Query()]
+):
+    page = await crud.search_posts(session=session, params=search_params)
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+
+    return page.items
+
+
+@router.get("/suggest", response_model=list[PostSuggestRead], dependencies=[Depends(QueryBudget(1))])
+async def suggest_posts(session: AsyncSessionDep, suggest_params: Annotated[PostSuggestParams, Query()]):
+    return await crud.suggest_posts(session=session, params=suggest_params)
+
+
+@router.get("/trending", response_model=list[PostSummaryRead], dependencies=[Depends(QueryBudget(1))])
+async def get_trending_posts(
+    session: AsyncReadSessionDep, cache: RedisAsyncDep, trending_params: Annotated[PostTrendingParams, Query()]
+):
+    short_ids = await get_trending_short_ids(cache, limit=trending_params.limit, offset=trending_params.offset)
+    return await crud.get_post_summaries(session=session, short_ids=short_ids)
+
+
+@router.post("/batch-get", response_model=PostBatchGetResponse, dependencies=[Depends(QueryBudget(1))])
+async def batch_get_posts(session: AsyncSessionDep, batch_get: PostBatchGetRequest):
+    # 단건 조회와 같은 캐시를 사용하며, 조회수/인기 순위에는 반영하지 않는다
+    short_ids = list(dict.fromkeys(batch_get.short_ids))
+    posts = await crud.get_post_reads(session=session, short_ids=short_ids)
+    return PostBatchGetResponse(
+        items=[posts[short_id] for short_id in short_ids if short_id in posts],
+        missing=[short_id for short_id in short_ids if short_id not in posts],
+    )
+
+
+@router.get("/{short_id}", response_model=PostRead, dependencies=[Depends(QueryBudget(1))])
+async def get_post(session: AsyncSessionDep, cache: RedisAsyncDep, background_tasks: BackgroundTasks, short_id: str):
+    # 캐시 miss 시 조회한 값은 캐시 TTL 동안 모든 사용자에게 반환되므로, 복제 지연으로 수정 전 값이 캐시되지 않도록
+    # replica 가 아닌 primary 에서 조회한다 (캐시 hit 시에는 DB 연결을 사용하지 않음) - batch-get, suggest 도 동일
+    post = await crud.get_post_read(session=session, short_id=short_id)
     if not post:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
 
+    # 조회수는 응답 후 Redis 에만 누적하고 DB 에는 PostViewFlusher 가 주기적으로 반영
+    background_tasks.add_task(increment_post_view, cache, short_id)
     return post
 
 
-@router.post("", response_model=PostRead, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=PostRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(RateLimit("write_post", "user"))],
+)
 async def write_post(session: AsyncSessionDep, user: AuthUserDep, post_write: PostWrite):
     post_in = PostCreate(**post_write.model_dump(), user_id=user.id)
     post = await crud.create_post(
         session=session,
         post_in=post_in,
     )
+    await crud.invalidate_post_suggest_cache(post.title)
     return post
 
 
 @router.delete("/{short_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def remove_post(session: AsyncSessionDep, user: AuthUserDep, short_id: str):
+async def remove_post(session: AsyncSessionDep, cache: RedisAsyncDep, user: AuthPrincipalDep, short_id: str):
     post = await crud.get_post_by_short_id(session=session, short_id=short_id)
     if not post:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
@@ -50,12 +114,16 @@ async def remove_post(session: AsyncSessionDep, user: AuthUserDep, short_id: str
     if post.user_id != user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to delete this post")
 
-    await session.delete(post)
-    await session.commit()
+    await crud.delete_post(session=session, post=post)
+    await crud.invalidate_post_cache(short_id=short_id)
+    await crud.invalidate_post_suggest_cache(short_id=short_id)
+    await remove_post_trending(cache, short_id)
 
 
 @router.patch("/{short_id}", response_model=PostRead)
-async def edit_my_post(session: AsyncSessionDep, user: AuthUserDep, short_id: str, post_edit: PostEdit):
+async def edit_my_post(
+    session: AsyncSessionDep, cache: RedisAsyncDep, user: AuthPrincipalDep, short_id: str, post_edit: PostEdit
+):
     post = await crud.get_post_by_short_id(session=session, short_id=short_id)
     if not post:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
@@ -72,9 +140,12 @@ async def edit_my_post(session: AsyncSessionDep, user: AuthUserDep, short_id: st
         return Response(status_code=status.HTTP_204_NO_CONTENT)
 
     # 3. 업데이트 진행
-    post.update_from_dict(update_data)
-    session.add(post)
+    old_title = post.title
+    await crud.update_returning(session=session, obj=post, values=update_data)
     await session.commit()
-    await session.refresh(post)
+    await crud.invalidate_post_cache(short_id=short_id)
+    if post.title != old_title:
+        await crud.invalidate_post_suggest_cache(post.title, short_id=short_id)
+    await record_post_activity(cache, short_id, "edit")
 
     return post
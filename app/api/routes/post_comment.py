@@ -1,10 +1,14 @@
-from datetime import UTC, datetime
 from typing import Annotated
 
-from fastapi import APIRouter, HTTPException, Query, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from app import crud
-from app.api.deps import AsyncSessionDep, AuthUserDep  # noqa: TC001
+from app.api.deps import AsyncReadSessionDep, AsyncSessionDep, AuthPrincipalDep  # noqa: TC001
+from app.constants import NEXT_CURSOR_HEADER
+from app.core.db_metrics import QueryBudget
+from app.core.rate_limit import RateLimit
+from app.core.redis_client import RedisAsyncDep  # noqa: TC001
+from app.core.trending import record_post_activity
 from app.schemas import (
     PostCommentCreate,
     PostCommentEdit,
@@ -16,25 +20,35 @@ from app.schemas import (
 router = APIRouter()
 
 
-@router.get("", response_model=list[PostCommentRead])
-async def get_post_comments_api(session: AsyncSessionDep, params: Annotated[PostCommentFilterParams, Query()]):
-    db_objs = await crud.get_post_comments(session=session, params=params)
-    return db_objs
+@router.get("", response_model=list[PostCommentRead], dependencies=[Depends(QueryBudget(2))])
+async def get_post_comments_api(
+    session: AsyncReadSessionDep, response: Response, params: Annotated[PostCommentFilterParams, Query()]
+):
+    page = await crud.get_post_comment_page(session=session, params=params)
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+
+    return page.items
 
 
 # TODO: 리턴 스키마 정의
-@router.post("")
-async def write_post_comment(session: AsyncSessionDep, post_comment_write: PostCommentWrite, user: AuthUserDep):
+@router.post("", dependencies=[Depends(RateLimit("write_post_comment", "user"))])
+async def write_post_comment(
+    session: AsyncSessionDep, cache: RedisAsyncDep, post_comment_write: PostCommentWrite, user: AuthPrincipalDep
+):
     post = await crud.get_post_by_short_id(session=session, short_id=post_comment_write.short_id)
     comment_in = PostCommentCreate(**post_comment_write.model_dump(), user_id=user.id, post_id=post.id)
     db_obj = await crud.create_post_comment(session=session, comment_in=comment_in)
+    # 게시글 단건 캐시에 댓글 수가 포함되어 있으므로 무효화
+    await crud.invalidate_post_cache(short_id=post.short_id)
+    await record_post_activity(cache, post.short_id, "comment")
     return db_obj
 
 
 # TODO: 리턴 스키마 정의
 @router.patch("/{comment_id}")
 async def edit_post_comment(
-    session: AsyncSessionDep, comment_edit: PostCommentEdit, user: AuthUserDep, comment_id: int
+    session: AsyncSessionDep, comment_edit: PostCommentEdit, user: AuthPrincipalDep, comment_id: int
 ):
     comment = await crud.get_post_comment_by_id(session=session, comment_id=comment_id)
     if not comment:
@@ -52,16 +66,14 @@ async def edit_post_comment(
         return Response(status_code=status.HTTP_204_NO_CONTENT)
 
     # 3. 업데이트 진행
-    comment.update_from_dict(update_data)
-    session.add(comment)
+    await crud.update_returning(session=session, obj=comment, values=update_data)
     await session.commit()
-    await session.refresh(comment)
 
     return comment
 
 
 @router.delete("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def remove_post_comment(session: AsyncSessionDep, user: AuthUserDep, comment_id: int):
+async def remove_post_comment(session: AsyncSessionDep, user: AuthPrincipalDep, comment_id: int):
     comment = await crud.get_post_comment_by_id(session=session, comment_id=comment_id)
 
     if not comment:
@@ -71,8 +83,6 @@ async def remove_post_comment(session: AsyncSessionDep, user: AuthUserDep, comme
     if comment.user_id != user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to edit this post")
 
-    comment.is_delete = True
-    comment.deleted_at = datetime.now(UTC)
-
-    session.add(comment)
-    await session.commit()
+    short_id = await crud.delete_post_comment(session=session, comment=comment)
+    if short_id:
+        await crud.invalidate_post_cache(short_id=short_id)
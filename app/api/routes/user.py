@@ -1,11 +1,15 @@
-from fastapi import APIRouter, BackgroundTasks, HTTPException, status
-from fastapi_mail import FastMail, MessageSchema, MessageType
+import logging
+
+from fastapi import APIRouter, HTTPException, status
+from redis.exceptions import RedisError
 
 from app import crud
-from app.api.deps import AsyncSessionDep, AuthUserDep, SettingDep  # noqa: TCH001
+from app.api.deps import AsyncSessionDep, AuthUserDep  # noqa: TCH001
 from app.constants import EmailVerificationAction
 from app.core.redis_client import RedisAsyncDep  # noqa: TC001
-from app.schemas import UserCreate, UserRead, UserRegister, UserUpdateMe, VerificationCodeRead
+from app.schemas import MailCreate, UserCreate, UserRead, UserRegister, UserUpdateMe, VerificationCodeRead
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -14,8 +18,6 @@ router = APIRouter()
 async def register_user(
     session: AsyncSessionDep,
     cache: RedisAsyncDep,
-    settings: SettingDep,
-    background_tasks: BackgroundTasks,
     user_register: UserRegister,
 ):
     email = user_register.email
@@ -26,7 +28,7 @@ async def register_user(
     if user_register.verification_code != code:
         raise HTTPException(status_code=400, detail="Invalid verification code")
 
-    if await crud.get_user_by_email(session=session, email=email):
+    if await crud.get_user_by_email(session=session, email=email, include_deleted=True):
         raise HTTPException(status_code=400, detail="Email already registered")
 
     user_in = UserCreate(**user_register.model_dump())
@@ -36,11 +38,17 @@ async def register_user(
         "nickname": user_db.nickname,
     }
 
-    message = MessageSchema(
-        subject="가입을 진심으로 축합니다", recipients=[user_db.email], template_body=data, subtype=MessageType.html
+    mail_in = MailCreate(
+        subject="가입을 진심으로 축합니다",
+        recipients=[user_db.email],
+        template_name="system_mail/welcome.html",
+        template_body=data,
     )
-    fm = FastMail(settings.EMAIL)
-    background_tasks.add_task(fm.send_message, message, template_name="system_mail/welcome.html")
+    # 가입은 이미 commit 되었으므로 환영 메일 적재 실패로 요청을 실패시키지 않는다 (재시도 시 이미 가입된 이메일이 됨)
+    try:
+        await crud.enqueue_mail(cache=cache, mail_in=mail_in)
+    except RedisError:
+        logger.warning("welcome mail enqueue failed", exc_info=True)
 
     return user_db
 
@@ -53,8 +61,12 @@ async def get_user_me(user: AuthUserDep):
 @router.patch("/me", response_model=UserRead)
 async def update_user_me(session: AsyncSessionDep, user_in: UserUpdateMe, user: AuthUserDep):
     user_data = user_in.model_dump(exclude_unset=True)
-    user.update_from_dict(user_data)
-    session.add(user)
-    await session.commit()
-    await session.refresh(user)
+    if user_data:
+        await crud.update_returning(session=session, obj=user, values=user_data)
+        await session.commit()
+
+    await crud.invalidate_principal(user_id=user.id)
+    # 게시글 캐시에 작성자 닉네임이 포함되어 있으므로 함께 무효화
+    if "nickname" in user_data:
+        await crud.invalidate_user_post_cache(user_id=user.id)
     return user
@@ -7,6 +7,7 @@ class APITagName(StrEnum):
     USER = "user"
     AUTH = "auth"
     POST = "post"
+    ADMIN = "admin"
 
 
 @dataclass(frozen=True)
@@ -19,6 +20,7 @@ class APITagMetadata:
         {"name": APITagName.AUTH, "description": "auth api"},
         {"name": APITagName.USER, "description": "user api"},
         {"name": APITagName.POST, "description": "post api"},
+        {"name": APITagName.ADMIN, "description": "admin api"},
     ]
 
     ALL = VERSION + APP
@@ -27,5 +29,9 @@ class APITagMetadata:
 PASSWORD_PATTERN = r"^(?=.*[A-Za-z])(?=.*\d)(?=.*[!\"#$%&'()*+,\-./:;<=>?@\[\\\]^_`{|}~])[A-Za-z\d!\"#$%&'()*+,\-./:;<=>?@\[\\\]^_`{|}~]{8,16}$"  # noqa: E501
 
 
+# keyset 페이지네이션 시 다음 페이지 커서를 전달하는 응답 헤더
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
 class EmailVerificationAction(StrEnum):
     SIGNUP = "signup"
@@ -0,0 +1,359 @@
+import asyncio
+import functools
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from pydantic import TypeAdapter
+from redis.exceptions import LockError, RedisError
+
+from app.core.config import get_setting
+from app.core.redis_client import async_redis_client
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
+
+    from pydantic import BaseModel
+    from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+settings = get_setting()
+
+
+@dataclass
+class CacheStats:
+    """캐시 적중/미스 카운터 (프로세스 단위)"""
+
+    hits: int = 0
+    local_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def params_cache_key(params: BaseModel) -> str:
+    """조회 파라미터 모델로 캐시 key를 만든다. (직렬화에서 exclude 된 필드도 포함하기 위해 repr 사용)"""
+    return hashlib.sha1(repr(params).encode()).hexdigest()
+
+
+class LocalTTLCache:
+    """
+    프로세스 내 LRU + TTL 캐시.
+    값은 역직렬화된 객체를 그대로 보관하므로 꺼낸 값은 읽기 전용으로 사용해야 한다.
+    """
+
+    def __init__(self, *, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any, frozenset[str]]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        expires_at, value, _ = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, tags: Iterable[str] = ()):
+        self._data[key] = (time.monotonic() + self.ttl, value, frozenset(tags))
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, *keys: str):
+        for key in keys:
+            self._data.pop(key, None)
+
+    def delete_tag(self, tag: str):
+        for key in [key for key, (_, _, tags) in self._data.items() if tag in tags]:
+            del self._data[key]
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class _LeaderCancelledError(Exception):
+    """single-flight 로 먼저 조회하던 요청이 취소된 경우"""
+
+
+class TwoTierCache:
+    """
+    프로세스 내 LRU/TTL 캐시 -> Redis -> loader(DB) 순서로 조회하는 2단 캐시.
+
+    - 같은 프로세스에서 동시에 발생한 miss 는 하나의 loader 호출을 공유한다. (single-flight)
+    - use_lock 이 켜져 있으면 Redis lock 으로 여러 워커가 같은 key를 동시에 다시 계산하지 않도록 한다.
+    - tag 를 지정하면 tag 단위로 여러 key를 한 번에 무효화할 수 있다.
+
+    로컬 캐시는 다른 워커에서 무효화되지 않으므로 local_ttl 은 짧게 유지한다.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        ttl: int,
+        enabled: bool = True,
+        local_ttl: float | None = None,
+        local_maxsize: int | None = None,
+        use_lock: bool | None = None,
+        lock_timeout: float = 5.0,
+        lock_wait: float = 1.0,
+        redis: Redis | None = None,
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.enabled = enabled
+        self.use_lock = settings.CACHE_LOCK_ENABLED if use_lock is None else use_lock
+        self.lock_timeout = lock_timeout
+        self.lock_wait = lock_wait
+        self.redis = async_redis_client if redis is None else redis
+        self.local = LocalTTLCache(
+            maxsize=settings.CACHE_LOCAL_MAXSIZE if local_maxsize is None else local_maxsize,
+            ttl=settings.CACHE_LOCAL_TTL_SECONDS if local_ttl is None else local_ttl,
+        )
+        self.stats = CacheStats()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.namespace}:tag:{tag}"
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        adapter: TypeAdapter,
+        tags: Callable[[Any], Iterable[str]] | None = None,
+    ) -> Any:
+        """캐시에서 값을 조회하고, 없으면 loader 결과를 캐시에 저장 후 반환한다. (None 은 캐시하지 않음)"""
+        if not self.enabled:
+            return await loader()
+
+        full_key = self._key(key)
+
+        # 1. 로컬 캐시
+        value = self.local.get(full_key)
+        if value is not None:
+            self.stats.hits += 1
+            self.stats.local_hits += 1
+            return value
+
+        # 2. Redis
+        value = await self._get_remote(full_key, adapter, tags)
+        if value is not None:
+            self.stats.hits += 1
+            return value
+
+        self.stats.misses += 1
+
+        # 3. 같은 key를 이미 조회 중이면 그 결과를 기다린다
+        if (future := self._inflight.get(full_key)) is not None:
+            try:
+                return await asyncio.shield(future)
+            except _LeaderCancelledError:
+                return await loader()
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[full_key] = future
+        try:
+            value = await self._load(full_key, loader, adapter, tags)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 대기자가 없을 때 "exception was never retrieved" 경고 방지
+            raise
+        except BaseException:
+            future.set_exception(_LeaderCancelledError())
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(full_key, None)
+
+    async def _get_remote(self, full_key: str, adapter: TypeAdapter, tags) -> Any | None:
+        try:
+            raw = await self.redis.get(full_key)
+        except RedisError:
+            logger.warning("cache get failed", exc_info=True)
+            return None
+
+        if raw is None:
+            return None
+
+        value = adapter.validate_json(raw)
+        self.local.set(full_key, value, tags(value) if tags else ())
+        return value
+
+    async def _load(self, full_key: str, loader, adapter: TypeAdapter, tags) -> Any:
+        lock = None
+        if self.use_lock:
+            lock = self.redis.lock(f"{full_key}:lock", timeout=self.lock_timeout, blocking=False)
+            try:
+                if not await lock.acquire():
+                    lock = None
+                    # 다른 워커가 계산 중이면 결과가 저장될 때까지 잠시 기다린다
+                    deadline = time.monotonic() + self.lock_wait
+                    while time.monotonic() < deadline:
+                        await asyncio.sleep(0.05)
+                        value = await self._get_remote(full_key, adapter, tags)
+                        if value is not None:
+                            return value
+            except RedisError:
+                logger.warning("cache lock failed", exc_info=True)
+                lock = None
+
+        try:
+            value = await loader()
+            if value is not None:
+                await self._set(full_key, value, adapter, tags(value) if tags else ())
+            return value
+        finally:
+            if lock is not None:
+                try:
+                    await lock.release()
+                except (LockError, RedisError):
+                    logger.warning("cache lock release failed", exc_info=True)
+
+    async def _set(self, full_key: str, value: Any, adapter: TypeAdapter, tags: Iterable[str] = ()):
+        await self._set_many({full_key: (value, list(tags))}, adapter)
+
+    async def _set_many(self, items: dict[str, tuple[Any, list[str]]], adapter: TypeAdapter):
+        """{full_key: (값, tags)} 를 로컬 캐시와 Redis 에 저장한다. (Redis 왕복 1회)"""
+        for full_key, (value, tags) in items.items():
+            self.local.set(full_key, value, tags)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for full_key, (value, tags) in items.items():
+                    pipe.set(full_key, adapter.dump_json(value), ex=self.ttl)
+                    for tag in tags:
+                        tag_key = self._tag_key(tag)
+                        pipe.sadd(tag_key, full_key)
+                        pipe.expire(tag_key, self.ttl)
+                await pipe.execute()
+        except RedisError:
+            logger.warning("cache set failed", exc_info=True)
+
+    async def get_many_or_load(
+        self,
+        keys: list[str],
+        loader: Callable[[list[str]], Awaitable[dict[str, Any]]],
+        adapter: TypeAdapter,
+        tags: Callable[[Any], Iterable[str]] | None = None,
+    ) -> dict[str, Any]:
+        """
+        여러 key 를 로컬 캐시 -> Redis(MGET 1회) -> loader(없는 key 만 한 번에) 순서로 조회한다.
+        loader 는 찾은 값만 {key: 값} 으로 반환하며, 결과에도 값이 있는 key 만 포함된다.
+        batch 조회는 single-flight/lock 을 사용하지 않는다.
+        """
+        if not self.enabled:
+            return await loader(keys)
+
+        values: dict[str, Any] = {}
+        remote_keys = []
+        for key in keys:
+            value = self.local.get(self._key(key))
+            if value is None:
+                remote_keys.append(key)
+                continue
+            self.stats.hits += 1
+            self.stats.local_hits += 1
+            values[key] = value
+
+        missing_keys = []
+        if remote_keys:
+            try:
+                raws = await self.redis.mget([self._key(key) for key in remote_keys])
+            except RedisError:
+                logger.warning("cache get failed", exc_info=True)
+                raws = [None] * len(remote_keys)
+
+            for key, raw in zip(remote_keys, raws, strict=True):
+                if raw is None:
+                    missing_keys.append(key)
+                    continue
+                value = adapter.validate_json(raw)
+                self.local.set(self._key(key), value, tags(value) if tags else ())
+                self.stats.hits += 1
+                values[key] = value
+
+        if missing_keys:
+            self.stats.misses += len(missing_keys)
+            loaded = await loader(missing_keys)
+            if loaded:
+                items = {self._key(key): (value, list(tags(value)) if tags else []) for key, value in loaded.items()}
+                await self._set_many(items, adapter)
+            values.update(loaded)
+
+        return values
+
+    async def invalidate(self, *keys: str):
+        full_keys = [self._key(key) for key in keys]
+        self.local.delete(*full_keys)
+        try:
+            await self.redis.delete(*full_keys)
+        except RedisError:
+            logger.warning("cache invalidate failed", exc_info=True)
+
+    async def invalidate_tag(self, tag: str):
+        await self.invalidate_tags(tag)
+
+    async def invalidate_tags(self, *tags: str):
+        """여러 tag 를 한 번에 무효화한다. (tag 수와 관계없이 Redis 왕복 2회)"""
+        if not tags:
+            return
+
+        for tag in tags:
+            self.local.delete_tag(tag)
+
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for tag_key in tag_keys:
+                    pipe.smembers(tag_key)
+                members = await pipe.execute()
+            await self.redis.delete(*tag_keys, *set().union(*members))
+        except RedisError:
+            logger.warning("cache invalidate failed", exc_info=True)
+
+    def cached(
+        self,
+        *,
+        key: Callable[..., str],
+        response_type: Any,
+        tags: Callable[[Any], Iterable[str]] | None = None,
+    ):
+        """
+        비동기 함수의 반환값을 캐시하는 데코레이터.
+        key 는 함수 인자를 그대로 받아 캐시 key를 만들고, 반환값은 response_type 으로 직렬화 가능해야 한다.
+        """
+        adapter = TypeAdapter(response_type)
+
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                return await self.get_or_load(
+                    key(*args, **kwargs), functools.partial(func, *args, **kwargs), adapter, tags
+                )
+
+            return wrapper
+
+        return decorator
@@ -30,6 +30,10 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str = secrets.token_hex(32)
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # bcrypt 해시/검증 동시 실행 수 (워커 프로세스 당)
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 4
+    # 실행 슬롯을 기다리는 해시/검증 수가 이 값 이상이면 경고 로그 (로그인/가입 지연)
+    PASSWORD_HASH_WAITING_WARN_THRESHOLD: int = 16
 
     SMTP_HOST: str
     SMTP_PORT: int
@@ -39,6 +43,16 @@ class Settings(BaseSettings):
     ON_TEST: bool = False
     SKIP_EMAIL_SEND: bool = True
 
+    # 메일 outbox (Redis Stream) - API는 적재만 하고 발송은 scripts/mail_worker.py 가 담당
+    MAIL_OUTBOX_STREAM: str = "mail:outbox"
+    MAIL_OUTBOX_MAXLEN: int = 100_000
+    MAIL_WORKER_CONCURRENCY: int = 2  # 워커 프로세스 당 consumer(=SMTP 연결) 수
+    MAIL_WORKER_BATCH_SIZE: int = 20
+    MAIL_WORKER_BLOCK_MS: int = 5_000
+    MAIL_MAX_ATTEMPTS: int = 5
+    MAIL_RETRY_BACKOFF_SECONDS: int = 10  # 10초, 20초, 40초 ... (최대 1시간)
+    MAIL_CLAIM_IDLE_MS: int = 60_000  # 응답 없는 consumer 가 가져간 메일을 회수하기까지의 시간
+
     # Path.cwd() 를 사용하면 root 폴더를 찾을 수 있지만 실행 위치에 따라서 root 폴더가 변경되므로
     # 아래와 같이 상대적 경로를 이용함
     @computed_field
@@ -73,12 +87,95 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         ).encoded_string()
 
+    # DB 연결 풀 (워커 프로세스 당) - 최대 연결 수는 DB_POOL_SIZE + DB_MAX_OVERFLOW
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 10  # 풀에 남은 연결이 없을 때 기다리는 최대 시간 (초과 시 503)
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # 이 시간보다 오래된 연결은 다시 연결 (-1 이면 재연결하지 않음)
+    DB_POOL_PRE_PING: bool = True  # 풀에서 꺼낼 때 연결이 끊겼는지 확인 (DB 재시작/failover 대비, 1회 왕복 추가)
+    DB_CONNECT_TIMEOUT_SECONDS: int = 5
+    DB_POOL_HOLD_WARN_SECONDS: float = 1  # 한 번에 연결을 이 시간 이상 점유하면 라우트와 함께 경고 로그
+    # 서버 측 timeout (ms, 0 이면 제한 없음) - 배치 스크립트는 환경 변수로 늘려서 실행
+    DB_STATEMENT_TIMEOUT_MS: int = 10_000
+    DB_IDLE_IN_TRANSACTION_TIMEOUT_MS: int = 30_000
+    # 요청별 SQL 검사 - 같은 SQL 문이 이 횟수 이상 실행되면 N+1 로 판단
+    QUERY_REPEAT_THRESHOLD: int = 10
+    # True 면 쿼리 예산(QueryBudget) 초과/N+1 발생 시 요청을 실패시킨다 (테스트/개발용), False 면 경고 로그만 남김
+    QUERY_GUARD_STRICT: bool = False
+    # 이 시간 이상 걸린 SQL 문은 느린 쿼리로 로그를 남기고 최근 SLOW_QUERY_BUFFER_SIZE 개를 보관
+    # (관리자 API /v1/admin/slow-queries 로 조회)
+    SLOW_QUERY_THRESHOLD_MS: int = 500
+    SLOW_QUERY_BUFFER_SIZE: int = 100
+    # 느린 SELECT 문 중 이 비율만큼 EXPLAIN (ANALYZE, BUFFERS) 실행 계획을 함께 저장
+    # (쿼리를 한 번 더 실행하므로 기본값 0 - 사용 안 함)
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.0
+    # PgBouncer transaction pooling 사용 시 - prepared statement 를 끄고 timeout 을 트랜잭션마다 지정
+    DB_PGBOUNCER: bool = False
+
+    # 읽기 전용 replica DSN 목록 (JSON 배열) - 지정하지 않으면 조회도 primary 를 사용
+    DATABASE_REPLICA_URIS: list[str] = []
+    DB_REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = 5
+    # 쓰기 요청 후 이 시간 동안은 해당 사용자의 조회도 primary 를 사용 (replica 복제 지연보다 길게 설정)
+    DB_READ_YOUR_WRITES_SECONDS: int = 5
+
     REDIS_USER_NAME: str | None = None
     REDIS_PASSWORD: str | None = None
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_CACHE_DB: Literal["0", "1", "2"] = "0"
 
+    # 요청 수 제한 - "{라우트 이름}:{key 종류(ip, email, user)}": "{횟수}/{second|minute|hour|day}"
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMITS: dict[str, str] = {
+        "login:ip": "30/minute",
+        "login:email": "10/minute",
+        "send_code:ip": "10/minute",
+        "send_code:email": "3/minute",
+        "write_post:user": "30/minute",
+        "write_post_comment:user": "60/minute",
+    }
+
+    # 2단 캐시 (프로세스 내 LRU + Redis) 공통 설정
+    CACHE_LOCAL_TTL_SECONDS: float = 5
+    CACHE_LOCAL_MAXSIZE: int = 1024
+    CACHE_LOCK_ENABLED: bool = True
+
+    # 인증 사용자(principal) 캐시 - 토큰 검증 후 매 요청마다 users 테이블을 조회하지 않기 위함
+    PRINCIPAL_CACHE_ENABLED: bool = True
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+
+    # 게시글 단건 조회 캐시
+    POST_CACHE_ENABLED: bool = True
+    POST_CACHE_TTL_SECONDS: int = 300
+
+    # 게시글 제목 자동완성 캐시 - 게시글 작성/수정/삭제 시 관련 검색어만 무효화 (부분 문자열 검색어는 TTL 로 갱신)
+    POST_SUGGEST_CACHE_ENABLED: bool = True
+    POST_SUGGEST_CACHE_TTL_SECONDS: int = 30
+
+    # 게시글 조회수 - 조회 시 Redis hash 에만 누적하고 주기적으로 DB에 일괄 반영 (0 이하면 반영 task 를 실행하지 않음)
+    POST_VIEW_COUNT_KEY: str = "post:views"
+    POST_VIEW_FLUSH_INTERVAL_SECONDS: float = 10
+    POST_VIEW_FLUSH_BATCH_SIZE: int = 1000  # UPDATE ... FROM (VALUES ...) 한 번에 반영할 게시글 수
+
+    # 인기 게시글 - 조회/댓글/수정 시 시간에 따라 감쇠하는 점수를 Redis sorted set 에 누적하고 상위 K개만 유지
+    TRENDING_KEY: str = "post:trending"
+    TRENDING_HALF_LIFE_SECONDS: float = 6 * 3600  # 이 시간이 지날 때마다 이전 활동의 점수가 절반이 된다
+    TRENDING_MAX_SIZE: int = 1000
+    TRENDING_TRIM_INTERVAL_SECONDS: float = 60  # 0 이하면 정리 task 를 실행하지 않음
+    TRENDING_WEIGHTS: dict[str, float] = {"view": 1, "comment": 5, "edit": 2}
+
+    # 삭제된 게시글/댓글 정리 (scripts/purge_deleted.py) - 보관 기간이 지난 행을 archive 테이블로 옮기거나 삭제
+    PURGE_RETENTION_DAYS: int = 30
+    PURGE_ARCHIVE: bool = True  # False 면 archive 테이블에 옮기지 않고 삭제만 한다
+    PURGE_BATCH_SIZE: int = 500  # 한 트랜잭션에서 처리할 행 수 (잠금/WAL 을 짧게 유지)
+    PURGE_PAUSE_SECONDS: float = 0.5  # 배치 사이 대기 시간 (배치 처리에 걸린 시간만큼 추가로 대기)
+
+    # 게시글/댓글 목록 캐시 - 쓰기 시 무효화하지 않고 짧은 TTL로만 갱신되므로 필요한 경우에만 사용
+    POST_LIST_CACHE_ENABLED: bool = False
+    POST_LIST_CACHE_TTL_SECONDS: int = 10
+    COMMENT_LIST_CACHE_ENABLED: bool = False
+    COMMENT_LIST_CACHE_TTL_SECONDS: int = 10
+
     @computed_field
     @property
     def CACHE_URI(self) -> str:  # noqa: N802
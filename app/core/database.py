@@ -1,14 +1,162 @@
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+import itertools
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import anyio
+from fastapi import Request  # noqa: TC002
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 
 from app.core.config import get_setting
+from app.core.db_metrics import (
+    INTERNAL_STATEMENT_OPTIONS,
+    instrument_queries,
+    pool_metrics,
+    route_label,
+    track_db_route,
+)
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
 
 settings = get_setting()
 
-async_engine = create_async_engine(settings.DATABASE_URI)
+
+def _timeouts() -> dict[str, int]:
+    """서버 측 timeout (ms, 0 이면 제한 없음) - 오래 걸리는 쿼리/트랜잭션이 연결을 계속 점유하지 않도록 한다."""
+    return {
+        "statement_timeout": settings.DB_STATEMENT_TIMEOUT_MS,
+        "idle_in_transaction_session_timeout": settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS,
+    }
+
+
+def create_db_engine(*, url: str | None = None, pgbouncer: bool | None = None) -> AsyncEngine:
+    """
+    설정(DB_*)에 따라 연결 풀/timeout 을 적용한 엔진을 만든다. (url 을 지정하지 않으면 primary)
+
+    pgbouncer 를 켜면 PgBouncer transaction pooling 뒤에서 사용할 수 있도록
+    - 트랜잭션마다 다른 서버 연결이 사용될 수 있으므로 psycopg 의 prepared statement 를 사용하지 않는다.
+    - 연결 시 options(-c ...) 를 전달할 수 없으므로 timeout 은 트랜잭션 시작 시 SET LOCAL 로 지정한다.
+      (트랜잭션마다 1회 왕복 추가)
+    """
+    pgbouncer = settings.DB_PGBOUNCER if pgbouncer is None else pgbouncer
+
+    connect_args: dict = {"connect_timeout": settings.DB_CONNECT_TIMEOUT_SECONDS}
+    if pgbouncer:
+        connect_args["prepare_threshold"] = None
+    else:
+        connect_args["options"] = " ".join(f"-c {name}={value}" for name, value in _timeouts().items())
+
+    engine = create_async_engine(
+        settings.DATABASE_URI if url is None else url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+    if pgbouncer:
+
+        @event.listens_for(engine.sync_engine, "begin")
+        def set_local_timeouts(conn):
+            # SET LOCAL 과 같이 트랜잭션이 끝나면 원래 값으로 돌아간다 (다른 클라이언트의 서버 연결에 영향 없음)
+            # 요청의 쿼리가 아니므로 쿼리 수(QueryBudget)/느린 쿼리 기록에서는 제외
+            conn.exec_driver_sql(
+                "SELECT set_config('statement_timeout', %(statement_timeout)s, true), "
+                "set_config('idle_in_transaction_session_timeout', %(idle_in_transaction_session_timeout)s, true)",
+                {name: str(value) for name, value in _timeouts().items()},
+                execution_options=INTERNAL_STATEMENT_OPTIONS,
+            )
+
+    # 라우트별 연결 사용 횟수/점유 시간, 요청별 SQL 수/시간 기록
+    pool_metrics.instrument(engine)
+    instrument_queries(engine)
+    return engine
+
+
+async_engine = create_db_engine()
 
 async_session = async_sessionmaker(async_engine, expire_on_commit=False)
 
 
-async def get_session():
-    async with async_session() as session:
-        yield session
+async def get_session(request: Request):
+    """
+    요청용 세션 - 연결은 처음 쿼리를 실행할 때 풀에서 가져오므로 캐시로 응답하는 경우에는 사용하지 않는다.
+    Depends(get_session, scope="function") 으로 사용해서 응답 전송/백그라운드 작업을 기다리지 않고
+    라우트 함수가 끝나면 바로 연결을 반환한다.
+    """
+    with track_db_route(route_label(request)):
+        async with async_session() as session:
+            yield session
+
+
+@dataclass
+class Replica:
+    engine: AsyncEngine
+    session: async_sessionmaker
+    healthy: bool = True
+
+
+class ReplicaRouter:
+    """
+    읽기 전용 replica 를 round-robin 으로 선택한다.
+    run_health_check 가 주기적으로 연결을 확인해서 응답하지 않는 replica 는 회복될 때까지 선택하지 않는다.
+    """
+
+    def __init__(self, engines: list[AsyncEngine]):
+        self.replicas = [Replica(engine, async_sessionmaker(engine, expire_on_commit=False)) for engine in engines]
+        self._counter = itertools.count()
+
+    def choose(self) -> async_sessionmaker | None:
+        """다음 replica 의 sessionmaker 를 반환한다. 사용할 수 있는 replica 가 없으면 None (primary 사용)"""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)].session
+
+    async def check_health(self):
+        for replica in self.replicas:
+            healthy = False
+            with anyio.move_on_after(settings.DB_CONNECT_TIMEOUT_SECONDS):
+                try:
+                    async with replica.engine.connect() as conn:
+                        await conn.execute(text("SELECT 1"))
+                    healthy = True
+                except Exception:
+                    logger.debug("replica health check failed", exc_info=True)
+
+            if healthy != replica.healthy:
+                logger.warning("replica %s is %s", replica.engine.url, "up" if healthy else "down")
+            replica.healthy = healthy
+
+    async def run_health_check(self, *, interval: float | None = None):
+        interval = settings.DB_REPLICA_HEALTH_CHECK_INTERVAL_SECONDS if interval is None else interval
+        while True:
+            await self.check_health()
+            await anyio.sleep(interval)
+
+    async def dispose(self):
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+replica_router = ReplicaRouter([create_db_engine(url=url) for url in settings.DATABASE_REPLICA_URIS])
+
+
+# read-your-writes: 쓰기 요청을 보낸 사용자는 replica 지연 동안 자신이 쓴 내용이 보이지 않을 수 있으므로
+# 일정 시간(DB_READ_YOUR_WRITES_SECONDS) 동안 조회도 primary 를 사용하도록 Redis 에 표시해 둔다
+def _recent_write_key(user_id: int) -> str:
+    return f"db:recent_write:{user_id}"
+
+
+async def mark_recent_write(redis: Redis, user_id: int):
+    await redis.set(_recent_write_key(user_id), 1, ex=settings.DB_READ_YOUR_WRITES_SECONDS)
+
+
+async def has_recent_write(redis: Redis, user_id: int) -> bool:
+    return bool(await redis.exists(_recent_write_key(user_id)))
@@ -0,0 +1,369 @@
+import logging
+import random
+import re
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+import structlog
+from asgi_correlation_id import correlation_id
+from sqlalchemy import event
+
+from app.core.config import get_setting
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from fastapi import Request
+    from sqlalchemy.ext.asyncio import AsyncEngine
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+settings = get_setting()
+
+# 연결을 사용하는 라우트 ("GET /v1/posts/{short_id}") - 요청 밖(스크립트, 백그라운드 task)에서는 "-"
+db_route: ContextVar[str] = ContextVar("db_route", default="-")
+
+
+@dataclass
+class PoolRouteStats:
+    """라우트별 DB 연결 사용 지표 (프로세스 단위)"""
+
+    checkouts: int = 0
+    hold_seconds_total: float = 0.0
+    hold_seconds_max: float = 0.0
+
+    @property
+    def hold_seconds_avg(self) -> float:
+        return self.hold_seconds_total / self.checkouts if self.checkouts else 0.0
+
+
+@dataclass(frozen=True)
+class PoolStatus:
+    size: int
+    checked_out: int  # 사용 중인 연결 수
+    overflow: int  # pool_size 를 넘어서 추가로 만든 연결 수 (음수면 아직 만들지 않은 연결 수)
+
+
+class PoolMetrics:
+    """
+    연결 풀의 checkout/checkin 이벤트로 라우트별 연결 사용 횟수와 점유 시간(checkout ~ checkin)을 기록한다.
+    점유 시간이 DB_POOL_HOLD_WARN_SECONDS 이상이면 라우트와 함께 경고 로그를 남긴다.
+    """
+
+    def __init__(self, *, hold_warn_seconds: float):
+        self.hold_warn_seconds = hold_warn_seconds
+        self.routes: dict[str, PoolRouteStats] = defaultdict(PoolRouteStats)
+        self.engines: list[AsyncEngine] = []
+
+    def instrument(self, engine: AsyncEngine):
+        event.listen(engine.sync_engine, "checkout", self._on_checkout)
+        event.listen(engine.sync_engine, "checkin", self._on_checkin)
+        self.engines.append(engine)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out"] = (time.perf_counter(), db_route.get())
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        checked_out = connection_record.info.pop("checked_out", None)
+        if checked_out is None:
+            return
+
+        started, route = checked_out
+        held = time.perf_counter() - started
+
+        stats = self.routes[route]
+        stats.checkouts += 1
+        stats.hold_seconds_total += held
+        stats.hold_seconds_max = max(stats.hold_seconds_max, held)
+
+        if held >= self.hold_warn_seconds:
+            logger.warning("db connection held for %.3fs by %s", held, route)
+
+    def statistics(self) -> dict[str, PoolRouteStats]:
+        return dict(self.routes)
+
+    def status(self) -> dict[str, PoolStatus]:
+        """엔진(비밀번호를 가린 DSN)별 현재 풀 상태"""
+        return {
+            engine.url.render_as_string(hide_password=True): PoolStatus(
+                size=engine.pool.size(), checked_out=engine.pool.checkedout(), overflow=engine.pool.overflow()
+            )
+            for engine in self.engines
+        }
+
+    def reset(self):
+        self.routes.clear()
+
+
+pool_metrics = PoolMetrics(hold_warn_seconds=settings.DB_POOL_HOLD_WARN_SECONDS)
+
+
+def route_label(request: Request) -> str:
+    route = request.scope.get("route")
+    return f"{request.method} {route.path if route is not None else request.url.path}"
+
+
+@contextmanager
+def track_db_route(label: str) -> Iterator[None]:
+    """블록 안에서 checkout 한 연결을 label 라우트의 사용량으로 기록한다."""
+    token = db_route.set(label)
+    try:
+        yield
+    finally:
+        db_route.reset(token)
+
+
+# 테스트 세션의 commit 이 실행하는 SAVEPOINT 관련 문은 요청의 쿼리로 세지 않는다
+_IGNORED_STATEMENTS = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+# 요청의 쿼리가 아닌 내부 문에 지정하는 execution option - 쿼리 수/시간과 느린 쿼리 기록에서 제외한다
+# (예: PgBouncer 모드에서 트랜잭션 시작 시 timeout 을 지정하는 문)
+_INTERNAL_STATEMENT = "internal_statement"
+INTERNAL_STATEMENT_OPTIONS = {_INTERNAL_STATEMENT: True}
+
+_WHITESPACE = re.compile(r"\s+")
+# IN 절의 expanding 파라미터 (%(short_id_1_1)s, %(short_id_1_2)s, ...) - 개수와 관계없이 같은 쿼리로 묶는다
+_EXPANDED_PARAMETERS = re.compile(r"\(%\((\w+?)_\d+\)s(?:, %\(\w+?_\d+\)s)*\)")
+
+
+def normalize_statement(statement: str) -> str:
+    """파라미터 값과 공백/IN 절 길이 차이를 제외한 SQL 문 (같은 모양의 쿼리는 같은 값)"""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return _EXPANDED_PARAMETERS.sub(r"(%(\1)s, ...)", statement)
+
+
+@dataclass
+class RequestQueryStats:
+    """요청 하나에서 실행된 SQL 지표"""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str | None = None
+    # 같은 SQL 문(파라미터 제외)이 실행된 횟수 - N+1 검사용
+    statements: Counter[str] = field(default_factory=Counter)
+    # 라우트에서 선언한 최대 쿼리 수 (QueryBudget)
+    budget: int | None = None
+
+    def record(self, statement: str, elapsed: float):
+        statement = normalize_statement(statement)
+        self.count += 1
+        self.total_seconds += elapsed
+        self.statements[statement] += 1
+        if elapsed > self.slowest_seconds:
+            self.slowest_seconds = elapsed
+            self.slowest_statement = statement
+
+    def violations(self) -> list[str]:
+        """쿼리 예산을 넘었거나 같은 쿼리를 QUERY_REPEAT_THRESHOLD 번 이상 반복했으면 그 내용을 반환한다."""
+        violations = []
+        if self.budget is not None and self.count > self.budget:
+            violations.append(f"{self.count} queries exceeded the budget of {self.budget}")
+        for statement, count in self.statements.items():
+            if count >= settings.QUERY_REPEAT_THRESHOLD:
+                violations.append(f"same statement executed {count} times (N+1?): {statement[:200]}")
+        return violations
+
+    def server_timing(self) -> str:
+        return (
+            f'db;desc="{self.count} queries";dur={self.total_seconds * 1000:.1f}, '
+            f"db-slowest;dur={self.slowest_seconds * 1000:.1f}"
+        )
+
+    def log_context(self) -> dict:
+        return {
+            "db_queries": self.count,
+            "db_ms": round(self.total_seconds * 1000, 1),
+            "db_slowest_ms": round(self.slowest_seconds * 1000, 1),
+        }
+
+
+request_query_stats: ContextVar[RequestQueryStats | None] = ContextVar("request_query_stats", default=None)
+
+
+@dataclass(frozen=True)
+class SlowQuery:
+    statement: str
+    parameter_types: dict[str, str]
+    duration_ms: float
+    route: str
+    request_id: str | None
+    recorded_at: datetime
+    # EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) 결과 - 샘플링된 SELECT 문만
+    plan: list[dict[str, Any]] | None = None
+
+
+class SlowQueryLog:
+    """
+    threshold 이상 걸린 SQL 문을 라우트/파라미터 타입과 함께 로그로 남기고, 최근 buffer_size 개를 보관한다.
+    (프로세스 단위)
+    SELECT 문은 explain_sample_rate 비율로 같은 연결(트랜잭션)에서 EXPLAIN ANALYZE 를 실행해 실행 계획을 함께 저장한다.
+    (EXPLAIN ANALYZE 는 쿼리를 실제로 실행하므로 데이터를 변경하는 문에는 사용하지 않음)
+    """
+
+    def __init__(self, *, threshold_ms: float, buffer_size: int, explain_sample_rate: float):
+        self.threshold_seconds = threshold_ms / 1000
+        self.explain_sample_rate = explain_sample_rate
+        self.queries: deque[SlowQuery] = deque(maxlen=buffer_size)
+
+    def record(self, conn, statement: str, parameters, elapsed: float, *, executemany: bool):
+        if elapsed < self.threshold_seconds:
+            return
+
+        normalized = normalize_statement(statement)
+        route = db_route.get()
+        plan = None
+        if not executemany and normalized.startswith("SELECT") and random.random() < self.explain_sample_rate:
+            plan = self._explain(conn, statement, parameters)
+
+        self.queries.append(
+            SlowQuery(
+                statement=normalized,
+                parameter_types=self._parameter_types(parameters[0] if executemany else parameters),
+                duration_ms=round(elapsed * 1000, 1),
+                route=route,
+                request_id=correlation_id.get(),
+                recorded_at=datetime.now(UTC),
+                plan=plan,
+            )
+        )
+        logger.warning("slow query %.1fms by %s: %s", elapsed * 1000, route, normalized)
+
+    @staticmethod
+    def _parameter_types(parameters) -> dict[str, str]:
+        if isinstance(parameters, dict):
+            return {name: type(value).__name__ for name, value in parameters.items()}
+        return {str(i): type(value).__name__ for i, value in enumerate(parameters or ())}
+
+    @staticmethod
+    def _explain(conn, statement: str, parameters) -> list[dict[str, Any]] | None:
+        # SQLAlchemy 이벤트가 다시 실행되지 않도록 DBAPI cursor 를 직접 사용하고,
+        # 실패해도 요청의 트랜잭션에 영향이 없도록 savepoint 안에서 실행
+        # 이미 성공한 쿼리가 진단 기능 때문에 실패하지 않도록 모든 오류는 로그만 남긴다 (autocommit 연결 등)
+        cursor = None
+        try:
+            cursor = conn.connection.dbapi_connection.cursor()
+            cursor.execute("SAVEPOINT slow_query_explain")
+            try:
+                cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters)
+                plan = cursor.fetchone()[0]
+            except Exception:
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                raise
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+            return plan
+        except Exception:
+            logger.warning("slow query explain failed", exc_info=True)
+            return None
+        finally:
+            if cursor is not None:
+                cursor.close()
+
+    def recent(self) -> list[SlowQuery]:
+        """최근 느린 쿼리 (최신 순)"""
+        return list(reversed(self.queries))
+
+    def reset(self):
+        self.queries.clear()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    buffer_size=settings.SLOW_QUERY_BUFFER_SIZE,
+    explain_sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+)
+
+
+def instrument_queries(engine: AsyncEngine):
+    """요청 안에서 실행된 SQL 문의 수/시간을 RequestQueryStats 에 기록하고, 느린 쿼리를 slow_query_log 에 기록한다."""
+
+    # 시작 시간은 실행(context) 단위로 저장 - 실패한 실행은 after_cursor_execute 가 호출되지 않으므로
+    # 연결(conn.info)에 저장하면 풀의 연결에 값이 계속 남는다
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_started
+        if statement.startswith(_IGNORED_STATEMENTS) or context.execution_options.get(_INTERNAL_STATEMENT):
+            return
+
+        if (stats := request_query_stats.get()) is not None:
+            stats.record(statement, elapsed)
+        slow_query_log.record(conn, statement, parameters, elapsed, executemany=executemany)
+
+
+class QueryStatsMiddleware:
+    """
+    요청별 SQL 지표를 모아서 Server-Timing 헤더로 반환하고, structlog context 에 추가한다.
+    (응답 시작 시점까지의 값이며, 응답 후 실행되는 백그라운드 작업의 쿼리는 포함되지 않음)
+    CorrelationIdMiddleware 안쪽에 추가해서 같은 요청의 로그(request_id)에 함께 남도록 한다.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = request_query_stats.set(stats)
+
+        async def send_with_stats(message: Message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = [*message["headers"], (b"server-timing", stats.server_timing().encode())]
+                # uvicorn 접근 로그도 응답 시작 시점에 같은 context 에서 남는다
+                structlog.contextvars.bind_contextvars(**stats.log_context())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            structlog.contextvars.unbind_contextvars(*stats.log_context())
+            request_query_stats.reset(token)
+
+
+class QueryBudgetExceededError(Exception):
+    """요청의 SQL 실행이 QueryBudget 또는 QUERY_REPEAT_THRESHOLD 를 넘은 경우 (QUERY_GUARD_STRICT)"""
+
+
+class QueryBudget:
+    """
+    라우트에서 실행할 수 있는 최대 쿼리 수를 선언하는 의존성. (검사는 check_query_guard 가 라우트 함수 종료 후 수행)
+
+    사용 예) @router.get("", dependencies=[Depends(QueryBudget(2))])
+    """
+
+    def __init__(self, max_queries: int):
+        self.max_queries = max_queries
+
+    def __call__(self):
+        if (stats := request_query_stats.get()) is not None:
+            stats.budget = self.max_queries
+
+
+async def check_query_guard():
+    """
+    라우트 함수가 끝난 뒤 쿼리 예산 초과/같은 쿼리 반복(N+1)을 검사한다.
+    QUERY_GUARD_STRICT(테스트/개발용)이면 예외를 발생시켜 요청을 실패시키고, 아니면 경고 로그만 남긴다.
+    Depends(check_query_guard, scope="function") 으로 다른 의존성보다 먼저 선언해야 모든 쿼리가 포함된다.
+    """
+    yield
+    stats = request_query_stats.get()
+    if stats is None or not (violations := stats.violations()):
+        return
+
+    message = "; ".join(violations)
+    if settings.QUERY_GUARD_STRICT:
+        raise QueryBudgetExceededError(message)
+    logger.warning("query guard: %s", message)
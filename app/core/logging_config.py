@@ -45,6 +45,8 @@ def setup_logging() -> None:
         format_type = "console"
 
         foreign_pre_chain = [
+            # 표준 logging 로그(uvicorn 접근 로그 등)에도 요청별 context(SQL 지표 등)를 추가
+            structlog.contextvars.merge_contextvars,
             structlog.stdlib.add_log_level,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.ExtraAdder(),
@@ -69,6 +71,8 @@ def setup_logging() -> None:
         format_type = "json"
 
         foreign_pre_chain = [
+            # 표준 logging 로그(uvicorn 접근 로그 등)에도 요청별 context(SQL 지표 등)를 추가
+            structlog.contextvars.merge_contextvars,
             structlog.stdlib.add_log_level,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.ExtraAdder(),
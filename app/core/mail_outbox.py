@@ -0,0 +1,256 @@
+import logging
+import os
+import socket
+import time
+from email.message import EmailMessage
+from email.utils import formataddr
+from typing import TYPE_CHECKING, Any
+
+import aiosmtplib
+import anyio
+from redis.exceptions import RedisError, ResponseError
+
+from app.core.config import get_setting
+from app.schemas import MailCreate
+
+if TYPE_CHECKING:
+    from fastapi_mail import ConnectionConfig
+    from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+settings = get_setting()
+
+# 재시도 시각이 된 메일을 retry zset 에서 꺼내 stream 에 다시 적재 (원자적으로 처리해 유실/중복 방지)
+# KEYS[1]: retry zset, KEYS[2]: outbox stream, ARGV[1]: 현재 시각, ARGV[2]: 최대 개수, ARGV[3]: stream maxlen
+# member 형식: "{attempts}|{원래 entry id}|{mail json}"
+REQUEUE_SCRIPT = """
+local members = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, member in ipairs(members) do
+    local attempts, mail = string.match(member, '^(%d+)|[^|]*|(.*)$')
+    redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[3], '*', 'mail', mail, 'attempts', attempts)
+    redis.call('ZREM', KEYS[1], member)
+end
+return #members
+"""
+
+MAX_RETRY_BACKOFF_SECONDS = 3600
+
+
+def _is_permanent_error(error: Exception) -> bool:
+    """재시도해도 성공할 수 없는 오류 (수신자 거부, 5xx 응답)"""
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(error, aiosmtplib.SMTPResponseException) and 500 <= error.code < 600
+
+
+class SMTPSender:
+    """
+    SMTP 연결을 유지하면서 재사용하는 발송기.
+    연결이 끊어진 경우에만 다시 연결하므로 메일마다 연결/로그인 비용이 들지 않는다.
+    """
+
+    def __init__(self, config: ConnectionConfig):
+        self.config = config
+        self._smtp: aiosmtplib.SMTP | None = None
+
+    async def send(self, message: EmailMessage):
+        if self.config.SUPPRESS_SEND:
+            logger.info("mail send suppressed", extra={"to": message["To"], "subject": message["Subject"]})
+            return
+
+        smtp = await self._connect()
+        try:
+            await smtp.send_message(message)
+        except aiosmtplib.SMTPServerDisconnected:
+            # 유휴 상태에서 서버가 연결을 끊은 경우 한 번만 다시 연결해서 보낸다
+            await self.close()
+            smtp = await self._connect()
+            await smtp.send_message(message)
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        if self._smtp is not None and self._smtp.is_connected:
+            return self._smtp
+
+        smtp = aiosmtplib.SMTP(
+            hostname=self.config.MAIL_SERVER,
+            port=self.config.MAIL_PORT,
+            timeout=self.config.TIMEOUT,
+            use_tls=self.config.MAIL_SSL_TLS,
+            start_tls=self.config.MAIL_STARTTLS,
+            validate_certs=self.config.VALIDATE_CERTS,
+            local_hostname=self.config.LOCAL_HOSTNAME,
+            cert_bundle=self.config.CERT_BUNDLE,
+        )
+        await smtp.connect()
+        if self.config.USE_CREDENTIALS:
+            await smtp.login(self.config.MAIL_USERNAME, self.config.MAIL_PASSWORD.get_secret_value())
+
+        self._smtp = smtp
+        return smtp
+
+    async def close(self):
+        smtp, self._smtp = self._smtp, None
+        if smtp is None or not smtp.is_connected:
+            return
+        try:
+            await smtp.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            smtp.close()
+
+
+class MailOutboxWorker:
+    """
+    Redis Stream(outbox) 에 적재된 메일을 consumer group 으로 읽어 SMTP로 발송한다.
+
+    - consumer 마다 SMTP 연결을 하나씩 유지하고 batch 단위로 읽어 같은 연결로 보낸다.
+    - 발송에 실패하면 지수 backoff 후 다시 stream 에 적재하고, max_attempts 번 실패하면 dead letter stream 으로 옮긴다.
+    - ack 되지 않은 채 claim_idle_ms 이상 지난 메일(워커 비정상 종료 등)은 다른 consumer 가 회수해서 보낸다.
+      따라서 발송은 at-least-once 이며 드물게 같은 메일이 두 번 발송될 수 있다.
+    """
+
+    group = "mail-worker"
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        config: ConnectionConfig | None = None,
+        stream: str | None = None,
+        batch_size: int | None = None,
+        block_ms: int | None = None,
+        max_attempts: int | None = None,
+        retry_backoff: float | None = None,
+        claim_idle_ms: int | None = None,
+    ):
+        self.redis = redis
+        self.config = settings.EMAIL if config is None else config
+        self.stream = settings.MAIL_OUTBOX_STREAM if stream is None else stream
+        self.retry_key = f"{self.stream}:retry"
+        self.dead_stream = f"{self.stream}:dead"
+        self.batch_size = settings.MAIL_WORKER_BATCH_SIZE if batch_size is None else batch_size
+        self.block_ms = settings.MAIL_WORKER_BLOCK_MS if block_ms is None else block_ms
+        self.max_attempts = settings.MAIL_MAX_ATTEMPTS if max_attempts is None else max_attempts
+        self.retry_backoff = settings.MAIL_RETRY_BACKOFF_SECONDS if retry_backoff is None else retry_backoff
+        self.claim_idle_ms = settings.MAIL_CLAIM_IDLE_MS if claim_idle_ms is None else claim_idle_ms
+        self._templates = self.config.template_engine()
+        self._requeue_script = redis.register_script(REQUEUE_SCRIPT)
+
+    async def ensure_group(self):
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def run(self, *, concurrency: int | None = None):
+        """취소될 때까지 concurrency 개의 consumer 를 실행한다."""
+        await self.ensure_group()
+
+        consumer_prefix = f"{socket.gethostname()}-{os.getpid()}"
+        async with anyio.create_task_group() as tg:
+            for i in range(settings.MAIL_WORKER_CONCURRENCY if concurrency is None else concurrency):
+                tg.start_soon(self._consume, f"{consumer_prefix}-{i}")
+
+    async def _consume(self, consumer: str):
+        sender = SMTPSender(self.config)
+        try:
+            while True:
+                try:
+                    await self.run_once(consumer, sender)
+                except RedisError:
+                    logger.warning("mail outbox redis unavailable", exc_info=True)
+                    await anyio.sleep(1)
+        finally:
+            with anyio.CancelScope(shield=True):
+                await sender.close()
+
+    async def run_once(self, consumer: str, sender: SMTPSender) -> int:
+        """재시도 대상 적재 -> 방치된 메일 회수 -> 신규 메일 읽기 순서로 한 batch 를 처리하고 처리한 수를 반환한다."""
+        await self.requeue_due_retries()
+
+        entries = await self._claim_stale(consumer)
+        if not entries:
+            entries = await self._read_new(consumer)
+
+        for entry_id, fields in entries:
+            await self._process(entry_id, fields, sender)
+        return len(entries)
+
+    async def requeue_due_retries(self, *, now: float | None = None) -> int:
+        return await self._requeue_script(
+            keys=[self.retry_key, self.stream],
+            args=[time.time() if now is None else now, self.batch_size, settings.MAIL_OUTBOX_MAXLEN],
+        )
+
+    async def _claim_stale(self, consumer: str) -> list[tuple[str, dict[str, Any]]]:
+        _, entries, *_ = await self.redis.xautoclaim(
+            self.stream, self.group, consumer, min_idle_time=self.claim_idle_ms, start_id="0-0", count=self.batch_size
+        )
+        return entries
+
+    async def _read_new(self, consumer: str) -> list[tuple[str, dict[str, Any]]]:
+        response = await self.redis.xreadgroup(
+            self.group, consumer, {self.stream: ">"}, count=self.batch_size, block=self.block_ms
+        )
+        return response[0][1] if response else []
+
+    def build_message(self, mail: MailCreate) -> EmailMessage:
+        html = self._templates.get_template(mail.template_name).render(**mail.template_body)
+
+        message = EmailMessage()
+        message["Subject"] = mail.subject
+        message["From"] = (
+            formataddr((self.config.MAIL_FROM_NAME, self.config.MAIL_FROM))
+            if self.config.MAIL_FROM_NAME
+            else self.config.MAIL_FROM
+        )
+        message["To"] = ", ".join(mail.recipients)
+        message.set_content(html, subtype="html")
+        return message
+
+    async def _process(self, entry_id: str, fields: dict[str, Any], sender: SMTPSender):
+        attempts = int(fields.get("attempts", 0)) + 1
+
+        try:
+            message = self.build_message(MailCreate.model_validate_json(fields["mail"]))
+        except Exception as e:
+            logger.exception("invalid mail outbox entry", extra={"entry_id": entry_id})
+            await self._dead_letter(entry_id, fields, attempts, e)
+            return
+
+        try:
+            await sender.send(message)
+        except Exception as e:
+            if attempts >= self.max_attempts or _is_permanent_error(e):
+                logger.error("mail send failed", exc_info=True, extra={"entry_id": entry_id, "attempts": attempts})
+                await self._dead_letter(entry_id, fields, attempts, e)
+            else:
+                logger.warning("mail send failed, retry later", exc_info=True, extra={"entry_id": entry_id})
+                await self._retry(entry_id, fields, attempts)
+            return
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xack(self.stream, self.group, entry_id)
+            pipe.xdel(self.stream, entry_id)
+            await pipe.execute()
+
+    async def _retry(self, entry_id: str, fields: dict[str, Any], attempts: int):
+        delay = min(self.retry_backoff * 2 ** (attempts - 1), MAX_RETRY_BACKOFF_SECONDS)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(self.retry_key, {f"{attempts}|{entry_id}|{fields['mail']}": time.time() + delay})
+            pipe.xack(self.stream, self.group, entry_id)
+            pipe.xdel(self.stream, entry_id)
+            await pipe.execute()
+
+    async def _dead_letter(self, entry_id: str, fields: dict[str, Any], attempts: int, error: Exception):
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xadd(
+                self.dead_stream,
+                {"mail": fields.get("mail", ""), "attempts": attempts, "origin_id": entry_id, "error": repr(error)},
+                maxlen=settings.MAIL_OUTBOX_MAXLEN,
+                approximate=True,
+            )
+            pipe.xack(self.stream, self.group, entry_id)
+            pipe.xdel(self.stream, entry_id)
+            await pipe.execute()
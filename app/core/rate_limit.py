@@ -0,0 +1,156 @@
+import logging
+import math
+import re
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal, Self
+
+from fastapi import HTTPException, Request, status
+from fastapi.security.utils import get_authorization_scheme_param
+from redis.exceptions import RedisError
+
+from app.core.config import get_setting
+from app.core.redis_client import RedisAsyncDep, async_redis_client  # noqa: TC001
+from app.core.security import verify_access_token
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+settings = get_setting()
+
+# GCRA(Generic Cell Rate Algorithm) - key 하나에 다음 허용 시각(TAT)만 저장하므로 O(1), 한 번의 왕복으로 처리
+# KEYS[1]: 제한 key, ARGV[1]: 요청 간격(ms) = period / limit, ARGV[2]: 허용 burst(limit)
+# 반환: {허용 여부(1/0), 재시도까지 남은 시간(ms)}
+GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+
+local new_tat = tat + interval
+local allow_at = new_tat - burst * interval
+if now < allow_at then
+    return {0, allow_at - now}
+end
+
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+return {1, 0}
+"""
+
+_gcra_script = async_redis_client.register_script(GCRA_SCRIPT)
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    limit: int
+    period: int  # 초
+
+    @property
+    def interval_ms(self) -> float:
+        return self.period * 1000 / self.limit
+
+    @classmethod
+    def parse(cls, value: str) -> Self:
+        """ "10/minute" 형식의 문자열을 파싱한다."""
+        match = re.fullmatch(r"\s*(\d+)\s*/\s*(second|minute|hour|day)\s*", value)
+        if not match:
+            raise ValueError(f"Invalid rate limit rule: {value}")
+        return cls(limit=int(match.group(1)), period=_PERIODS[match.group(2)])
+
+
+class LocalRateLimiter:
+    """Redis 장애 시 사용하는 프로세스 내 GCRA 제한기 (워커 단위로만 제한됨)"""
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        self._tats: dict[str, float] = {}
+
+    def hit(self, key: str, rule: RateLimitRule) -> tuple[bool, float]:
+        now = time.monotonic() * 1000
+        if len(self._tats) >= self.maxsize:
+            self._tats = {k: tat for k, tat in self._tats.items() if tat > now}
+
+        tat = max(self._tats.get(key, now), now)
+        new_tat = tat + rule.interval_ms
+        allow_at = new_tat - rule.limit * rule.interval_ms
+        if now < allow_at:
+            return False, allow_at - now
+
+        self._tats[key] = new_tat
+        return True, 0
+
+
+local_rate_limiter = LocalRateLimiter()
+
+
+async def hit(cache: Redis, key: str, rule: RateLimitRule) -> tuple[bool, float]:
+    """요청 1건을 기록하고 (허용 여부, 재시도까지 남은 시간(ms))를 반환한다."""
+    try:
+        allowed, retry_after_ms = await _gcra_script(keys=[key], args=[rule.interval_ms, rule.limit], client=cache)
+        return bool(allowed), float(retry_after_ms)
+    except RedisError:
+        logger.warning("rate limit redis unavailable, fallback to local limiter", exc_info=True)
+        return local_rate_limiter.hit(key, rule)
+
+
+class RateLimit:
+    """
+    라우트별 요청 수 제한 의존성.
+    제한 값은 Settings.RATE_LIMITS 의 "{name}:{key_type}" 항목으로 설정하며, 설정이 없으면 제한하지 않는다.
+
+    사용 예) @router.post("/login", dependencies=[Depends(RateLimit("login", "ip"))])
+    """
+
+    def __init__(self, name: str, key_type: Literal["ip", "email", "user"]):
+        self.name = name
+        self.key_type = key_type
+
+    async def __call__(self, request: Request, cache: RedisAsyncDep):
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+
+        rule_value = settings.RATE_LIMITS.get(f"{self.name}:{self.key_type}")
+        if not rule_value:
+            return
+
+        identity = await self._get_identity(request)
+        if not identity:
+            return
+
+        rule = RateLimitRule.parse(rule_value)
+        allowed, retry_after_ms = await hit(cache, f"ratelimit:{self.name}:{self.key_type}:{identity}", rule)
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after_ms / 1000)))},
+            )
+
+    async def _get_identity(self, request: Request) -> str | None:
+        match self.key_type:
+            case "ip":
+                return request.client.host if request.client else None
+
+            case "email":
+                # 로그인(OAuth2 form)은 username, 그 외 JSON 요청은 email 필드를 사용
+                if request.headers.get("content-type", "").startswith("application/json"):
+                    body = await request.json()
+                    email = body.get("email") if isinstance(body, dict) else None
+                else:
+                    form = await request.form()
+                    email = form.get("username")
+                return email.strip().lower() if isinstance(email, str) else None
+
+            case "user":
+                scheme, token = get_authorization_scheme_param(request.headers.get("Authorization"))
+                data = verify_access_token(token) if scheme.lower() == "bearer" else None
+                return data["sub"] if data else None
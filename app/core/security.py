@@ -1,6 +1,10 @@
 import copy
+import logging
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 
+import anyio
+import anyio.to_thread
 import jwt
 import pwdlib.exceptions
 from pwdlib import PasswordHash
@@ -8,6 +12,8 @@ from pwdlib.hashers.bcrypt import BcryptHasher
 
 from app.core.config import get_setting
 
+logger = logging.getLogger(__name__)
+
 settings = get_setting()
 
 password_hash = PasswordHash((BcryptHasher(),))
@@ -25,6 +31,65 @@ def verify_password(password: str, hashed_password: str):
         return False
 
 
+@dataclass(frozen=True)
+class PasswordHasherStats:
+    max_concurrency: int
+    in_flight: int  # 현재 스레드에서 실행 중인 해시/검증 수
+    waiting: int  # 실행 슬롯을 기다리는 요청 수 (queue depth)
+
+
+class AsyncPasswordHasher:
+    """
+    bcrypt 해시/검증은 수십 ms 동안 CPU를 사용하므로 이벤트 루프를 막지 않도록 워커 스레드에서 실행한다.
+    동시에 실행되는 수는 max_concurrency 로 제한하고, 초과 요청은 대기열에서 기다린다.
+    대기열에 waiting_warn_threshold 개 이상 쌓여 있으면 실행 중/대기 수와 함께 경고 로그를 남긴다.
+    """
+
+    def __init__(self, *, max_concurrency: int, waiting_warn_threshold: int):
+        self.max_concurrency = max_concurrency
+        self.waiting_warn_threshold = waiting_warn_threshold
+        self._limiter: anyio.CapacityLimiter | None = None
+
+    @property
+    def limiter(self) -> anyio.CapacityLimiter:
+        # CapacityLimiter 는 이벤트 루프 안에서 생성해야 하므로 처음 사용할 때 생성
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(self.max_concurrency)
+        return self._limiter
+
+    async def hash(self, password: str) -> str:
+        self._check_waiting()
+        return await anyio.to_thread.run_sync(create_password_hash, password, limiter=self.limiter)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        self._check_waiting()
+        return await anyio.to_thread.run_sync(verify_password, password, hashed_password, limiter=self.limiter)
+
+    def _check_waiting(self):
+        stats = self.statistics()
+        if stats.waiting >= self.waiting_warn_threshold:
+            logger.warning(
+                "password hasher saturated: %s waiting, %s/%s in flight",
+                stats.waiting,
+                stats.in_flight,
+                stats.max_concurrency,
+            )
+
+    def statistics(self) -> PasswordHasherStats:
+        stats = self.limiter.statistics()
+        return PasswordHasherStats(
+            max_concurrency=self.max_concurrency,
+            in_flight=stats.borrowed_tokens,
+            waiting=stats.tasks_waiting,
+        )
+
+
+password_hasher = AsyncPasswordHasher(
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+    waiting_warn_threshold=settings.PASSWORD_HASH_WAITING_WARN_THRESHOLD,
+)
+
+
 def create_access_token(sub: str, data: dict | None = None):
     data = copy.deepcopy(data) if data is not None else []
 
@@ -0,0 +1,92 @@
+"""
+인기 게시글 순위 (Redis sorted set)
+
+활동(조회/댓글/수정)마다 weight * 2^((t - t0) / half_life) 를 점수에 더하면, 기존 점수를 다시 계산하지 않아도
+half_life 가 지날 때마다 이전 활동의 상대적인 비중이 절반으로 줄어든다. 이 값은 시간이 지나면 float 범위를 넘으므로
+자연로그 값(ln(weight) + (t - t0) * ln2 / half_life)으로 저장하고, 더할 때는 Lua 에서 log-sum-exp 로 계산한다.
+"""
+
+import logging
+import math
+import time
+from typing import TYPE_CHECKING, Literal
+
+import anyio
+from redis.exceptions import RedisError
+
+from app.core.config import get_setting
+from app.core.redis_client import async_redis_client
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+settings = get_setting()
+
+# KEYS[1]: 순위 zset, ARGV[1]: 게시글 short_id, ARGV[2]: 더할 점수 (로그 값)
+# 반환값: 갱신된 점수 (문자열)
+TRENDING_SCRIPT = """
+local score = tonumber(ARGV[2])
+local current = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if current then
+    current = tonumber(current)
+    local high, low = math.max(current, score), math.min(current, score)
+    score = high + math.log(1 + math.exp(low - high))
+end
+redis.call('ZADD', KEYS[1], score, ARGV[1])
+return tostring(score)
+"""
+
+_trending_script = async_redis_client.register_script(TRENDING_SCRIPT)
+
+TrendingEvent = Literal["view", "comment", "edit"]
+
+
+def trending_score(event: TrendingEvent, *, now: float | None = None) -> float:
+    """활동 1건의 점수 (로그 값)"""
+    elapsed = time.time() if now is None else now
+    return math.log(settings.TRENDING_WEIGHTS[event]) + elapsed * math.log(2) / settings.TRENDING_HALF_LIFE_SECONDS
+
+
+async def record_post_activity(redis: Redis, short_id: str, event: TrendingEvent, *, now: float | None = None):
+    """게시글 활동을 순위에 반영한다. 순위는 부가 기능이므로 Redis 오류는 기록만 한다."""
+    try:
+        await _trending_script(
+            keys=[settings.TRENDING_KEY], args=[short_id, trending_score(event, now=now)], client=redis
+        )
+    except RedisError:
+        logger.warning("trending update failed", exc_info=True)
+
+
+async def remove_post_trending(redis: Redis, short_id: str):
+    try:
+        await redis.zrem(settings.TRENDING_KEY, short_id)
+    except RedisError:
+        logger.warning("trending remove failed", exc_info=True)
+
+
+async def get_trending_short_ids(redis: Redis, *, limit: int, offset: int = 0) -> list[str]:
+    """점수가 높은 순으로 short_id 를 반환한다. (O(log N + limit))"""
+    try:
+        return await redis.zrevrange(settings.TRENDING_KEY, offset, offset + limit - 1)
+    except RedisError:
+        logger.warning("trending get failed", exc_info=True)
+        return []
+
+
+async def trim_trending(redis: Redis, *, max_size: int | None = None) -> int:
+    """상위 max_size 개만 남기고 제거한 수를 반환한다."""
+    max_size = settings.TRENDING_MAX_SIZE if max_size is None else max_size
+    return await redis.zremrangebyrank(settings.TRENDING_KEY, 0, -(max_size + 1))
+
+
+async def run_trending_trimmer(redis: Redis, *, interval: float | None = None):
+    """취소될 때까지 interval 마다 순위를 상위 K개로 정리한다."""
+    interval = settings.TRENDING_TRIM_INTERVAL_SECONDS if interval is None else interval
+    while True:
+        await anyio.sleep(interval)
+        try:
+            await trim_trending(redis)
+        except RedisError:
+            logger.warning("trending trim failed", exc_info=True)
@@ -0,0 +1,96 @@
+import logging
+from typing import TYPE_CHECKING
+
+import anyio
+from redis.exceptions import LockError, RedisError
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import crud
+from app.core.config import get_setting
+from app.core.trending import record_post_activity
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+settings = get_setting()
+
+
+async def increment_post_view(redis: Redis, short_id: str, *, key: str | None = None):
+    """
+    게시글 조회수를 Redis hash 에 누적하고 인기 게시글 순위에 반영한다.
+    조회 응답에 영향을 주지 않도록 오류는 기록만 한다.
+    """
+    try:
+        await redis.hincrby(settings.POST_VIEW_COUNT_KEY if key is None else key, short_id, 1)
+    except RedisError:
+        logger.warning("post view increment failed", exc_info=True)
+    await record_post_activity(redis, short_id, "view")
+
+
+class PostViewFlusher:
+    """
+    Redis hash 에 누적된 게시글 조회수를 주기적으로 posts.view_count 에 일괄 반영한다.
+
+    - 반영할 hash 를 처리용 key 로 RENAME 하여 이후의 조회수는 새 hash 에 쌓이도록 분리한다.
+    - 처리용 key 는 DB commit 후에 삭제하므로, 반영에 실패하면 다음 flush 에서 다시 반영한다.
+      (commit 후 삭제 전에 프로세스가 종료된 경우에만 같은 값이 한 번 더 반영될 수 있다)
+    - 여러 워커 프로세스에서 실행되므로 lock 을 잡은 하나의 프로세스만 flush 한다.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        key: str | None = None,
+        interval: float | None = None,
+        batch_size: int | None = None,
+    ):
+        self.redis = redis
+        self.key = settings.POST_VIEW_COUNT_KEY if key is None else key
+        self.flushing_key = f"{self.key}:flushing"
+        self.interval = settings.POST_VIEW_FLUSH_INTERVAL_SECONDS if interval is None else interval
+        self.batch_size = settings.POST_VIEW_FLUSH_BATCH_SIZE if batch_size is None else batch_size
+
+    async def run(self, session_factory: async_sessionmaker[AsyncSession]):
+        """취소될 때까지 interval 마다 flush 한다."""
+        while True:
+            await anyio.sleep(self.interval)
+            try:
+                async with session_factory() as session:
+                    await self.flush(session)
+            except (RedisError, SQLAlchemyError):
+                logger.warning("post view flush failed", exc_info=True)
+
+    async def flush(self, session: AsyncSession) -> int:
+        """누적된 조회수를 DB에 반영하고 반영한 게시글 수를 반환한다."""
+        lock = self.redis.lock(f"{self.key}:lock", timeout=max(self.interval * 6, 60), blocking=False)
+        if not await lock.acquire():
+            return 0
+
+        try:
+            # 이전 flush 가 실패해 처리용 key 가 남아 있으면 그 값을 먼저 반영하고, 새 조회수는 다음 flush 에서 반영
+            # (lock 을 잡은 동안에는 다른 프로세스가 key 를 옮기거나 삭제하지 않으므로 확인 후 RENAME 해도 안전)
+            if not await self.redis.exists(self.flushing_key):
+                if not await self.redis.exists(self.key):
+                    return 0
+                await self.redis.rename(self.key, self.flushing_key)
+
+            counts: dict[str, int] = {}
+            async for short_id, views in self.redis.hscan_iter(self.flushing_key, count=self.batch_size):
+                counts[short_id] = int(views)
+
+            items = list(counts.items())
+            for i in range(0, len(items), self.batch_size):
+                await crud.add_post_view_counts(session=session, counts=dict(items[i : i + self.batch_size]))
+            await session.commit()
+
+            await self.redis.delete(self.flushing_key)
+            return len(counts)
+        finally:
+            try:
+                await lock.release()
+            except (LockError, RedisError):
+                logger.warning("post view flush lock release failed", exc_info=True)
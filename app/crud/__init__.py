@@ -1,17 +1,67 @@
 from .auth import create_verification_code, get_verification_code
-from .comment import create_post_comment, get_post_comment_by_id, get_post_comments
-from .post import create_post, get_post_by_short_id, get_post_list
-from .user import create_user, get_user_by_email
+from .base import insert_returning, purge_statement, update_returning
+from .comment import (
+    create_post_comment,
+    delete_post_comment,
+    get_post_comment_by_id,
+    get_post_comment_page,
+    get_post_comments,
+    purge_comments_of_deleted_posts,
+    purge_deleted_post_comments,
+    reconcile_post_comment_counts,
+)
+from .mail import enqueue_mail
+from .post import (
+    add_post_view_counts,
+    create_post,
+    delete_post,
+    get_post_by_short_id,
+    get_post_list,
+    get_post_page,
+    get_post_read,
+    get_post_reads,
+    get_post_summaries,
+    invalidate_post_cache,
+    invalidate_post_suggest_cache,
+    invalidate_user_post_cache,
+    purge_deleted_posts,
+    search_posts,
+    suggest_posts,
+)
+from .user import create_user, get_principal, get_user_by_email, invalidate_principal
 
 __all__ = [
+    "insert_returning",
+    "purge_statement",
+    "update_returning",
     "create_post_comment",
+    "delete_post_comment",
     "get_post_comment_by_id",
+    "get_post_comment_page",
     "get_post_comments",
+    "purge_comments_of_deleted_posts",
+    "purge_deleted_post_comments",
+    "reconcile_post_comment_counts",
+    "enqueue_mail",
+    "add_post_view_counts",
     "create_post",
+    "delete_post",
     "get_post_by_short_id",
     "get_post_list",
+    "get_post_page",
+    "get_post_read",
+    "get_post_reads",
+    "get_post_summaries",
+    "invalidate_post_cache",
+    "invalidate_post_suggest_cache",
+    "invalidate_user_post_cache",
+    "purge_deleted_posts",
+    "search_posts",
+    "suggest_posts",
     "create_user",
+    "get_principal",
     "get_user_by_email",
+    "invalidate_principal",
     "create_verification_code",
     "get_verification_code",
 ]
@@ -0,0 +1,92 @@
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import delete, inspect, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.base import TimestampMixin
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from sqlalchemy import ColumnElement, Delete, Insert
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import InstrumentedAttribute
+
+    from app.models.base import BaseModel
+
+
+def _with_timestamps(model: type[BaseModel], values: dict[str, Any]) -> dict[str, Any]:
+    """INSERT 문은 before_insert 이벤트가 실행되지 않으므로 생성/수정 시각을 직접 맞춘다."""
+    if not issubclass(model, TimestampMixin):
+        return values
+
+    values = dict(values)
+    values.setdefault("created_at", datetime.now(UTC))
+    values.setdefault("updated_at", values["created_at"])
+    return values
+
+
+async def insert_returning(
+    *,
+    session: AsyncSession,
+    model: type[BaseModel],
+    values: dict[str, Any],
+    on_conflict_do_nothing: Sequence[InstrumentedAttribute] | None = None,
+) -> Any | None:
+    """
+    INSERT ... RETURNING 한 번으로 행을 생성하고 서버 기본값이 채워진 객체를 반환한다. (commit/refresh 는 하지 않음)
+    on_conflict_do_nothing 에 unique 컬럼을 지정하면 충돌 시 None 을 반환한다.
+    """
+    stmt = insert(model).values(**_with_timestamps(model, values))
+    if on_conflict_do_nothing:
+        stmt = stmt.on_conflict_do_nothing(index_elements=on_conflict_do_nothing)
+
+    return await session.scalar(stmt.returning(model))
+
+
+async def update_returning(*, session: AsyncSession, obj: BaseModel, values: dict[str, Any]) -> Any:
+    """
+    UPDATE ... RETURNING 한 번으로 obj 에 해당하는 행을 수정하고, 반환된 값으로 obj 를 갱신한다.
+    commit/refresh 는 하지 않으며 이미 로딩된 relationship 은 그대로 유지된다.
+    """
+    mapper = inspect(obj).mapper
+    # deferred 컬럼은 조회 시와 마찬가지로 반환받지 않는다
+    attrs = [attr for attr in mapper.column_attrs if not attr.deferred]
+
+    primary_key = zip(mapper.primary_key, mapper.primary_key_from_instance(obj), strict=True)
+    stmt = (
+        update(mapper.local_table)
+        .where(*[column == value for column, value in primary_key])
+        .values(**values)
+        .returning(*[attr.columns[0] for attr in attrs])
+    )
+    row = (await session.execute(stmt)).one()
+
+    for attr, value in zip(attrs, row, strict=True):
+        set_committed_value(obj, attr.key, value)
+    return obj
+
+
+def purge_statement(
+    *, model: type[BaseModel], where: ColumnElement[bool], archive_model: type[BaseModel] | None = None
+) -> Delete | Insert:
+    """
+    where 에 해당하는 행을 삭제하고 삭제한 행의 id 를 반환(RETURNING)하는 문을 만든다.
+    archive_model 을 지정하면 삭제한 행을 같은 이름의 컬럼으로 archive 테이블에 옮긴다.
+    (DELETE ... RETURNING 을 CTE 로 사용하므로 삭제와 이동이 한 문에서 처리된다)
+    """
+    table = model.__table__
+    stmt = delete(table).where(where)
+    if archive_model is None:
+        return stmt.returning(table.c.id)
+
+    archive_table = archive_model.__table__
+    names = [column.name for column in archive_table.c if column.name in table.c]
+    moved = stmt.returning(*[table.c[name] for name in names]).cte(f"{table.name}_moved")
+    return (
+        archive_table.insert()
+        .from_select(names, select(*[moved.c[name] for name in names]))
+        .returning(archive_table.c.id)
+    )
@@ -1,39 +1,66 @@
+from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, func, select, tuple_, update
 from sqlalchemy.orm import contains_eager
 
-from app.models import Post, PostComment, User
+from app.core.cache import TwoTierCache, params_cache_key
+from app.core.config import get_setting
+from app.crud.base import insert_returning, purge_statement
+from app.models import Post, PostComment, PostCommentArchive, User
+from app.schemas import PostCommentPage, PostCommentRead
+from app.schemas.common import TimestampCursor
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
-    from app.schemas import PostCommentCreate, PostCommentRead
+    from app.schemas import PostCommentCreate
     from app.schemas.filters import PostCommentFilterParams
 
+settings = get_setting()
+
+comment_list_cache = TwoTierCache(
+    "post_comment:list", ttl=settings.COMMENT_LIST_CACHE_TTL_SECONDS, enabled=settings.COMMENT_LIST_CACHE_ENABLED
+)
+
 
 async def get_post_comments(*, session: AsyncSession, params: PostCommentFilterParams) -> list[PostCommentRead]:
     stmt = select(PostComment).join(PostComment.user).join(PostComment.post)
 
-    conditions = [PostComment.is_delete == False]  # noqa: E712
+    # 삭제된 댓글(및 삭제된 게시글/작성자의 댓글)은 전역 soft delete 조건으로 제외된다 (app/models/base.py)
+    conditions = []
 
+    # short_id -> post_id 를 먼저 조회해서 댓글 조회가 (post_id, created_at, id) 부분 인덱스만 타도록 한다
     if params.post_short_id:
-        conditions.append(Post.short_id == params.post_short_id)
+        post_id = await session.scalar(select(Post.id).where(Post.short_id == params.post_short_id))
+        if post_id is None:
+            return []
+        conditions.append(PostComment.post_id == post_id)
+
+    if params.cursor:
+        cursor = TimestampCursor.decode(params.cursor)
+        keyset = tuple_(PostComment.created_at, PostComment.id)
+        if params.order_direction == "desc":
+            conditions.append(keyset < (cursor.at, cursor.id))
+        else:
+            conditions.append(keyset > (cursor.at, cursor.id))
 
     # 모든 조건을 and_ 로 묶어서 where 절에 한 번에 적용
     if conditions:
         stmt = stmt.where(and_(*conditions))
 
-    order_by_column = PostComment.created_at
-    order_by_option = order_by_column.desc() if params.order_direction == "desc" else order_by_column.asc()
+    order_by_columns = (PostComment.created_at, PostComment.id)
+    if params.order_direction == "desc":
+        order_by_options = [column.desc() for column in order_by_columns]
+    else:
+        order_by_options = [column.asc() for column in order_by_columns]
 
     # options 조인된 테이블의 특정 데이터만 가져오도록 옵션처리
     # post의 content의 경우 무거운 데이터가 될 수 있으므로 제외
     # contains_eager: 이미 조인되었으면 조인된 데이터를 활용
     # load_only : 조인시 해당되는 컬럼만 가져오기
     stmt = (
-        stmt.order_by(order_by_option)
-        .offset(params.offset)
+        stmt.order_by(*order_by_options)
         .limit(params.limit)
         .options(
             contains_eager(PostComment.user).load_only(User.id, User.nickname),
@@ -41,21 +68,153 @@ async def get_post_comments(*, session: AsyncSession, params: PostCommentFilterP
         )
     )
 
+    # offset은 커서를 사용하지 않는 기존 클라이언트를 위해서만 유지
+    if not params.cursor:
+        stmt = stmt.offset(params.offset)
+
     result = await session.execute(stmt)
     return list(result.scalars().all())
 
 
-async def create_post_comment(*, session: AsyncSession, comment_in: PostCommentCreate):
-    db_obj = PostComment(**comment_in.model_dump(exclude_unset=True))
-    session.add(db_obj)
+@comment_list_cache.cached(key=lambda *, params, **_: params_cache_key(params), response_type=PostCommentPage)
+async def get_post_comment_page(*, session: AsyncSession, params: PostCommentFilterParams) -> PostCommentPage:
+    comments = await get_post_comments(session=session, params=params)
+
+    # 페이지가 가득 찼으면 다음 페이지가 있을 수 있으므로 마지막 행 기준 커서를 내려준다
+    next_cursor = None
+    if len(comments) == params.limit:
+        next_cursor = TimestampCursor(
+            at=comments[-1].created_at, id=comments[-1].id, order_direction=params.order_direction
+        ).encode()
+
+    items = [PostCommentRead.model_validate(comment, from_attributes=True) for comment in comments]
+    return PostCommentPage(items=items, next_cursor=next_cursor)
+
+
+async def _add_post_comment_count(*, session: AsyncSession, post_id: int | None, delta: int) -> str | None:
+    """게시글의 댓글 수를 DB에서 원자적으로 증감하고 게시글의 short_id 를 반환한다. (동시 요청 시에도 유실 없음)"""
+    if post_id is None:
+        return None
+
+    # 댓글 수 변경은 게시글 수정이 아니므로 updated_at(onupdate) 을 유지한다
+    stmt = (
+        update(Post)
+        .where(Post.id == post_id)
+        .values(comment_count=Post.comment_count + delta, updated_at=Post.updated_at)
+        .returning(Post.short_id)
+    )
+    return await session.scalar(stmt)
+
+
+async def create_post_comment(*, session: AsyncSession, comment_in: PostCommentCreate) -> PostComment:
+    """댓글 생성과 게시글의 댓글 수 증가를 한 트랜잭션에서 처리한다."""
+    db_obj = await insert_returning(
+        session=session, model=PostComment, values=comment_in.model_dump(exclude_unset=True, exclude_none=True)
+    )
+    await _add_post_comment_count(session=session, post_id=db_obj.post_id, delta=1)
     await session.commit()
-    await session.refresh(db_obj)
     return db_obj
 
 
-async def get_post_comment_by_id(*, session: AsyncSession, comment_id: int):
-    result = await session.execute(
-        select(PostComment).where((PostComment.id == comment_id) & (PostComment.is_delete == False))  # noqa: E712, W291
+async def delete_post_comment(*, session: AsyncSession, comment: PostComment) -> str | None:
+    """
+    댓글을 soft delete 하고 게시글의 댓글 수를 감소시킨다. 댓글 수가 바뀐 게시글의 short_id 를 반환한다.
+    이미 삭제된 댓글은 UPDATE 대상에서 제외되므로 동시에 삭제 요청이 와도 한 번만 감소한다.
+    """
+    stmt = (
+        update(PostComment)
+        .where(PostComment.id == comment.id, PostComment.is_delete == False)  # noqa: E712
+        .values(is_delete=True, deleted_at=datetime.now(UTC))
+        .returning(PostComment.post_id)
     )
+    result = (await session.execute(stmt)).one_or_none()
+
+    short_id = None
+    if result is not None:
+        short_id = await _add_post_comment_count(session=session, post_id=result.post_id, delta=-1)
+    await session.commit()
+    return short_id
+
+
+async def reconcile_post_comment_counts(
+    *, session: AsyncSession, after_id: int = 0, batch_size: int = 1000
+) -> tuple[int | None, list[str]]:
+    """
+    id 가 after_id 보다 큰 게시글 batch_size 개의 댓글 수를 다시 계산해 어긋난 값만 수정하고 commit 한다.
+    (배치의 마지막 게시글 id, 수정된 게시글의 short_id 목록) 을 반환하며, 더 이상 게시글이 없으면 id 는 None
+    """
+    batch = select(Post.id).where(Post.id > after_id).order_by(Post.id).limit(batch_size).subquery()
+    last_id = await session.scalar(select(func.max(batch.c.id)))
+    if last_id is None:
+        return None, []
+
+    # 삭제되지 않은 댓글의 (post_id, ...) 부분 인덱스로 게시글별 댓글 수를 센다
+    actual_count = (
+        select(func.count())
+        .where(PostComment.post_id == Post.id, PostComment.is_delete == False)  # noqa: E712
+        .scalar_subquery()
+    )
+    stmt = (
+        update(Post)
+        .where(Post.id > after_id, Post.id <= last_id, Post.comment_count != actual_count)
+        .values(comment_count=actual_count, updated_at=Post.updated_at)
+        .returning(Post.short_id)
+    )
+    short_ids = list((await session.scalars(stmt)).all())
+    await session.commit()
+    return last_id, short_ids
+
+
+async def purge_deleted_post_comments(
+    *, session: AsyncSession, before: datetime, batch_size: int = 500, archive: bool = True
+) -> int:
+    """
+    before 이전에 삭제된 댓글을 최대 batch_size 개 정리(archive 지정 시 post_comments_archive 로 이동)하고 commit 한다.
+    다른 트랜잭션이 잠근 행은 기다리지 않고 건너뛰며(SKIP LOCKED), 처리한 댓글 수를 반환한다.
+    """
+    batch = (
+        select(PostComment.id)
+        .where(PostComment.is_delete == True, PostComment.deleted_at < before)  # noqa: E712
+        .order_by(PostComment.deleted_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = purge_statement(
+        model=PostComment,
+        where=PostComment.id.in_(batch.scalar_subquery()),
+        archive_model=PostCommentArchive if archive else None,
+    )
+    purged = len((await session.scalars(stmt)).all())
+    await session.commit()
+    return purged
+
+
+async def purge_comments_of_deleted_posts(
+    *, session: AsyncSession, before: datetime, batch_size: int = 500, archive: bool = True
+) -> int:
+    """
+    before 이전에 삭제된 게시글에 남아 있는 댓글(삭제 여부와 관계없이)을 최대 batch_size 개 정리하고 commit 한다.
+    게시글 정리(purge_deleted_posts) 전에 실행해서 댓글이 많은 게시글도 배치 크기만큼씩 나누어 정리되도록 한다.
+    다른 트랜잭션이 잠근 행은 건너뛰며(SKIP LOCKED), 처리한 댓글 수를 반환한다.
+    """
+    deleted_posts = select(Post.id).where(Post.is_delete == True, Post.deleted_at < before)  # noqa: E712
+    batch = (
+        select(PostComment.id)
+        .where(PostComment.post_id.in_(deleted_posts))
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = purge_statement(
+        model=PostComment,
+        where=PostComment.id.in_(batch.scalar_subquery()),
+        archive_model=PostCommentArchive if archive else None,
+    )
+    purged = len((await session.scalars(stmt)).all())
+    await session.commit()
+    return purged
+
+
+async def get_post_comment_by_id(*, session: AsyncSession, comment_id: int):
+    result = await session.execute(select(PostComment).where(PostComment.id == comment_id))
 
     return result.scalar_one_or_none()
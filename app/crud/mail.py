@@ -0,0 +1,20 @@
+from typing import TYPE_CHECKING
+
+from app.core.config import get_setting
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+    from app.schemas import MailCreate
+
+settings = get_setting()
+
+
+async def enqueue_mail(cache: Redis, mail_in: MailCreate) -> str:
+    """메일 발송 요청을 outbox stream 에 적재하고 stream entry id를 반환한다."""
+    return await cache.xadd(
+        settings.MAIL_OUTBOX_STREAM,
+        {"mail": mail_in.model_dump_json(), "attempts": 0},
+        maxlen=settings.MAIL_OUTBOX_MAXLEN,
+        approximate=True,
+    )
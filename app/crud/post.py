@@ -1,40 +1,124 @@
+import functools
+import re
+from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
 from nanoid import generate
-from sqlalchemy import and_, select
-from sqlalchemy.exc import IntegrityError
+from pydantic import TypeAdapter
+from sqlalchemy import Integer, String, and_, any_, bindparam, cast, column, func, or_, select, tuple_, update, values
+from sqlalchemy.dialects.postgresql import ARRAY, DOUBLE_PRECISION
 from sqlalchemy.ext.asyncio import AsyncSession  # noqa: TC002
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import contains_eager, joinedload, load_only
 
-from app.models import Post, User
+from app.core.cache import TwoTierCache, params_cache_key
+from app.core.config import get_setting
+from app.crud.base import insert_returning, purge_statement
+from app.models import Post, PostArchive, PostComment, User
+from app.schemas import (
+    PostAuthorRead,
+    PostPage,
+    PostRead,
+    PostSearchPage,
+    PostSearchRead,
+    PostSuggestRead,
+    PostSummaryRead,
+)
+from app.schemas.common import RankCursor, TimestampCursor
 
 if TYPE_CHECKING:
     from app.schemas import PostCreate
-    from app.schemas.filters import PostFilterParams
+    from app.schemas.filters import PostFilterParams, PostSearchParams, PostSuggestParams
+
+settings = get_setting()
+
+post_cache = TwoTierCache("post:detail", ttl=settings.POST_CACHE_TTL_SECONDS, enabled=settings.POST_CACHE_ENABLED)
+post_list_cache = TwoTierCache(
+    "post:list", ttl=settings.POST_LIST_CACHE_TTL_SECONDS, enabled=settings.POST_LIST_CACHE_ENABLED
+)
+post_suggest_cache = TwoTierCache(
+    "post:suggest", ttl=settings.POST_SUGGEST_CACHE_TTL_SECONDS, enabled=settings.POST_SUGGEST_CACHE_ENABLED
+)
+_post_read_adapter = TypeAdapter(PostRead)
+_post_suggest_adapter = TypeAdapter(list[PostSuggestRead])
+
+
+def _user_tag(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def _post_cache_tags(post: PostRead) -> list[str]:
+    return [_user_tag(post.user_id)]
+
+
+def _post_summary_options():
+    """목록 응답(PostSummaryRead)에 필요한 컬럼만 읽도록 하는 옵션 (users 테이블이 조인되어 있어야 함)"""
+    return (
+        load_only(
+            Post.short_id,
+            Post.title,
+            Post.excerpt,
+            Post.comment_count,
+            Post.user_id,
+            Post.created_at,
+            Post.updated_at,
+        ),
+        contains_eager(Post.user).load_only(User.nickname),
+    )
 
 
 async def get_post_list(*, session: AsyncSession, params: PostFilterParams) -> list[Post]:
-    stmt = select(Post).join(User)
+    """
+    게시글 목록 조회 - 목록 응답(PostSummaryRead)에 필요한 컬럼만 읽는다.
+    본문(content) 과 작성자의 이메일/비밀번호 등은 조회하지 않으므로 반환된 객체에서 접근하면 안 된다.
+    """
+    # 탈퇴한 작성자의 게시글도 목록에 포함하고 작성자만 비워서 반환 (user=None)
+    stmt = select(Post).outerjoin(User).options(*_post_summary_options())
 
     conditions = []
 
-    # 날짜 필터링 - 현재는 create_at으로 고정
-    date_column = Post.created_at
+    # 작성자 필터링 - 닉네임(대소문자 무시) 인덱스로 작성자 id를 먼저 조회해서
+    # 게시글 조회가 (user_id, created_at, id) 인덱스를 타도록 한다 (닉네임은 중복될 수 있음)
+    if params.handle:
+        user_ids = list(
+            (await session.scalars(select(User.id).where(func.lower(User.nickname) == params.handle.lower()))).all()
+        )
+        if not user_ids:
+            return []
+        conditions.append(Post.user_id == user_ids[0] if len(user_ids) == 1 else Post.user_id.in_(user_ids))
+
+    # 정렬 기준 컬럼 - 날짜 필터링과 커서도 같은 컬럼을 기준으로 해서 (정렬 기준, id) 복합 인덱스 범위만 읽는다
+    order_column = Post.updated_at if params.order_by == "updated_at" else Post.created_at
 
     if params.start:
-        conditions.append(date_column >= params.start)
+        conditions.append(order_column >= params.start)
     if params.end:
-        conditions.append(date_column <= params.end)
+        conditions.append(order_column <= params.end)
+
+    # keyset 페이지네이션: (정렬 기준, id) 복합 인덱스를 타고 이전 페이지 마지막 행 다음부터 읽는다
+    if params.cursor:
+        cursor = TimestampCursor.decode(params.cursor)
+        keyset = tuple_(order_column, Post.id)
+        if params.order_direction == "desc":
+            conditions.append(keyset < (cursor.at, cursor.id))
+        else:
+            conditions.append(keyset > (cursor.at, cursor.id))
 
     # 모든 조건을 and_ 로 묶어서 where 절에 한 번에 적용
     if conditions:
         stmt = stmt.where(and_(*conditions))
 
-    # 정렬 조건 - 현재는 created_at으로 고정
-    order_by_column = Post.created_at
-    order_by_option = order_by_column.desc() if params.order_direction == "desc" else order_by_column.asc()
+    # 동일 시각의 행 순서를 고정하기 위해 id를 보조 정렬로 사용
+    order_by_columns = (order_column, Post.id)
+    if params.order_direction == "desc":
+        order_by_options = [column.desc() for column in order_by_columns]
+    else:
+        order_by_options = [column.asc() for column in order_by_columns]
+
+    stmt = stmt.order_by(*order_by_options).limit(params.limit)
 
-    stmt = stmt.order_by(order_by_option).offset(params.offset).limit(params.limit).options(joinedload(Post.user))
+    # offset은 커서를 사용하지 않는 기존 클라이언트를 위해서만 유지
+    if not params.cursor:
+        stmt = stmt.offset(params.offset)
 
     # 6. 쿼리를 실행하고 결과를 반환합니다.
     result = await session.execute(stmt)
@@ -47,22 +131,309 @@ async def get_post_by_short_id(session: AsyncSession, short_id: str) -> Post | N
     return result.scalar_one_or_none()
 
 
-async def create_post(session: AsyncSession, post_in: PostCreate):
+@post_cache.cached(key=lambda *, short_id, **_: short_id, response_type=PostRead, tags=_post_cache_tags)
+async def get_post_read(*, session: AsyncSession, short_id: str) -> PostRead | None:
+    """게시글 단건 조회 (2단 캐시 사용, 작성자 닉네임 변경 시 함께 무효화할 수 있도록 작성자 tag를 붙인다)"""
+    post = await get_post_by_short_id(session=session, short_id=short_id)
+    return PostRead.model_validate(post, from_attributes=True) if post else None
+
+
+async def _load_post_reads(*, session: AsyncSession, short_ids: list[str]) -> dict[str, PostRead]:
+    stmt = (
+        select(Post)
+        .where(Post.short_id == any_(bindparam("short_ids", short_ids, type_=ARRAY(String))))
+        .options(joinedload(Post.user))
+    )
+    posts = (await session.scalars(stmt)).all()
+    return {post.short_id: PostRead.model_validate(post, from_attributes=True) for post in posts}
+
+
+async def get_post_reads(*, session: AsyncSession, short_ids: list[str]) -> dict[str, PostRead]:
+    """
+    여러 게시글을 get_post_read 와 같은 캐시를 사용해 조회한다. 찾은 게시글만 {short_id: PostRead} 로 반환한다.
+    캐시는 MGET 한 번으로 조회하고, 캐시에 없는 게시글은 short_id = ANY(...) 한 번으로 조회한다.
+    """
+    return await post_cache.get_many_or_load(
+        short_ids,
+        lambda missing: _load_post_reads(session=session, short_ids=missing),
+        _post_read_adapter,
+        _post_cache_tags,
+    )
+
+
+@post_list_cache.cached(key=lambda *, params, **_: params_cache_key(params), response_type=PostPage)
+async def get_post_page(*, session: AsyncSession, params: PostFilterParams) -> PostPage:
+    posts = await get_post_list(session=session, params=params)
+
+    # 페이지가 가득 찼으면 다음 페이지가 있을 수 있으므로 마지막 행 기준 커서를 내려준다
+    next_cursor = None
+    if len(posts) == params.limit:
+        next_cursor = TimestampCursor(
+            at=getattr(posts[-1], params.order_by),
+            id=posts[-1].id,
+            order_by=params.order_by,
+            order_direction=params.order_direction,
+        ).encode()
+
+    items = [PostSummaryRead.model_validate(post) for post in posts]
+    return PostPage(items=items, next_cursor=next_cursor)
+
+
+async def get_post_summaries(*, session: AsyncSession, short_ids: list[str]) -> list[PostSummaryRead]:
+    """short_ids 의 게시글을 short_id = ANY(...) 한 번으로 조회해 short_ids 순서대로 반환한다. (없는 게시글은 제외)"""
+    if not short_ids:
+        return []
+
+    stmt = (
+        select(Post)
+        .outerjoin(User)
+        .where(Post.short_id == any_(bindparam("short_ids", short_ids, type_=ARRAY(String))))
+        .options(*_post_summary_options())
+    )
+    posts = {post.short_id: post for post in (await session.scalars(stmt)).all()}
+    return [PostSummaryRead.model_validate(posts[short_id]) for short_id in short_ids if short_id in posts]
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def search_posts(*, session: AsyncSession, params: PostSearchParams) -> PostSearchPage:
+    """
+    게시글 전문 검색 (검색 점수 내림차순, keyset 페이지네이션)
+
+    - 본문/제목: search_vector(GIN) 에 대해 단어별 접두어 검색 (조사가 붙은 "블로그를" 도 "블로그" 로 검색)
+    - 제목: 단어 중간에 포함된 검색어는 pg_trgm 인덱스를 타는 ILIKE 로 보완
+    - 강조 문구(ts_headline)는 DB에서 페이지에 포함된 행에 대해서만 계산하므로 본문 전체를 읽어오지 않는다
+    """
+    # tsquery 문법 문자를 제거하고 단어만 사용
+    terms = re.findall(r"\w+", params.q)
+    if not terms:
+        return PostSearchPage(items=[])
+
+    query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+    # ts_rank/similarity 는 real 이므로, 커서에 저장한 float 값과 DB에서 비교하는 값이 같도록 double precision 으로 변환
+    rank = cast(func.ts_rank(Post.search_vector, query) + func.similarity(Post.title, params.q), DOUBLE_PRECISION)
+
+    conditions = [
+        or_(
+            Post.search_vector.bool_op("@@")(query),
+            Post.title.ilike(f"%{_escape_like(params.q)}%", escape="\\"),
+        )
+    ]
+    if params.cursor:
+        cursor = RankCursor.decode(params.cursor)
+        conditions.append(tuple_(rank, Post.id) < (cursor.rank, cursor.id))
+
+    # 1. 검색 대상 id와 점수만으로 한 페이지를 먼저 정한다
+    matched = (
+        select(Post.id, rank.label("rank"))
+        .where(and_(*conditions))
+        .order_by(rank.desc(), Post.id.desc())
+        .limit(params.limit)
+        .subquery()
+    )
+
+    # 2. 페이지에 포함된 행에 대해서만 강조 문구와 작성자 정보를 가져온다
+    headline = func.ts_headline(
+        "simple", Post.content, query, "StartSel=<b>, StopSel=</b>, MaxWords=35, MinWords=15, MaxFragments=2"
+    )
+    stmt = (
+        select(
+            matched.c.id,
+            matched.c.rank,
+            Post.short_id,
+            Post.title,
+            headline.label("headline"),
+            Post.created_at,
+            Post.updated_at,
+            User.id.label("user_id"),
+            User.nickname,
+        )
+        .join(Post, Post.id == matched.c.id)
+        .outerjoin(User, User.id == Post.user_id)
+        .order_by(matched.c.rank.desc(), matched.c.id.desc())
+    )
+    rows = (await session.execute(stmt)).all()
+
+    next_cursor = None
+    if len(rows) == params.limit:
+        next_cursor = RankCursor(rank=rows[-1].rank, id=rows[-1].id).encode()
+
+    items = [
+        PostSearchRead(
+            short_id=row.short_id,
+            title=row.title,
+            headline=row.headline,
+            rank=row.rank,
+            user=PostAuthorRead(id=row.user_id, nickname=row.nickname) if row.user_id else None,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
+        for row in rows
+    ]
+    return PostSearchPage(items=items, next_cursor=next_cursor)
+
+
+def _normalize_suggest_query(q: str) -> str:
+    return " ".join(q.lower().split())
+
+
+# 접두어 검색(3글자 미만) 결과의 tag - 검색어가 곧 제목의 접두어이므로 제목당 tag 2개로 무효화할 수 있다
+_SUGGEST_PREFIX_LENGTH = 3
+
+
+def _suggest_prefix_tag(prefix: str) -> str:
+    return f"p:{prefix}"
+
+
+def _suggest_post_tag(short_id: str) -> str:
+    return f"s:{short_id}"
+
+
+async def _load_post_suggestions(*, session: AsyncSession, q: str, limit: int) -> list[PostSuggestRead]:
+    # 3글자 미만은 trigram 이 만들어지지 않아 부분 일치(%q%)로는 인덱스를 탈 수 없으므로
+    # 앞쪽 공백이 붙는 trigram 을 사용할 수 있는 접두어 검색(q%)만 한다
+    pattern = f"{_escape_like(q)}%" if len(q) < _SUGGEST_PREFIX_LENGTH else f"%{_escape_like(q)}%"
+    stmt = (
+        select(Post.short_id, Post.title)
+        .where(Post.title.ilike(pattern, escape="\\"))
+        .order_by(func.similarity(Post.title, q).desc(), Post.id.desc())
+        .limit(limit)
+    )
+    rows = (await session.execute(stmt)).all()
+    return [PostSuggestRead.model_validate(row) for row in rows]
+
+
+async def suggest_posts(*, session: AsyncSession, params: PostSuggestParams) -> list[PostSuggestRead]:
+    """
+    게시글 제목 자동완성 (pg_trgm 인덱스 사용)
+
+    입력 중인 검색어마다 호출되므로 정규화한 검색어 기준으로 짧게 캐시한다. (결과가 없는 경우도 캐시)
+    - 결과에 포함된 게시글 tag: 게시글 수정/삭제 시 해당 게시글이 포함된 결과만 무효화
+    - 접두어 검색어 tag: 새 제목이 생기면 그 제목의 접두어 검색 결과만 무효화
+    부분 문자열 검색 결과에 새 제목이 추가되는 것은 TTL 이 지난 뒤 반영된다.
+    (제목의 모든 부분 문자열을 무효화하면 쓰기마다 캐시 대부분이 지워지므로)
+    """
+    q = _normalize_suggest_query(params.q)
+    if not q:
+        return []
+
+    return await post_suggest_cache.get_or_load(
+        f"{params.limit}:{q}",
+        functools.partial(_load_post_suggestions, session=session, q=q, limit=params.limit),
+        _post_suggest_adapter,
+        lambda suggestions: [
+            *([_suggest_prefix_tag(q)] if len(q) < _SUGGEST_PREFIX_LENGTH else []),
+            *(_suggest_post_tag(suggestion.short_id) for suggestion in suggestions),
+        ],
+    )
+
+
+async def invalidate_post_suggest_cache(*titles: str, short_id: str | None = None):
+    """
+    자동완성 캐시 중 short_id 게시글이 포함된 결과와 titles 의 접두어 검색 결과를 무효화한다.
+    (작성 시에는 새 제목, 수정 시에는 short_id 와 변경 후 제목, 삭제 시에는 short_id 를 전달)
+    제목 길이와 관계없이 무효화하는 tag 는 최대 (제목 수 x 2 + 1) 개
+    """
+    tags = {
+        _suggest_prefix_tag(normalized[:length])
+        for title in titles
+        if (normalized := _normalize_suggest_query(title))
+        for length in range(1, _SUGGEST_PREFIX_LENGTH)
+    }
+    if short_id is not None:
+        tags.add(_suggest_post_tag(short_id))
+    await post_suggest_cache.invalidate_tags(*sorted(tags))
+
+
+async def invalidate_post_cache(*, short_id: str):
+    await post_cache.invalidate(short_id)
+
+
+async def invalidate_user_post_cache(*, user_id: int):
+    await post_cache.invalidate_tag(_user_tag(user_id))
+
+
+async def add_post_view_counts(*, session: AsyncSession, counts: dict[str, int]):
+    """
+    {short_id: 증가한 조회수} 를 UPDATE ... FROM (VALUES ...) 한 번으로 반영한다. (commit 은 하지 않음)
+    그 사이 삭제된 게시글의 조회수는 무시된다.
+    """
+    if not counts:
+        return
+
+    increments = values(column("short_id", String), column("views", Integer), name="increments").data(
+        list(counts.items())
+    )
+    # 조회수 반영은 게시글 수정이 아니므로 updated_at(onupdate) 을 유지한다
+    stmt = (
+        update(Post)
+        .where(Post.short_id == increments.c.short_id)
+        .values(view_count=Post.view_count + increments.c.views, updated_at=Post.updated_at)
+    )
+    await session.execute(stmt)
+
+
+async def delete_post(*, session: AsyncSession, post: Post) -> bool:
+    """게시글을 soft delete 한다. 이미 삭제된 경우 False 를 반환한다."""
+    stmt = (
+        update(Post)
+        .where(Post.id == post.id, Post.is_delete == False)  # noqa: E712
+        .values(is_delete=True, deleted_at=datetime.now(UTC))
+        .returning(Post.id)
+    )
+    deleted = await session.scalar(stmt) is not None
+    await session.commit()
+    return deleted
+
+
+async def purge_deleted_posts(
+    *, session: AsyncSession, before: datetime, batch_size: int = 500, archive: bool = True
+) -> int:
+    """
+    before 이전에 삭제된 게시글을 최대 batch_size 개 정리(archive 지정 시 posts_archive 로 이동)하고 commit 한다.
+    댓글이 남아 있는 게시글은 건너뛰므로 purge_comments_of_deleted_posts 로 댓글을 먼저 정리해야 한다.
+    (댓글 수와 관계없이 한 배치에서 처리하는 행 수가 batch_size 로 제한됨)
+    다른 트랜잭션이 잠근 게시글은 건너뛰며(SKIP LOCKED), 처리한 게시글 수를 반환한다.
+    """
+    batch = (
+        select(Post.id)
+        .where(
+            Post.is_delete == True,  # noqa: E712
+            Post.deleted_at < before,
+            ~select(PostComment.id).where(PostComment.post_id == Post.id).exists(),
+        )
+        .order_by(Post.deleted_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = purge_statement(
+        model=Post, where=Post.id.in_(batch.scalar_subquery()), archive_model=PostArchive if archive else None
+    )
+    purged = len((await session.scalars(stmt)).all())
+    await session.commit()
+    return purged
+
+
+async def create_post(session: AsyncSession, post_in: PostCreate) -> Post:
+    """
+    INSERT ... ON CONFLICT (short_id) DO NOTHING RETURNING 한 번으로 게시글을 생성한다.
+    short_id 가 충돌하면 반환되는 행이 없을 뿐 트랜잭션은 유지되므로 rollback 없이 새 short_id 로 다시 시도한다.
+    """
+    values = post_in.model_dump(exclude_none=True)
+
     max_retries = 5
     for _ in range(max_retries):
-        try:
-            # 1. NanoID 생성 (12자)
-            short_id = generate(size=12)
-
-            # 2. Post 객체 생성
-            db_obj = Post(**post_in.model_dump(), short_id=short_id)
-            session.add(db_obj)
+        # NanoID 생성 (12자)
+        post = await insert_returning(
+            session=session,
+            model=Post,
+            values={**values, "short_id": generate(size=12)},
+            on_conflict_do_nothing=[Post.short_id],
+        )
+        if post is not None:
             await session.commit()
-            await session.refresh(db_obj)
-            return db_obj
-
-        except IntegrityError:
-            await session.rollback()
-            continue
+            return post
 
     raise Exception("Failed to generate unique UID after multiple retries.")
@@ -2,24 +2,47 @@ from typing import TYPE_CHECKING
 
 from sqlalchemy import select
 
-from app.core.security import create_password_hash
+from app.core.cache import TwoTierCache
+from app.core.config import get_setting
+from app.core.security import password_hasher
+from app.crud.base import insert_returning
 from app.models.models import User
+from app.schemas.user import Principal
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
     from app.schemas.user import UserCreate
 
+settings = get_setting()
 
-async def get_user_by_email(*, session: AsyncSession, email) -> User | None:
-    result = await session.execute(select(User).where(User.email == email))
+principal_cache = TwoTierCache(
+    "auth:principal", ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS, enabled=settings.PRINCIPAL_CACHE_ENABLED
+)
+
+
+async def get_user_by_email(*, session: AsyncSession, email, include_deleted: bool = False) -> User | None:
+    """이메일로 사용자 조회 - 이메일은 탈퇴한 사용자와도 중복될 수 없으므로 가입 확인 시에는 include_deleted 를 지정"""
+    stmt = select(User).where(User.email == email).execution_options(include_deleted=include_deleted)
+    result = await session.execute(stmt)
     return result.scalar_one_or_none()
 
 
 async def create_user(*, session: AsyncSession, user_in: UserCreate) -> User:
-    db_obj = User(**user_in.model_dump())
-    db_obj.hashed_password = create_password_hash(user_in.password)
-    session.add(db_obj)
+    values = user_in.model_dump(exclude_none=True)
+    values["hashed_password"] = await password_hasher.hash(user_in.password)
+    db_obj = await insert_returning(session=session, model=User, values=values)
     await session.commit()
-    await session.refresh(db_obj)
     return db_obj
+
+
+@principal_cache.cached(key=lambda *, user_id, **_: str(user_id), response_type=Principal)
+async def get_principal(*, session: AsyncSession, user_id: int) -> Principal | None:
+    """인증 사용자 정보 조회 (2단 캐시 사용, 필요한 컬럼만 조회)"""
+    stmt = select(User.id, User.nickname, User.is_active, User.is_delete, User.is_superuser).where(User.id == user_id)
+    row = (await session.execute(stmt)).one_or_none()
+    return Principal.model_validate(row) if row else None
+
+
+async def invalidate_principal(*, user_id: int):
+    await principal_cache.invalidate(str(user_id))
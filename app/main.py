@@ -1,21 +1,44 @@
+import logging
 from contextlib import asynccontextmanager
 
+import anyio
 from asgi_correlation_id import CorrelationIdMiddleware
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 
 from app.api import main
 from app.core.config import get_setting
+from app.core.database import async_engine, async_session, replica_router
+from app.core.db_metrics import QueryStatsMiddleware
 from app.core.logging_config import setup_logging
 from app.core.redis_client import async_redis_client, sync_redis_client
+from app.core.trending import run_trending_trimmer
+from app.core.view_counter import PostViewFlusher
 from app.utils.swagger import get_custom_swagger_ui_html
 
+logger = logging.getLogger(__name__)
+
 settings = get_setting()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     setup_logging()
-    yield
+    async with anyio.create_task_group() as tg:
+        # Redis 에 누적된 게시글 조회수를 주기적으로 DB에 반영
+        if settings.POST_VIEW_FLUSH_INTERVAL_SECONDS > 0:
+            tg.start_soon(PostViewFlusher(async_redis_client).run, async_session)
+        # 인기 게시글 순위를 상위 K개로 유지
+        if settings.TRENDING_TRIM_INTERVAL_SECONDS > 0:
+            tg.start_soon(run_trending_trimmer, async_redis_client)
+        # 응답하지 않는 replica 는 조회 대상에서 제외
+        if replica_router.replicas:
+            tg.start_soon(replica_router.run_health_check)
+        yield
+        tg.cancel_scope.cancel()
+    await replica_router.dispose()
+    await async_engine.dispose()
     await async_redis_client.aclose()
     sync_redis_client.close()
 
@@ -28,10 +51,23 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# 요청별 SQL 수/시간 (Server-Timing 헤더, 로그)
+app.add_middleware(QueryStatsMiddleware)
 # 추적 ID 부여 : 최상단 미들웨어에 존재해야됨(맨 마지막에 add된 것이 최상단)
 app.add_middleware(CorrelationIdMiddleware)
 
 
+# DB 연결 풀에서 DB_POOL_TIMEOUT_SECONDS 동안 연결을 얻지 못한 경우 (500 대신 잠시 후 재시도하도록 응답)
+@app.exception_handler(PoolTimeoutError)
+async def db_pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    logger.warning("db pool timeout: %s", exc)
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Database is busy"},
+        headers={"Retry-After": "1"},
+    )
+
+
 app.include_router(
     main.api_v1_router,
     prefix=settings.API_V1_PREFIX,
@@ -1,3 +1,3 @@
-from .models import Post, PostComment, User
+from .models import Post, PostArchive, PostComment, PostCommentArchive, User
 
-__all__ = ["Post", "PostComment", "User"]
+__all__ = ["Post", "PostArchive", "PostComment", "PostCommentArchive", "User"]
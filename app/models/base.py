@@ -1,8 +1,8 @@
 from datetime import UTC, datetime
 from typing import Any
 
-from sqlalchemy import DateTime, event, false, func, null
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy import DDL, DateTime, event, false, func, null
+from sqlalchemy.orm import DeclarativeBase, Mapped, ORMExecuteState, Session, mapped_column, with_loader_criteria
 
 
 class BaseModel(DeclarativeBase):
@@ -13,6 +13,10 @@ class BaseModel(DeclarativeBase):
         return self
 
 
+# pg_trgm 인덱스(gin_trgm_ops)를 사용하므로 create_all 로 테이블을 만들 때 확장을 먼저 설치한다 (운영 DB는 alembic)
+event.listen(BaseModel.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+
 class TimestampMixin:
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
@@ -37,3 +41,19 @@ def setup_default_timestamps(mapper, connection, target):
 class SoftDeleteMixin:
     is_delete: Mapped[bool] = mapped_column(default=False, server_default=false())
     deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None, server_default=null())
+
+
+# 삭제(soft delete)된 행은 모든 ORM 조회(SELECT)에서 제외한다. 조인/관계 로딩된 엔티티에도 적용된다.
+# 삭제된 행이 필요한 경우 .execution_options(include_deleted=True) 로 제외하지 않도록 지정
+# 조건을 "is_delete = false" 로 고정하여 WHERE is_delete = false 부분 인덱스를 사용할 수 있도록 한다
+@event.listens_for(Session, "do_orm_execute")
+def exclude_soft_deleted(execute_state: ORMExecuteState):
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.is_relationship_load
+        and not execute_state.execution_options.get("include_deleted", False)
+    ):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(SoftDeleteMixin, lambda cls: cls.is_delete == false(), include_aliases=True)
+        )
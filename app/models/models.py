@@ -1,36 +1,96 @@
-from sqlalchemy import ForeignKey, Integer, String, Text
+from datetime import datetime  # noqa: TC003
+
+from sqlalchemy import BigInteger, Computed, DateTime, ForeignKey, Index, Integer, String, Text, func, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.sql import true
+from sqlalchemy.sql import false, true
 
 from app.models.base import BaseModel, SoftDeleteMixin, TimestampMixin
 
 
 class User(SoftDeleteMixin, TimestampMixin, BaseModel):
     __tablename__ = "users"
+    __table_args__ = (
+        # 작성자 핸들(닉네임) 필터링 용 - 대소문자 구분 없이 조회
+        Index("ix_users_nickname_lower", text("lower(nickname)")),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     email: Mapped[str] = mapped_column(String(320), unique=True)
     hashed_password: Mapped[str] = mapped_column(String(250))
     nickname: Mapped[str] = mapped_column(String(30))
     is_active: Mapped[bool] = mapped_column(default=True, server_default=true())
+    # 관리자 API(/v1/admin) 사용 가능 여부
+    is_superuser: Mapped[bool] = mapped_column(default=False, server_default=false())
     posts: Mapped[list[Post]] = relationship(back_populates="user")
     comments: Mapped[list[PostComment]] = relationship(back_populates="user")
 
 
 class Post(SoftDeleteMixin, TimestampMixin, BaseModel):
     __tablename__ = "posts"
+    __table_args__ = (
+        # 목록 조회 keyset 페이지네이션 (created_at, id) 용, 삭제되지 않은 게시글만 인덱싱
+        Index("ix_posts_created_at_id", "created_at", "id", postgresql_where=text("is_delete = false")),
+        # 최근 수정 순 목록 조회 용, 삭제되지 않은 게시글만 인덱싱
+        Index("ix_posts_updated_at_id", "updated_at", "id", postgresql_where=text("is_delete = false")),
+        # 작성자별 목록 조회 용 (user_id 외래키 조회도 이 인덱스를 사용)
+        Index("ix_posts_user_id_created_at_id", "user_id", "created_at", "id"),
+        # 전문 검색 용
+        Index("ix_posts_search_vector", "search_vector", postgresql_using="gin"),
+        # 제목 부분 일치(ILIKE '%..%') 검색 용 - 형태소 분석 없이 한국어 검색을 보완
+        Index("ix_posts_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        # 삭제된 게시글 정리(scripts/purge_deleted.py) 용, 삭제된 게시글만 인덱싱
+        Index("ix_posts_deleted_at", "deleted_at", postgresql_where=text("is_delete = true")),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     short_id: Mapped[str] = mapped_column(String(12), unique=True, index=True)
     title: Mapped[str] = mapped_column(String(100))
     content: Mapped[str] = mapped_column(Text())
-    user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), index=True)
+    user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"))
     user: Mapped[User] = relationship(back_populates="posts")
     comments: Mapped[list[PostComment]] = relationship(back_populates="post")
+    # 삭제되지 않은 댓글 수 - 목록에서 게시글마다 COUNT(*) 하지 않도록 댓글 작성/삭제 시 함께 증감한다
+    # 어긋난 경우 scripts/reconcile_comment_counts.py 로 다시 계산
+    comment_count: Mapped[int] = mapped_column(Integer, default=0, server_default=text("0"))
+    # 조회수 - Redis 에 누적한 값을 주기적으로 반영하므로 flush 주기만큼 늦게 반영된다 (app/core/view_counter.py)
+    view_count: Mapped[int] = mapped_column(BigInteger, default=0, server_default=text("0"))
+
+    # 목록 조회 용 본문 요약 (DB에서 계산되는 컬럼) - 목록에서 본문 전체를 읽지 않도록 공백을 정리한 앞 200자만 저장
+    excerpt: Mapped[str] = mapped_column(
+        Text(),
+        Computed(r"left(btrim(regexp_replace(content, '\s+', ' ', 'g')), 200)", persisted=True),
+        deferred=True,
+    )
+
+    # 전문 검색 용 tsvector (DB에서 계산되는 컬럼)
+    # 한국어 형태소 분석기가 없으므로 공백 기준으로만 나누는 simple 설정을 사용하고, 제목에 더 높은 가중치를 준다
+    # 조회 시 불필요하게 읽지 않도록 deferred 처리
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(content, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
 
 class PostComment(SoftDeleteMixin, TimestampMixin, BaseModel):
     __tablename__ = "post_comments"
+    __table_args__ = (
+        # 게시글별 댓글 keyset 페이지네이션 용, 삭제되지 않은 댓글만 인덱싱
+        Index(
+            "ix_post_comments_post_id_created_at_id",
+            "post_id",
+            "created_at",
+            "id",
+            postgresql_where=text("is_delete = false"),
+        ),
+        # 삭제된 댓글 정리(scripts/purge_deleted.py) 용, 삭제된 댓글만 인덱싱
+        Index("ix_post_comments_deleted_at", "deleted_at", postgresql_where=text("is_delete = true")),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     comment: Mapped[str] = mapped_column(Text())
@@ -40,3 +100,34 @@ class PostComment(SoftDeleteMixin, TimestampMixin, BaseModel):
 
     user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), index=True)
     user: Mapped[User] = relationship(back_populates="comments")
+
+
+# 보관 기간이 지난 삭제된 게시글/댓글을 옮겨두는 테이블 (scripts/purge_deleted.py)
+# 원본 행을 그대로 보관하기 위한 용도이므로 외래키/조회용 인덱스/DB에서 계산되는 컬럼은 두지 않는다
+class PostArchive(BaseModel):
+    __tablename__ = "posts_archive"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    short_id: Mapped[str] = mapped_column(String(12))
+    title: Mapped[str] = mapped_column(String(100))
+    content: Mapped[str] = mapped_column(Text())
+    user_id: Mapped[int | None] = mapped_column(Integer)
+    comment_count: Mapped[int] = mapped_column(Integer)
+    view_count: Mapped[int] = mapped_column(BigInteger)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class PostCommentArchive(BaseModel):
+    __tablename__ = "post_comments_archive"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    comment: Mapped[str] = mapped_column(Text())
+    post_id: Mapped[int | None] = mapped_column(Integer)
+    user_id: Mapped[int | None] = mapped_column(Integer)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -1,30 +1,71 @@
+from .admin import SlowQueryRead
 from .auth import SendCodeRequest, VerificationCodeCreate, VerificationCodeRead, VerifyCodeRequest
 from .comment import (
     BasePostComment,
     PostCommentCreate,
     PostCommentEdit,
+    PostCommentPage,
     PostCommentRead,
     PostCommentWrite,
 )
-from .common import BearerAccessToken
-from .filters import PostCommentFilterParams, PostFilterParams
-from .post import BasePost, PostCreate, PostEdit, PostRead, PostWrite
-from .user import UserBase, UserCreate, UserRead, UserRegister, UserUpdateMe
+from .common import BaseCursor, BearerAccessToken, RankCursor, TimestampCursor
+from .filters import (
+    PostCommentFilterParams,
+    PostFilterParams,
+    PostSearchParams,
+    PostSuggestParams,
+    PostTrendingParams,
+)
+from .mail import MailCreate
+from .post import (
+    BasePost,
+    PostAuthorRead,
+    PostBatchGetRequest,
+    PostBatchGetResponse,
+    PostCreate,
+    PostEdit,
+    PostPage,
+    PostRead,
+    PostSearchPage,
+    PostSearchRead,
+    PostSuggestRead,
+    PostSummaryRead,
+    PostWrite,
+)
+from .user import Principal, UserBase, UserCreate, UserRead, UserRegister, UserUpdateMe
 
 __all__ = [
+    "SlowQueryRead",
     "BasePostComment",
     "PostCommentCreate",
     "PostCommentEdit",
+    "PostCommentPage",
     "PostCommentRead",
     "PostCommentWrite",
+    "BaseCursor",
     "BearerAccessToken",
+    "RankCursor",
+    "TimestampCursor",
     "PostCommentFilterParams",
     "PostFilterParams",
+    "PostSearchParams",
+    "PostSuggestParams",
+    "PostTrendingParams",
+    "MailCreate",
     "BasePost",
+    "PostAuthorRead",
+    "PostBatchGetRequest",
+    "PostBatchGetResponse",
     "PostCreate",
     "PostEdit",
+    "PostPage",
     "PostRead",
+    "PostSearchPage",
+    "PostSearchRead",
+    "PostSuggestRead",
+    "PostSummaryRead",
     "PostWrite",
+    "Principal",
     "UserBase",
     "UserCreate",
     "UserRead",
@@ -40,3 +81,5 @@ __all__ = [
 # 순환참조 이슈로 인하여 아래와 같이 해결
 # https://github.com/fastapi/sqlmodel/discussions/757#discussioncomment-13204884
 PostRead.model_rebuild()
+PostBatchGetResponse.model_rebuild()
+PostPage.model_rebuild()
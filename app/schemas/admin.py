@@ -0,0 +1,17 @@
+from datetime import datetime  # noqa: TC003
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+
+# 느린 쿼리 기록 (관리자 API 응답용)
+class SlowQueryRead(BaseModel):
+    statement: str
+    parameter_types: dict[str, str]
+    duration_ms: float
+    route: str
+    request_id: str | None
+    recorded_at: datetime
+    plan: list[dict[str, Any]] | None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -31,6 +31,11 @@ class PostCommentRead(BasePostComment):
     model_config = ConfigDict(from_attributes=True)
 
 
+class PostCommentPage(BaseModel):
+    items: list[PostCommentRead] = Field()
+    next_cursor: str | None = Field(default=None)
+
+
 class PostCommentCreate(BasePostComment):
     post_id: int = Field()
     user_id: int = Field()
@@ -1,6 +1,46 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime  # noqa: TC003
+from typing import Literal, Self
+
 from pydantic import BaseModel, Field
 
 
 class BearerAccessToken(BaseModel):
     access_token: str
     token_type: str = Field(default="Bearer", frozen=True)
+
+
+class BaseCursor(BaseModel):
+    """
+    keyset 페이지네이션에 사용하는 불투명(opaque) 커서.
+    클라이언트는 내용을 해석하지 않고 응답 헤더로 받은 값을 그대로 다음 요청에 전달한다.
+    """
+
+    def encode(self) -> str:
+        return urlsafe_b64encode(self.model_dump_json().encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, cursor: str) -> Self:
+        try:
+            # encode 시 제거한 base64 padding 복원
+            raw = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            return cls.model_validate_json(raw)
+        except ValueError as e:
+            raise ValueError("유효하지 않은 커서입니다.") from e
+
+
+class TimestampCursor(BaseCursor):
+    """(시간 컬럼, id) 기준 커서"""
+
+    at: datetime
+    id: int
+    # 커서를 만든 목록의 정렬 기준/방향 - 다른 정렬의 목록에 전달하면 위치가 맞지 않으므로 검증에 사용
+    order_by: Literal["created_at", "updated_at"] = "created_at"
+    order_direction: Literal["desc", "asc"] = "desc"
+
+
+class RankCursor(BaseCursor):
+    """(검색 점수, id) 기준 커서"""
+
+    rank: float
+    id: int
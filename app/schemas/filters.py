@@ -1,18 +1,31 @@
 from datetime import datetime  # noqa: TC003
 from typing import Literal
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from app.schemas.common import RankCursor, TimestampCursor
 
 
 class PostFilterParams(BaseModel):
     limit: int = Field(default=20, gt=0, le=100, description="한 페이지에 표시할 게시글 수")
-    offset: int = Field(default=0, ge=0, description="페이지 오프셋")
+    offset: int = Field(default=0, ge=0, description="페이지 오프셋 (cursor 미지원 클라이언트용)")
+    cursor: str | None = Field(
+        default=None, description="다음 페이지 커서 (응답 헤더 X-Next-Cursor 값). 지정 시 offset은 무시됩니다."
+    )
     order_by: Literal["created_at", "updated_at"] = Field(default="created_at", description="정렬 기준")
     order_direction: Literal["desc", "asc"] = Field(default="desc", description="정렬 방향")
     start: datetime | None = Field(default=None, description="조회 시작일")
     end: datetime | None = Field(default=None, description="조회 종료일")
     handle: str | None = Field(default=None, exclude=True, description="작성자 핸들(닉네임)으로 필터링")
 
+    @model_validator(mode="after")
+    def validate_cursor(self):
+        if self.cursor is not None:
+            cursor = TimestampCursor.decode(self.cursor)
+            if (cursor.order_by, cursor.order_direction) != (self.order_by, self.order_direction):
+                raise ValueError("커서를 받은 목록과 정렬 기준/방향이 다릅니다.")
+        return self
+
     @model_validator(mode="after")
     def validate_dates(self):
         if self.start and self.end and self.start > self.end:
@@ -23,6 +36,41 @@ class PostFilterParams(BaseModel):
 class PostCommentFilterParams(BaseModel):
     post_short_id: str = Field(default=None, description="포스트 단축 id")
     limit: int = Field(default=20, gt=0, le=100, description="한 페이지에 표시할 댓글 수")
-    offset: int = Field(default=0, ge=0, description="댓글 오프셋")
+    offset: int = Field(default=0, ge=0, description="댓글 오프셋 (cursor 미지원 클라이언트용)")
+    cursor: str | None = Field(
+        default=None, description="다음 페이지 커서 (응답 헤더 X-Next-Cursor 값). 지정 시 offset은 무시됩니다."
+    )
     order_by: Literal["created_at", "updated_at"] = Field(default="created_at", description="정렬 기준")
     order_direction: Literal["desc", "asc"] = Field(default="desc", description="정렬 방향")
+
+    @field_validator("cursor")
+    @classmethod
+    def validate_cursor(cls, value: str | None):
+        if value is not None:
+            TimestampCursor.decode(value)
+        return value
+
+
+class PostSearchParams(BaseModel):
+    q: str = Field(
+        min_length=1, max_length=100, description="검색어 (공백으로 구분된 단어를 모두 포함하는 게시글 검색)"
+    )
+    limit: int = Field(default=20, gt=0, le=100, description="한 페이지에 표시할 게시글 수")
+    cursor: str | None = Field(default=None, description="다음 페이지 커서 (응답 헤더 X-Next-Cursor 값)")
+
+    @field_validator("cursor")
+    @classmethod
+    def validate_cursor(cls, value: str | None):
+        if value is not None:
+            RankCursor.decode(value)
+        return value
+
+
+class PostSuggestParams(BaseModel):
+    q: str = Field(min_length=1, max_length=50, description="제목 자동완성 검색어")
+    limit: int = Field(default=10, gt=0, le=20, description="최대 결과 수")
+
+
+class PostTrendingParams(BaseModel):
+    limit: int = Field(default=20, gt=0, le=100, description="한 페이지에 표시할 게시글 수")
+    offset: int = Field(default=0, ge=0, description="순위 오프셋")
@@ -0,0 +1,12 @@
+from typing import Any
+
+from pydantic import BaseModel, EmailStr
+
+
+class MailCreate(BaseModel):
+    """메일 outbox 에 적재되는 발송 요청 (템플릿은 워커에서 렌더링)"""
+
+    recipients: list[EmailStr]
+    subject: str
+    template_name: str
+    template_body: dict[str, Any] = {}
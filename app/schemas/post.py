@@ -1,7 +1,7 @@
 from datetime import datetime  # noqa: TC003
 from typing import TYPE_CHECKING
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 if TYPE_CHECKING:
     from app.schemas.user import UserRead
@@ -17,8 +17,65 @@ class BasePost(BaseModel):
 
 class PostRead(BasePost):
     short_id: str = Field()
-    user_id: int = Field()
-    user: UserRead = Field()
+    user_id: int | None = Field()
+    comment_count: int = Field(default=0)
+    view_count: int = Field(default=0)
+    # 탈퇴한 작성자는 조회되지 않으므로 None
+    user: UserRead | None = Field(default=None)
+
+
+class PostBatchGetRequest(BaseModel):
+    short_ids: list[str] = Field(min_length=1, max_length=300, description="조회할 게시글 short_id 목록 (최대 300개)")
+
+
+class PostBatchGetResponse(BaseModel):
+    items: list[PostRead] = Field(description="요청한 순서대로 정렬된 게시글 (중복 제외)")
+    missing: list[str] = Field(description="존재하지 않는 short_id")
+
+
+# 목록/검색 결과에 포함되는 작성자 정보 (이메일 등 민감한 정보는 제외)
+class PostAuthorRead(BaseModel):
+    id: int
+    nickname: str
+    model_config = ConfigDict(from_attributes=True)
+
+
+# 목록 조회용 - 본문 대신 요약만 포함하여 게시글 길이와 관계없이 응답 크기를 일정하게 유지
+class PostSummaryRead(BaseModel):
+    short_id: str = Field()
+    title: str = Field()
+    excerpt: str = Field(description="공백을 정리한 본문 앞부분 (최대 200자)")
+    comment_count: int = Field()
+    user: None | PostAuthorRead = Field()
+    created_at: datetime = Field()
+    updated_at: datetime = Field()
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PostPage(BaseModel):
+    items: list[PostSummaryRead] = Field()
+    next_cursor: str | None = Field(default=None)
+
+
+class PostSearchRead(BaseModel):
+    short_id: str = Field()
+    title: str = Field()
+    headline: str = Field(description="검색어가 강조(<b>)된 본문 일부")
+    rank: float = Field(description="검색 점수")
+    user: None | PostAuthorRead = Field()
+    created_at: datetime = Field()
+    updated_at: datetime = Field()
+
+
+class PostSearchPage(BaseModel):
+    items: list[PostSearchRead] = Field()
+    next_cursor: str | None = Field(default=None)
+
+
+class PostSuggestRead(BaseModel):
+    short_id: str = Field()
+    title: str = Field()
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PostCreate(BasePost):
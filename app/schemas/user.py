@@ -33,6 +33,18 @@ class UserUpdateMe(BaseModel):
     nickname: str | None = Field(default=None, min_length=2, max_length=30)
 
 
+# 인증된 요청의 사용자 정보 (캐시에 저장되므로 라우트에서 실제로 사용하는 필드만 포함)
+class Principal(BaseModel):
+    id: int
+    nickname: str
+    is_active: bool
+    is_delete: bool
+    # 캐시에 이 필드가 없던 값이 남아 있을 수 있으므로 기본값 지정
+    is_superuser: bool = False
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
 # DB에서 읽어온 사용자 정보를 위한 모델 (API 응답용)
 class UserRead(UserBase):
     id: int
@@ -0,0 +1,7 @@
+#!/bin/bash
+# replica(db-replica) 가 스트리밍 복제로 접속할 수 있도록 허용한다.
+# docker-entrypoint-initdb.d 스크립트는 데이터 디렉터리를 새로 만들 때만 실행되므로,
+# 이미 만들어진 볼륨을 사용 중이면 아래 줄을 pg_hba.conf 에 직접 추가한 뒤 재시작해야 한다.
+set -e
+
+echo "host replication ${POSTGRES_USER} all scram-sha-256" >> "${PGDATA}/pg_hba.conf"
@@ -0,0 +1,106 @@
+"""
+게시글 생성 방식 비교 벤치마크
+
+    python scripts/bench_create_post.py [반복 횟수]
+
+- legacy : session.add -> commit -> refresh (short_id 충돌 시 rollback 후 재시도)
+- current: crud.create_post (INSERT ... ON CONFLICT DO NOTHING RETURNING -> commit)
+
+생성한 데이터는 외부 트랜잭션을 rollback 하여 남기지 않는다.
+"""
+
+import logging
+import os
+import statistics
+import sys
+import time
+
+import anyio
+from nanoid import generate
+from sqlalchemy import event, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# 프로젝트 루트 경로를 sys.path에 추가하여 app 모듈을 찾을 수 있게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import crud
+from app.core.database import async_engine
+from app.core.logging_config import setup_logging
+from app.models import Post, User
+from app.schemas import PostCreate
+
+logger = logging.getLogger()
+
+
+async def create_post_legacy(session: AsyncSession, post_in: PostCreate) -> Post:
+    for _ in range(5):
+        try:
+            db_obj = Post(**post_in.model_dump(), short_id=generate(size=12))
+            session.add(db_obj)
+            await session.commit()
+            await session.refresh(db_obj)
+            return db_obj
+        except IntegrityError:
+            await session.rollback()
+            continue
+
+    raise Exception("Failed to generate unique UID after multiple retries.")
+
+
+class StatementCounter:
+    """엔진에서 실행된 SQL 문 수 (SAVEPOINT/RELEASE 포함 = DB 왕복 수)"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+async def bench(name: str, create, session: AsyncSession, post_in: PostCreate, counter: StatementCounter, n: int):
+    latencies = []
+    counter.count = 0
+    for _ in range(n):
+        started = time.perf_counter()
+        await create(session, post_in)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    latencies.sort()
+    logger.info(
+        f"{name:<8} statements/op={counter.count / n:.1f} "
+        f"p50={statistics.median(latencies):.2f}ms p95={latencies[int(n * 0.95) - 1]:.2f}ms "
+        f"total={sum(latencies):.0f}ms"
+    )
+
+
+async def main(n: int):
+    counter = StatementCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+
+    async with async_engine.connect() as conn:
+        transaction = await conn.begin()
+        # 테스트와 동일하게 commit 은 savepoint 로만 처리하고 마지막에 전체 rollback
+        session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+
+        user = await session.scalar(select(User).limit(1))
+        if user is None:
+            logger.info("No user. create a user first.")
+            return
+        post_in = PostCreate(title="benchmark", content="benchmark " * 50, user_id=user.id)
+
+        # 워밍업
+        await bench("warmup", crud.create_post, session, post_in, counter, 10)
+
+        await bench("legacy", create_post_legacy, session, post_in, counter, n)
+        await bench("current", crud.create_post, session, post_in, counter, n)
+
+        await session.close()
+        await transaction.rollback()
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    anyio.run(main, int(sys.argv[1]) if len(sys.argv) > 1 else 200)
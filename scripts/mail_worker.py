@@ -0,0 +1,39 @@
+import logging
+import os
+import signal
+import sys
+
+import anyio
+
+# 프로젝트 루트 경로를 sys.path에 추가하여 app 모듈을 찾을 수 있게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.logging_config import setup_logging
+from app.core.mail_outbox import MailOutboxWorker
+from app.core.redis_client import async_redis_client
+
+logger = logging.getLogger()
+
+
+async def main():
+    worker = MailOutboxWorker(async_redis_client)
+
+    logger.info("Start mail worker")
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(worker.run)
+
+        # SIGINT/SIGTERM 수신 시 발송 중인 consumer 를 취소하고 SMTP 연결을 정리한 뒤 종료
+        # (ack 전에 취소된 메일은 다른 워커가 MAIL_CLAIM_IDLE_MS 이후 회수)
+        with anyio.open_signal_receiver(signal.SIGINT, signal.SIGTERM) as signals:
+            async for _ in signals:
+                tg.cancel_scope.cancel()
+                break
+
+    await async_redis_client.aclose()
+    logger.info("Stop mail worker")
+
+
+if __name__ == "__main__":
+    setup_logging()
+    anyio.run(main)
@@ -0,0 +1,110 @@
+"""
+삭제(soft delete)된 게시글/댓글 정리
+
+    python scripts/purge_deleted.py [--days 30] [--batch-size 500] [--pause 0.5] [--no-archive]
+
+삭제된 지 --days 일이 지난 댓글 -> 게시글에 남아 있는 댓글 -> 게시글 순서로 배치 단위로 archive 테이블에 옮긴다.
+(--no-archive 를 지정하면 옮기지 않고 삭제만 한다)
+
+- 배치마다 DELETE ... WHERE id IN (SELECT ... LIMIT n FOR UPDATE SKIP LOCKED) RETURNING 한 번으로 처리하고 commit 하므로
+  잠금과 WAL 이 배치 크기만큼으로 제한되고, 서비스 요청이 잡고 있는 행은 기다리지 않고 건너뛴다.
+- 배치 사이에는 --pause 초 + 배치 처리에 걸린 시간만큼 쉬어서 DB가 바쁠수록 천천히 진행한다.
+- 실행 중 중단해도 이미 처리된 배치는 유지되며, 다시 실행해도 안전하다.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+
+import anyio
+
+# 프로젝트 루트 경로를 sys.path에 추가하여 app 모듈을 찾을 수 있게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import crud
+from app.core.config import get_setting
+from app.core.database import async_engine, async_session
+from app.core.logging_config import setup_logging
+
+logger = logging.getLogger()
+
+settings = get_setting()
+
+
+async def purge(name: str, purge_batch, *, batch_size: int, pause: float) -> int:
+    total = 0
+    started = time.monotonic()
+    while True:
+        batch_started = time.monotonic()
+        purged = await purge_batch(batch_size=batch_size)
+        elapsed = time.monotonic() - batch_started
+
+        total += purged
+        logger.info(
+            "[%s] purged %s in %.2fs (total %s, %.0f rows/s)",
+            name,
+            purged,
+            elapsed,
+            total,
+            total / (time.monotonic() - started),
+        )
+        # 잠겨 있어 건너뛴 행은 다음 실행 때 처리
+        if purged < batch_size:
+            return total
+
+        await anyio.sleep(pause + elapsed)
+
+
+async def main(args: argparse.Namespace):
+    before = datetime.now(UTC) - timedelta(days=args.days)
+    logger.info("Start purging rows deleted before %s (archive=%s)", before.isoformat(), args.archive)
+
+    async with async_session() as session:
+        comments = await purge(
+            "post_comments",
+            lambda batch_size: crud.purge_deleted_post_comments(
+                session=session, before=before, batch_size=batch_size, archive=args.archive
+            ),
+            batch_size=args.batch_size,
+            pause=args.pause,
+        )
+        # 댓글이 많은 게시글도 배치 크기만큼씩 나누어 정리되도록 게시글에 남아 있는 댓글을 먼저 정리
+        comments += await purge(
+            "post_comments of deleted posts",
+            lambda batch_size: crud.purge_comments_of_deleted_posts(
+                session=session, before=before, batch_size=batch_size, archive=args.archive
+            ),
+            batch_size=args.batch_size,
+            pause=args.pause,
+        )
+        posts = await purge(
+            "posts",
+            lambda batch_size: crud.purge_deleted_posts(
+                session=session, before=before, batch_size=batch_size, archive=args.archive
+            ),
+            batch_size=args.batch_size,
+            pause=args.pause,
+        )
+
+    await async_engine.dispose()
+    logger.info("Done. purged %s comments, %s posts", comments, posts)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="삭제된 게시글/댓글 정리")
+    parser.add_argument("--days", type=int, default=settings.PURGE_RETENTION_DAYS, help="보관 기간 (일)")
+    parser.add_argument("--batch-size", type=int, default=settings.PURGE_BATCH_SIZE, help="배치 당 처리할 행 수")
+    parser.add_argument("--pause", type=float, default=settings.PURGE_PAUSE_SECONDS, help="배치 사이 대기 시간 (초)")
+    parser.add_argument(
+        "--no-archive",
+        dest="archive",
+        action="store_false",
+        default=settings.PURGE_ARCHIVE,
+        help="archive 테이블에 옮기지 않고 삭제만 한다",
+    )
+
+    setup_logging()
+    anyio.run(main, parser.parse_args())
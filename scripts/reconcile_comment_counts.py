@@ -0,0 +1,54 @@
+"""
+게시글 댓글 수(posts.comment_count) 재계산
+
+    python scripts/reconcile_comment_counts.py [배치 크기]
+
+게시글 id 순으로 배치 단위로 실제 댓글 수와 비교해 어긋난 값만 수정한다.
+배치마다 commit 하므로 실행 중 중단해도 이미 처리된 배치는 유지되며, 다시 실행해도 안전하다.
+"""
+
+import logging
+import os
+import sys
+
+import anyio
+
+# 프로젝트 루트 경로를 sys.path에 추가하여 app 모듈을 찾을 수 있게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import crud
+from app.core.database import async_engine, async_session
+from app.core.logging_config import setup_logging
+from app.core.redis_client import async_redis_client
+
+logger = logging.getLogger()
+
+
+async def main(batch_size: int):
+    logger.info("Start")
+
+    after_id, fixed = 0, 0
+    async with async_session() as session:
+        while True:
+            last_id, short_ids = await crud.reconcile_post_comment_counts(
+                session=session, after_id=after_id, batch_size=batch_size
+            )
+            if last_id is None:
+                break
+
+            # 게시글 단건 캐시에 댓글 수가 포함되어 있으므로 수정된 게시글만 무효화
+            for short_id in short_ids:
+                await crud.invalidate_post_cache(short_id=short_id)
+
+            fixed += len(short_ids)
+            logger.info("Reconciled posts up to id=%s (fixed %s)", last_id, len(short_ids))
+            after_id = last_id
+
+    await async_engine.dispose()
+    await async_redis_client.aclose()
+    logger.info("Done. fixed %s posts", fixed)
+
+
+if __name__ == "__main__":
+    setup_logging()
+    anyio.run(main, int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -2,11 +2,12 @@ import pytest
 import redis.asyncio as redis_async
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.exc import OperationalError
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud
+from app.api.deps import get_read_session
 from app.core.config import get_setting
-from app.core.database import get_session
+from app.core.database import create_db_engine, get_session
 from app.core.redis_client import get_async_redis
 from app.main import app
 from app.models.models import BaseModel, User
@@ -31,7 +32,7 @@ def anyio_backend():
 
 @pytest.fixture(scope="session")
 async def db_engine():
-    engine = create_async_engine(settings.DATABASE_URI)
+    engine = create_db_engine()
     yield engine
     await engine.dispose()
 
@@ -102,6 +103,7 @@ async def client(session, async_redis_client):
         yield async_redis_client
 
     app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_read_session] = override_get_session
     app.dependency_overrides[get_async_redis] = override_get_redis
 
     # 3. TestClient 대신 httpx.AsyncClient 사용
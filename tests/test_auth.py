@@ -1,9 +1,13 @@
 from typing import TYPE_CHECKING
 
+import anyio
 import pytest
 from fastapi import status
 
 from app import crud
+from app.core.config import get_setting
+from app.core.rate_limit import LocalRateLimiter, RateLimitRule
+from app.core.security import AsyncPasswordHasher
 from app.schemas import VerificationCodeRead
 from tests.conftest import DEFAULT_USER_EMAIL, DEFAULT_USER_PASSWORD
 from tests.utils import random_email
@@ -12,6 +16,8 @@ if TYPE_CHECKING:
     from httpx import AsyncClient
     from sqlalchemy.ext.asyncio import AsyncSession
 
+settings = get_setting()
+
 
 @pytest.mark.anyio
 async def test_send_verification_code(session: AsyncSession, async_redis_client, client: AsyncClient) -> None:
@@ -55,3 +61,65 @@ async def test_login_user_incorrect_password(client: AsyncClient) -> None:
     result = await client.post("/v1/auth/login", data=data)
 
     assert result.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.anyio
+async def test_password_hasher_concurrency(caplog: pytest.LogCaptureFixture) -> None:
+    """
+    비밀번호 해시/검증은 max_concurrency 개까지만 동시에 실행되고 나머지는 대기해야 합니다.
+    대기열이 waiting_warn_threshold 개 이상 쌓이면 경고 로그를 남겨야 합니다.
+    """
+    hasher = AsyncPasswordHasher(max_concurrency=1, waiting_warn_threshold=2)
+    hashed_password = await hasher.hash(DEFAULT_USER_PASSWORD)
+
+    snapshots = []
+
+    async def verify():
+        assert await hasher.verify(DEFAULT_USER_PASSWORD, hashed_password)
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(3):
+            tg.start_soon(verify)
+        await anyio.sleep(0.01)
+        snapshots.append(hasher.statistics())
+        # 대기열이 쌓인 상태에서 요청
+        tg.start_soon(verify)
+
+    assert snapshots[0].in_flight == 1
+    assert snapshots[0].waiting == 2
+    [record] = [record for record in caplog.records if record.name == "app.core.security"]
+    assert record.getMessage() == "password hasher saturated: 2 waiting, 1/1 in flight"
+    assert hasher.statistics().waiting == 0
+    assert not await hasher.verify("incorrect", hashed_password)
+
+
+@pytest.mark.anyio
+async def test_login_rate_limit(client: AsyncClient) -> None:
+    """
+    같은 이메일로 제한 횟수를 넘겨 로그인 시도 시 429 에러와 Retry-After 헤더를 반환해야 합니다.
+    """
+    rule = RateLimitRule.parse(settings.RATE_LIMITS["login:email"])
+    data = {"username": random_email(), "password": "incorrect"}
+
+    for _ in range(rule.limit):
+        result = await client.post("/v1/auth/login", data=data)
+        assert result.status_code == status.HTTP_400_BAD_REQUEST
+
+    result = await client.post("/v1/auth/login", data=data)
+    assert result.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(result.headers["Retry-After"]) > 0
+
+
+def test_local_rate_limiter() -> None:
+    limiter = LocalRateLimiter()
+    rule = RateLimitRule.parse("2/minute")
+
+    assert limiter.hit("key", rule) == (True, 0)
+    assert limiter.hit("key", rule) == (True, 0)
+
+    allowed, retry_after_ms = limiter.hit("key", rule)
+    assert not allowed
+    assert 0 < retry_after_ms <= 30_000
+
+    # 다른 key 는 영향을 받지 않는다
+    assert limiter.hit("other", rule) == (True, 0)
@@ -0,0 +1,82 @@
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+from pydantic import BaseModel
+
+from app.core.cache import LocalTTLCache, TwoTierCache
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+
+class Item(BaseModel):
+    id: int
+    owner_id: int
+
+
+def test_local_cache_lru_eviction():
+    cache = LocalTTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    # a를 조회하면 가장 최근에 사용한 항목이 되므로 b가 제거되어야 한다
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_local_cache_ttl():
+    cache = LocalTTLCache(maxsize=2, ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+@pytest.mark.anyio
+async def test_two_tier_cache_single_flight(async_redis_client: Redis):
+    """
+    같은 key에 대한 동시 miss 는 하나의 loader 호출을 공유해야 합니다.
+    """
+    cache = TwoTierCache("test:single-flight", ttl=60, redis=async_redis_client)
+    calls = 0
+
+    @cache.cached(key=lambda item_id: str(item_id), response_type=Item)
+    async def load(item_id: int) -> Item:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return Item(id=item_id, owner_id=1)
+
+    results = await asyncio.gather(*(load(1) for _ in range(10)))
+
+    assert calls == 1
+    assert all(result.id == 1 for result in results)
+
+    # 로컬 캐시를 비워도 Redis 에서 조회되어야 한다
+    cache.local.clear()
+    await load(1)
+    assert calls == 1
+
+
+@pytest.mark.anyio
+async def test_two_tier_cache_invalidate_tag(async_redis_client: Redis):
+    cache = TwoTierCache("test:tag", ttl=60, redis=async_redis_client)
+    calls = 0
+
+    @cache.cached(key=lambda item_id: str(item_id), response_type=Item, tags=lambda item: [f"owner:{item.owner_id}"])
+    async def load(item_id: int) -> Item:
+        nonlocal calls
+        calls += 1
+        return Item(id=item_id, owner_id=1)
+
+    await load(1)
+    await load(2)
+    assert calls == 2
+
+    await cache.invalidate_tag("owner:1")
+    await load(1)
+    await load(2)
+    assert calls == 4
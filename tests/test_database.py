@@ -0,0 +1,285 @@
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from starlette.requests import Request
+
+from app import crud
+from app.api import deps
+from app.core.config import get_setting
+from app.core.database import ReplicaRouter, async_engine, create_db_engine, get_session, has_recent_write
+from app.core.db_metrics import QueryBudgetExceededError, RequestQueryStats, pool_metrics, slow_query_log
+from app.core.security import verify_access_token
+from app.main import app
+from app.models import Post
+from app.schemas import Principal
+
+if TYPE_CHECKING:
+    from httpx import AsyncClient
+    from redis.asyncio import Redis
+    from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+settings = get_setting()
+
+TIMEOUTS_SQL = text(
+    "SELECT name, setting::int FROM pg_settings "
+    "WHERE name IN ('statement_timeout', 'idle_in_transaction_session_timeout') ORDER BY name"
+)
+
+
+async def get_timeouts(conn: AsyncConnection) -> dict[str, int]:
+    return dict((await conn.execute(TIMEOUTS_SQL)).tuples().all())
+
+
+EXPECTED_TIMEOUTS = {
+    "idle_in_transaction_session_timeout": settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS,
+    "statement_timeout": settings.DB_STATEMENT_TIMEOUT_MS,
+}
+
+
+@pytest.mark.anyio
+async def test_engine_timeouts(db_engine: AsyncEngine):
+    """서버 측 timeout 이 연결 시 적용되어야 합니다."""
+    async with db_engine.connect() as conn:
+        assert await get_timeouts(conn) == EXPECTED_TIMEOUTS
+
+
+@pytest.mark.anyio
+async def test_engine_pgbouncer_mode():
+    """
+    PgBouncer 모드에서는 prepared statement 를 사용하지 않고, timeout 은 트랜잭션 안에서만 적용되어야 합니다.
+    """
+    engine = create_db_engine(pgbouncer=True)
+    try:
+        async with engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            assert raw.driver_connection.prepare_threshold is None
+            assert await get_timeouts(conn) == EXPECTED_TIMEOUTS
+            await conn.commit()
+
+            # SQLAlchemy 를 거치지 않고 시작한 트랜잭션(서버 연결 기본값)에는 남아 있지 않음
+            cursor = raw.driver_connection.cursor()
+            await cursor.execute("SELECT setting::int FROM pg_settings WHERE name = 'statement_timeout'")
+            assert (await cursor.fetchone())[0] == 0
+            await raw.driver_connection.rollback()
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_db_pool_timeout(client: AsyncClient):
+    """DB 연결 풀이 고갈되어 연결을 얻지 못하면 500 대신 503 을 반환해야 합니다."""
+
+    async def exhausted_session():
+        raise PoolTimeoutError("QueuePool limit of size 5 overflow 10 reached")
+        yield
+
+    app.dependency_overrides[get_session] = exhausted_session
+    app.dependency_overrides[deps.get_read_session] = exhausted_session
+    response = await client.get("/v1/posts")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+@pytest.fixture
+async def replica_router(monkeypatch):
+    """테스트 DB 를 replica 로 사용하는 router"""
+    router = ReplicaRouter([create_db_engine()])
+    monkeypatch.setattr(deps, "replica_router", router)
+    yield router
+    await router.dispose()
+
+
+async def resolve_read_session_engine(redis: Redis, headers: dict[str, str]):
+    request = Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/v1/posts",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        }
+    )
+    sessions = deps.get_read_session(request, redis)
+    session = await anext(sessions)
+    await sessions.aclose()
+    return session.bind
+
+
+@pytest.mark.anyio
+async def test_replica_router_health_check():
+    """응답하지 않는 replica 는 health check 이후 선택되지 않고, 모두 응답하지 않으면 primary 를 사용해야 합니다."""
+    down = create_db_engine(url="postgresql+psycopg://postgres@127.0.0.1:1/postgres")
+    router = ReplicaRouter([create_db_engine(), down])
+    try:
+        # round-robin
+        assert {router.choose() for _ in range(2)} == {replica.session for replica in router.replicas}
+
+        await router.check_health()
+        assert [replica.healthy for replica in router.replicas] == [True, False]
+        assert {router.choose() for _ in range(2)} == {router.replicas[0].session}
+
+        router.replicas[0].healthy = False
+        assert router.choose() is None
+    finally:
+        await router.dispose()
+
+
+@pytest.mark.anyio
+async def test_read_your_writes(
+    client: AsyncClient,
+    async_redis_client: Redis,
+    default_user_token_header: dict[str, str],
+    replica_router: ReplicaRouter,
+):
+    """조회는 replica 를 사용하되, 쓰기 요청을 보낸 사용자의 조회는 잠시 동안 primary 를 사용해야 합니다."""
+    replica_engine = replica_router.replicas[0].engine
+    user_id = int(verify_access_token(default_user_token_header["Authorization"].split()[1])["sub"])
+    await async_redis_client.delete(f"db:recent_write:{user_id}")
+
+    assert await resolve_read_session_engine(async_redis_client, {}) is replica_engine
+    assert await resolve_read_session_engine(async_redis_client, default_user_token_header) is replica_engine
+
+    response = await client.post("/v1/posts", json={"title": "t", "content": "c"}, headers=default_user_token_header)
+    assert response.status_code == 201
+    assert await has_recent_write(async_redis_client, user_id)
+
+    assert await resolve_read_session_engine(async_redis_client, default_user_token_header) is async_engine
+    # 다른 사용자(익명)는 계속 replica 사용
+    assert await resolve_read_session_engine(async_redis_client, {}) is replica_engine
+
+
+@pytest.mark.anyio
+async def test_pool_metrics_per_route(client: AsyncClient, session: AsyncSession):
+    """
+    연결은 처음 쿼리를 실행할 때만 풀에서 가져오고, 라우트별 사용 횟수/점유 시간이 기록되어야 합니다.
+    (캐시로 응답하면 연결을 사용하지 않음)
+    """
+    short_id = await session.scalar(select(Post.short_id).limit(1))
+    await crud.invalidate_post_cache(short_id=short_id)
+
+    # 테스트 세션 대신 실제 연결 풀을 사용
+    app.dependency_overrides.pop(get_session)
+    app.dependency_overrides.pop(deps.get_read_session)
+    pool_metrics.reset()
+
+    response = await client.get(f"/v1/posts/{short_id}")
+    assert response.status_code == 200
+    stats = pool_metrics.statistics()["GET /v1/posts/{short_id}"]
+    assert stats.checkouts == 1
+    assert 0 < stats.hold_seconds_max <= stats.hold_seconds_total
+
+    response = await client.get(f"/v1/posts/{short_id}")
+    assert response.status_code == 200
+    assert pool_metrics.statistics()["GET /v1/posts/{short_id}"].checkouts == 1
+
+    # 요청이 끝나면 연결은 모두 반환되어 있다
+    assert all(status.checked_out == 0 for status in pool_metrics.status().values())
+
+
+@pytest.mark.anyio
+async def test_request_query_stats(client: AsyncClient):
+    """요청에서 실행한 SQL 수/시간이 Server-Timing 헤더로 반환되어야 합니다."""
+    response = await client.get("/v1/posts", params={"limit": 5})
+    assert response.status_code == 200
+
+    timing = {
+        name: dict(param.split("=", 1) for param in params)
+        for name, *params in (metric.strip().split(";") for metric in response.headers["Server-Timing"].split(","))
+    }
+    assert timing["db"]["desc"] == '"1 queries"'
+    assert 0 < float(timing["db-slowest"]["dur"]) <= float(timing["db"]["dur"])
+
+
+@pytest.mark.anyio
+async def test_query_guard(client: AsyncClient, monkeypatch):
+    """QUERY_GUARD_STRICT 에서는 쿼리 예산을 넘거나 같은 쿼리를 반복(N+1)한 요청이 실패해야 합니다."""
+    monkeypatch.setattr(settings, "QUERY_REPEAT_THRESHOLD", 1)
+    with pytest.raises(QueryBudgetExceededError, match="N\\+1"):
+        await client.get("/v1/posts", params={"limit": 5})
+    monkeypatch.undo()
+
+    stats = RequestQueryStats(budget=1)
+    stats.record("SELECT 1", 0.001)
+    assert stats.violations() == []
+    stats.record("SELECT 2", 0.001)
+    assert stats.violations() == ["2 queries exceeded the budget of 1"]
+
+
+@pytest.mark.anyio
+async def test_query_guard_pgbouncer_mode(client: AsyncClient, session: AsyncSession):
+    """PgBouncer 모드에서 트랜잭션 시작 시 timeout 을 지정하는 문은 쿼리 수(QueryBudget)에 포함되지 않아야 합니다."""
+    short_id = await session.scalar(select(Post.short_id).limit(1))
+    await crud.invalidate_post_cache(short_id=short_id)
+
+    engine = create_db_engine(pgbouncer=True)
+    pgbouncer_session = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_get_session():
+        async with pgbouncer_session() as request_session:
+            yield request_session
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[deps.get_read_session] = override_get_session
+    try:
+        # QueryBudget(1) 라우트 - 게시글 조회 1회
+        response = await client.get(f"/v1/posts/{short_id}")
+    finally:
+        await engine.dispose()
+    assert response.status_code == 200
+    assert 'db;desc="1 queries"' in response.headers["Server-Timing"]
+
+
+@pytest.mark.anyio
+async def test_slow_query_log(
+    client: AsyncClient, session: AsyncSession, default_user_token_header: dict[str, str], monkeypatch
+):
+    """느린 쿼리는 라우트/파라미터 타입/실행 계획과 함께 기록되고, 관리자만 조회할 수 있어야 합니다."""
+    short_id = await session.scalar(select(Post.short_id).limit(1))
+    monkeypatch.setattr(slow_query_log, "threshold_seconds", 0)
+    monkeypatch.setattr(slow_query_log, "explain_sample_rate", 1.0)
+    slow_query_log.reset()
+
+    # 라우트가 기록되도록 실제 연결 풀을 사용
+    app.dependency_overrides.pop(get_session)
+    app.dependency_overrides.pop(deps.get_read_session)
+    assert (await client.get("/v1/posts", params={"limit": 5})).status_code == 200
+    assert (await client.get("/v1/post-comments", params={"post_short_id": short_id})).status_code == 200
+
+    response = await client.get("/v1/admin/slow-queries", headers=default_user_token_header)
+    assert response.status_code == 403
+
+    app.dependency_overrides[deps.get_current_superuser] = lambda: Principal(
+        id=0, nickname="admin", is_active=True, is_delete=False, is_superuser=True
+    )
+    response = await client.get("/v1/admin/slow-queries")
+    assert response.status_code == 200
+    queries = response.json()
+
+    # get_post_list / get_post_comments 쿼리
+    for route, table in (("GET /v1/posts", "posts"), ("GET /v1/post-comments", "post_comments")):
+        query = next(q for q in queries if q["route"] == route and f" FROM {table} " in q["statement"])
+        assert query["statement"].startswith("SELECT")
+        assert "int" in query["parameter_types"].values()
+        assert query["plan"][0]["Plan"]["Actual Rows"] >= 0
+        assert "Shared Hit Blocks" in query["plan"][0]["Plan"]
+
+    assert (await client.delete("/v1/admin/slow-queries")).status_code == 204
+    assert slow_query_log.recent() == []
+
+
+@pytest.mark.anyio
+async def test_slow_query_log_explain_failure(db_engine: AsyncEngine, monkeypatch):
+    """실행 계획을 얻지 못해도(savepoint 를 사용할 수 없는 autocommit 연결 등) 쿼리는 성공해야 합니다."""
+    monkeypatch.setattr(slow_query_log, "threshold_seconds", 0)
+    monkeypatch.setattr(slow_query_log, "explain_sample_rate", 1.0)
+    slow_query_log.reset()
+
+    async with db_engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        assert await conn.scalar(text("SELECT 1")) == 1
+
+    [query] = slow_query_log.recent()
+    assert query.statement == "SELECT 1"
+    assert query.plan is None
@@ -0,0 +1,126 @@
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+from fastapi import status
+
+from app import crud
+from app.core.config import get_setting
+from app.core.mail_outbox import MailOutboxWorker, SMTPSender
+from app.schemas import MailCreate
+from tests.utils import SMTPSink, random_email
+
+if TYPE_CHECKING:
+    from httpx import AsyncClient
+
+settings = get_setting()
+
+
+@pytest.fixture(scope="function")
+async def smtp_sink():
+    sink = SMTPSink()
+    server = await asyncio.start_server(sink.handle, "127.0.0.1", 0)
+    sink.port = server.sockets[0].getsockname()[1]
+    async with server:
+        yield sink
+
+
+def smtp_config(port: int):
+    return settings.EMAIL.model_copy(
+        update={
+            "MAIL_SERVER": "127.0.0.1",
+            "MAIL_PORT": port,
+            "MAIL_SSL_TLS": False,
+            "MAIL_STARTTLS": False,
+            "USE_CREDENTIALS": False,
+            "SUPPRESS_SEND": 0,
+        }
+    )
+
+
+def random_mail() -> MailCreate:
+    return MailCreate(
+        subject="가입을 진심으로 축합니다",
+        recipients=[random_email()],
+        template_name="system_mail/welcome.html",
+        template_body={"nickname": "user"},
+    )
+
+
+@pytest.mark.anyio
+async def test_send_verification_code_enqueue_mail(async_redis_client, client: AsyncClient) -> None:
+    """
+    인증 코드 메일은 API에서 직접 발송하지 않고 outbox stream 에 적재만 해야 합니다.
+    """
+    email = random_email()
+
+    result = await client.post("/v1/auth/send-code", json={"email": email, "action": "signup"})
+    assert result.status_code == status.HTTP_202_ACCEPTED
+
+    entries = await async_redis_client.xrange(settings.MAIL_OUTBOX_STREAM)
+    assert len(entries) == 1
+
+    mail = MailCreate.model_validate_json(entries[0][1]["mail"])
+    assert mail.recipients == [email]
+    assert mail.template_name == "system_mail/verification_code.html"
+
+
+@pytest.mark.anyio
+async def test_mail_worker_send_batch(async_redis_client, smtp_sink: SMTPSink) -> None:
+    """
+    한 batch 의 메일은 하나의 SMTP 연결로 발송되고, 발송된 메일은 stream 에서 제거되어야 합니다.
+    """
+    worker = MailOutboxWorker(async_redis_client, config=smtp_config(smtp_sink.port), block_ms=100)
+    await worker.ensure_group()
+
+    for _ in range(3):
+        await crud.enqueue_mail(cache=async_redis_client, mail_in=random_mail())
+
+    sender = SMTPSender(worker.config)
+    try:
+        assert await worker.run_once("test-consumer", sender) == 3
+    finally:
+        await sender.close()
+
+    assert len(smtp_sink.messages) == 3
+    assert smtp_sink.connections == 1
+    assert await async_redis_client.xlen(settings.MAIL_OUTBOX_STREAM) == 0
+    pending = await async_redis_client.xpending(settings.MAIL_OUTBOX_STREAM, worker.group)
+    assert pending["pending"] == 0
+
+
+@pytest.mark.anyio
+async def test_mail_worker_retry_and_dead_letter(async_redis_client, smtp_sink: SMTPSink) -> None:
+    """
+    발송에 실패한 메일은 재시도 대기열에 들어가고, max_attempts 번 실패하면 dead letter stream 으로 옮겨져야 합니다.
+    """
+    # 닫힌 포트로 연결해 발송 실패를 만든다
+    server = await asyncio.start_server(smtp_sink.handle, "127.0.0.1", 0)
+    closed_port = server.sockets[0].getsockname()[1]
+    server.close()
+    await server.wait_closed()
+
+    worker = MailOutboxWorker(
+        async_redis_client, config=smtp_config(closed_port), block_ms=100, max_attempts=2, retry_backoff=10
+    )
+    await worker.ensure_group()
+    await crud.enqueue_mail(cache=async_redis_client, mail_in=random_mail())
+
+    sender = SMTPSender(worker.config)
+
+    # 1차 실패 - 재시도 대기
+    assert await worker.run_once("test-consumer", sender) == 1
+    assert await async_redis_client.zcard(worker.retry_key) == 1
+    assert await async_redis_client.xlen(worker.stream) == 0
+
+    # 재시도 시각 전에는 다시 적재되지 않음
+    assert await worker.requeue_due_retries() == 0
+    assert await worker.requeue_due_retries(now=time.time() + 60) == 1
+
+    # 2차 실패 - dead letter
+    assert await worker.run_once("test-consumer", sender) == 1
+    assert await async_redis_client.zcard(worker.retry_key) == 0
+    dead_entries = await async_redis_client.xrange(worker.dead_stream)
+    assert len(dead_entries) == 1
+    assert dead_entries[0][1]["attempts"] == "2"
@@ -1,9 +1,22 @@
+import time
 from typing import TYPE_CHECKING
 
 import pytest
+from sqlalchemy import select
+
+from app.constants import NEXT_CURSOR_HEADER
+from app.core.config import get_setting
+from app.core.trending import record_post_activity, trim_trending
+from app.core.view_counter import PostViewFlusher
+from app.crud.post import post_cache, post_suggest_cache
+from app.crud.user import principal_cache
+from app.models import Post
+from tests.utils import capture_statements, random_lower_string
 
 if TYPE_CHECKING:
     from httpx import AsyncClient
+    from redis.asyncio import Redis
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 
 # conftest.py에 공통 fixture가 정의되어 있으므로, 이 파일은 테스트 로직에만 집중합니다.
@@ -69,6 +82,47 @@ async def test_get_post_list(client: AsyncClient):
     assert len(response.json()) == 1
 
 
+@pytest.mark.anyio
+async def test_get_post_list_summary(
+    client: AsyncClient, db_engine: AsyncEngine, default_user_token_header: dict[str, str]
+):
+    """
+    게시글 목록은 본문 대신 요약(excerpt)과 작성자 id/닉네임만 반환하고, 본문/작성자 전체 정보를 조회하지 않아야 합니다.
+    """
+    content = "  첫 줄\n\n  둘째   줄 " + "긴 본문 " * 500
+    response = await client.post(
+        "/v1/posts", json={"title": "요약 테스트", "content": content}, headers=default_user_token_header
+    )
+    assert response.status_code == 201
+    short_id = response.json()["short_id"]
+
+    with capture_statements(db_engine) as statements:
+        response = await client.get("/v1/posts", params={"limit": 1})
+    assert response.status_code == 200
+    [post] = response.json()
+    assert post["short_id"] == short_id
+    assert set(post) == {"short_id", "title", "excerpt", "comment_count", "user", "created_at", "updated_at"}
+    assert set(post["user"]) == {"id", "nickname"}
+    assert post["excerpt"].startswith("첫 줄 둘째 줄 긴 본문")
+    assert len(post["excerpt"]) == 200
+
+    [statement] = statements
+    assert "posts.content" not in statement
+    assert "users.email" not in statement and "users.hashed_password" not in statement
+
+    # 수정 시 요약도 함께 갱신
+    response = await client.patch(
+        f"/v1/posts/{short_id}", json={"content": "짧은 본문"}, headers=default_user_token_header
+    )
+    assert response.status_code == 200
+    response = await client.get("/v1/posts", params={"limit": 1})
+    assert response.json()[0]["excerpt"] == "짧은 본문"
+
+    # 단건 조회는 본문 전체를 반환
+    response = await client.get(f"/v1/posts/{short_id}")
+    assert response.json()["content"] == "짧은 본문"
+
+
 @pytest.mark.anyio
 async def test_delete_post(client: AsyncClient, default_user_token_header: dict[str, str], random_user_token_header):
     """
@@ -93,6 +147,10 @@ async def test_delete_post(client: AsyncClient, default_user_token_header: dict[
     response = await client.get(f"/v1/posts/{short_id}", headers=default_user_token_header)
     assert response.status_code == 404
 
+    # 5. 이미 삭제된 글 다시 삭제 -> 실패 (404)
+    response = await client.delete(f"/v1/posts/{short_id}", headers=default_user_token_header)
+    assert response.status_code == 404
+
 
 @pytest.mark.anyio
 async def test_edit_post(client: AsyncClient, default_user_token_header: dict[str, str], random_user_token_header):
@@ -121,3 +179,392 @@ async def test_edit_post(client: AsyncClient, default_user_token_header: dict[st
     response = await client.patch(f"/v1/posts/{short_id}", json=edit_data, headers=default_user_token_header)
     assert response.status_code == 200
     assert response.json()["title"] == "Updated Title"
+
+
+@pytest.mark.anyio
+async def test_write_and_edit_post_statement_count(
+    db_engine: AsyncEngine, client: AsyncClient, default_user_token_header: dict[str, str]
+):
+    """
+    글 작성/수정은 commit 후 refresh 없이 INSERT/UPDATE ... RETURNING 한 번으로 처리되어야 합니다.
+    """
+    # 인증 사용자 정보가 캐시되도록 먼저 한 번 요청
+    # (이전 테스트에서 남은 로컬 캐시는 Redis 가 비워진 뒤 만료될 수 있으므로 비우고 다시 캐시)
+    principal_cache.local.clear()
+    await client.get("/v1/user/me", headers=default_user_token_header)
+
+    with capture_statements(db_engine) as statements:
+        response = await client.post(
+            "/v1/posts", json={"title": "Title", "content": "..."}, headers=default_user_token_header
+        )
+    assert response.status_code == 201
+    # 사용자 조회 + INSERT
+    assert len(statements) == 2
+    assert statements[-1].startswith("INSERT INTO posts") and "RETURNING" in statements[-1]
+
+    short_id = response.json()["short_id"]
+    with capture_statements(db_engine) as statements:
+        response = await client.patch(
+            f"/v1/posts/{short_id}", json={"title": "Updated Title"}, headers=default_user_token_header
+        )
+    assert response.status_code == 200
+    assert response.json()["title"] == "Updated Title"
+    # 게시글 조회 + UPDATE
+    assert len(statements) == 2
+    assert statements[-1].startswith("UPDATE posts") and "RETURNING" in statements[-1]
+
+
+@pytest.mark.anyio
+async def test_get_post_list_with_cursor(client: AsyncClient):
+    """
+    X-Next-Cursor 헤더를 따라가며 조회한 결과가 한 번에 조회한 결과와 같아야 합니다. (중복/누락 없음)
+    """
+    for order_direction in ("desc", "asc"):
+        response = await client.get("/v1/posts", params={"limit": 100, "order_direction": order_direction})
+        expected = [post["short_id"] for post in response.json()]
+
+        short_ids = []
+        params = {"limit": 2, "order_direction": order_direction}
+        while True:
+            response = await client.get("/v1/posts", params=params)
+            assert response.status_code == 200
+            short_ids += [post["short_id"] for post in response.json()]
+
+            next_cursor = response.headers.get(NEXT_CURSOR_HEADER)
+            if not next_cursor:
+                break
+            params["cursor"] = next_cursor
+
+        assert short_ids == expected
+
+
+@pytest.mark.anyio
+async def test_get_post_list_with_invalid_cursor(client: AsyncClient):
+    """
+    잘못된 커서나 커서를 받은 목록과 정렬 기준/방향이 다른 커서로 조회하면 422 에러가 발생해야 합니다.
+    """
+    response = await client.get("/v1/posts", params={"cursor": "invalid-cursor"})
+    assert response.status_code == 422
+
+    response = await client.get("/v1/posts", params={"limit": 1, "order_by": "updated_at"})
+    cursor = response.headers[NEXT_CURSOR_HEADER]
+    response = await client.get("/v1/posts", params={"cursor": cursor, "order_by": "updated_at"})
+    assert response.status_code == 200
+    response = await client.get("/v1/posts", params={"cursor": cursor})
+    assert response.status_code == 422
+    response = await client.get(
+        "/v1/posts", params={"cursor": cursor, "order_by": "updated_at", "order_direction": "asc"}
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_get_post_cache(client: AsyncClient, default_user_token_header: dict[str, str]):
+    """
+    - 두 번째 조회부터는 캐시에서 응답해야 합니다.
+    - 글 수정, 작성자 닉네임 변경 시 캐시가 무효화되어야 합니다.
+    """
+    post_data = {"title": "Cached Post", "content": "..."}
+    response = await client.post("/v1/posts", json=post_data, headers=default_user_token_header)
+    short_id = response.json()["short_id"]
+
+    # 1. 첫 조회는 miss, 두 번째 조회는 hit
+    hits, misses = post_cache.stats.hits, post_cache.stats.misses
+    await client.get(f"/v1/posts/{short_id}")
+    response = await client.get(f"/v1/posts/{short_id}")
+    assert response.json()["title"] == post_data["title"]
+    assert post_cache.stats.misses == misses + 1
+    assert post_cache.stats.hits == hits + 1
+
+    # 2. 글 수정 후에는 수정된 내용이 조회되어야 함
+    await client.patch(f"/v1/posts/{short_id}", json={"title": "Edited"}, headers=default_user_token_header)
+    response = await client.get(f"/v1/posts/{short_id}")
+    assert response.json()["title"] == "Edited"
+
+    # 3. 작성자 닉네임 변경 후에는 변경된 닉네임이 조회되어야 함
+    await client.patch("/v1/user/me", json={"nickname": "renamed"}, headers=default_user_token_header)
+    response = await client.get(f"/v1/posts/{short_id}")
+    assert response.json()["user"]["nickname"] == "renamed"
+
+
+@pytest.mark.anyio
+async def test_search_posts(client: AsyncClient, default_user_token_header: dict[str, str]):
+    """
+    - 본문/제목의 단어를 접두어로 검색할 수 있어야 합니다. (조사가 붙은 한국어 단어 포함)
+    - 제목 중간에 포함된 검색어도 찾을 수 있어야 합니다.
+    - 검색어가 강조된 본문 일부를 반환해야 합니다.
+    """
+    token = random_lower_string(10)
+    posts = [
+        {"title": f"{token} 블로그 시작", "content": "오늘부터 블로그를 작성합니다."},
+        {"title": "일기", "content": f"{token}를 사용해서 블로그를 만들었습니다. " + "긴 본문 " * 200},
+        {"title": f"FastAPI{token}튜토리얼", "content": "내용"},
+    ]
+    for post_data in posts:
+        response = await client.post("/v1/posts", json=post_data, headers=default_user_token_header)
+        assert response.status_code == 201
+
+    # 접두어 검색 - 조사가 붙은 단어도 검색
+    response = await client.get("/v1/posts/search", params={"q": f"{token} 블로그"})
+    assert response.status_code == 200
+    results = response.json()
+    assert {result["title"] for result in results} == {posts[0]["title"], posts[1]["title"]}
+    # 제목에서 일치한 게시글이 더 높은 점수
+    assert results[0]["title"] == posts[0]["title"]
+    assert results[0]["rank"] >= results[1]["rank"]
+    # 강조 문구는 본문 전체가 아닌 일부만 포함
+    assert "<b>" in results[1]["headline"]
+    assert len(results[1]["headline"]) < len(posts[1]["content"])
+    assert results[1]["user"]["nickname"]
+
+    # 제목 중간 일치 (trigram)
+    response = await client.get("/v1/posts/search", params={"q": f"{token}튜토리얼"})
+    assert [result["title"] for result in response.json()] == [posts[2]["title"]]
+
+
+@pytest.mark.anyio
+async def test_search_posts_with_cursor(client: AsyncClient, default_user_token_header: dict[str, str]):
+    """
+    검색 결과는 커서로 중복/누락 없이 이어서 조회할 수 있어야 합니다.
+    """
+    token = random_lower_string(10)
+    for i in range(5):
+        post_data = {"title": f"검색 {i}", "content": f"{token} " * (i + 1)}
+        response = await client.post("/v1/posts", json=post_data, headers=default_user_token_header)
+        assert response.status_code == 201
+
+    titles = []
+    params = {"q": token, "limit": 2}
+    while True:
+        response = await client.get("/v1/posts/search", params=params)
+        assert response.status_code == 200
+        titles += [result["title"] for result in response.json()]
+        if NEXT_CURSOR_HEADER not in response.headers:
+            break
+        params["cursor"] = response.headers[NEXT_CURSOR_HEADER]
+
+    assert sorted(titles) == [f"검색 {i}" for i in range(5)]
+
+    response = await client.get("/v1/posts/search", params={"q": token, "cursor": "invalid"})
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_search_posts_with_cursor_ties(client: AsyncClient, default_user_token_header: dict[str, str]):
+    """
+    검색 점수가 같은 게시글이 페이지 경계에 걸려도 중복/누락 없이 이어서 조회할 수 있어야 합니다.
+    (커서에 저장한 점수와 DB에서 비교하는 점수가 같은 값이어야 함)
+    """
+    token = random_lower_string(10)
+    short_ids = set()
+    for i in range(7):
+        # 같은 제목/본문 3개씩 -> 같은 점수가 여러 페이지에 걸침
+        post_data = {"title": f"{token} 동점", "content": f"{token} 내용 {i // 3}" * (i // 3 + 1)}
+        response = await client.post("/v1/posts", json=post_data, headers=default_user_token_header)
+        assert response.status_code == 201
+        short_ids.add(response.json()["short_id"])
+
+    found = []
+    params = {"q": token, "limit": 2}
+    while True:
+        response = await client.get("/v1/posts/search", params=params)
+        assert response.status_code == 200
+        found += [result["short_id"] for result in response.json()]
+        if NEXT_CURSOR_HEADER not in response.headers:
+            break
+        params["cursor"] = response.headers[NEXT_CURSOR_HEADER]
+
+    assert len(found) == len(short_ids)
+    assert set(found) == short_ids
+
+
+@pytest.mark.anyio
+async def test_suggest_posts(client: AsyncClient, default_user_token_header: dict[str, str]):
+    """
+    - 제목의 접두어/부분 문자열로 자동완성 결과(short_id, title)를 반환해야 합니다.
+    - 같은 검색어는 캐시에서 반환하고, 게시글 작성/수정 시 관련 캐시가 무효화되어야 합니다.
+      (작성 시에는 접두어 검색어만 무효화, 수정/삭제 시에는 해당 게시글이 포함된 결과 무효화)
+    """
+    token = random_lower_string(10)
+    response = await client.post(
+        "/v1/posts", json={"title": f"{token} 자동완성", "content": "내용"}, headers=default_user_token_header
+    )
+    assert response.status_code == 201
+    post = response.json()
+
+    # 부분 문자열 검색 (대소문자/공백 정규화)
+    response = await client.get("/v1/posts/suggest", params={"q": f"  {token[2:].upper()}  자동 "})
+    assert response.status_code == 200
+    assert response.json() == [{"short_id": post["short_id"], "title": post["title"]}]
+
+    # 2글자 이하 검색어는 접두어 검색
+    response = await client.get("/v1/posts/suggest", params={"q": token[:2], "limit": 20})
+    assert post["short_id"] in [result["short_id"] for result in response.json()]
+    response = await client.get("/v1/posts/suggest", params={"q": token[1:3]})
+    assert post["short_id"] not in [result["short_id"] for result in response.json()]
+
+    # 캐시 사용
+    response = await client.get("/v1/posts/suggest", params={"q": token})
+    assert len(response.json()) == 1
+    hits = post_suggest_cache.stats.hits
+    response = await client.get("/v1/posts/suggest", params={"q": token.upper()})
+    assert len(response.json()) == 1
+    assert post_suggest_cache.stats.hits == hits + 1
+
+    # 새 게시글 작성 시 접두어 검색어만 무효화 - 부분 문자열 검색어는 TTL 동안 유지
+    response = await client.post(
+        "/v1/posts", json={"title": f"{token} 두번째", "content": "내용"}, headers=default_user_token_header
+    )
+    assert response.status_code == 201
+    second = response.json()
+    response = await client.get("/v1/posts/suggest", params={"q": token[:2], "limit": 20})
+    assert second["short_id"] in [result["short_id"] for result in response.json()]
+    response = await client.get("/v1/posts/suggest", params={"q": token})
+    assert len(response.json()) == 1
+
+    # 제목 수정 시 이전 제목으로는 검색되지 않아야 함
+    response = await client.patch(
+        f"/v1/posts/{post['short_id']}", json={"title": "변경된 제목"}, headers=default_user_token_header
+    )
+    assert response.status_code == 200
+    response = await client.get("/v1/posts/suggest", params={"q": token})
+    assert [result["title"] for result in response.json()] == [f"{token} 두번째"]
+
+    response = await client.get("/v1/posts/suggest", params={"q": ""})
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_post_view_count(
+    client: AsyncClient,
+    session: AsyncSession,
+    async_redis_client: Redis,
+    default_user_token_header: dict[str, str],
+):
+    """
+    - 게시글 조회 시 조회수는 Redis 에만 누적되어야 합니다.
+    - flush 시 누적된 조회수가 DB에 반영되고 Redis 에서 제거되어야 합니다.
+    - DB 반영에 실패하면 다음 flush 에서 다시 반영되어야 합니다.
+    - 조회수 반영은 게시글 수정이 아니므로 updated_at 은 바뀌지 않아야 합니다.
+    """
+    short_ids = []
+    for _ in range(2):
+        response = await client.post(
+            "/v1/posts", json={"title": "조회수", "content": "내용"}, headers=default_user_token_header
+        )
+        short_ids.append(response.json()["short_id"])
+
+    for short_id in [short_ids[0], short_ids[0], short_ids[1], "non-existent-id"]:
+        await client.get(f"/v1/posts/{short_id}")
+    assert await async_redis_client.hgetall("post:views") == {short_ids[0]: "2", short_ids[1]: "1"}
+
+    updated_at_stmt = select(Post.short_id, Post.updated_at).where(Post.short_id.in_(short_ids))
+    updated_at = dict((await session.execute(updated_at_stmt)).tuples().all())
+
+    flusher = PostViewFlusher(async_redis_client, batch_size=1)
+    assert await flusher.flush(session) == 2
+    assert not await async_redis_client.exists("post:views", flusher.flushing_key)
+
+    stmt = select(Post.short_id, Post.view_count).where(Post.short_id.in_(short_ids))
+    assert dict((await session.execute(stmt)).tuples().all()) == {short_ids[0]: 2, short_ids[1]: 1}
+    assert dict((await session.execute(updated_at_stmt)).tuples().all()) == updated_at
+
+    # 누적된 조회수가 없으면 아무것도 하지 않음
+    assert await flusher.flush(session) == 0
+
+    # 이전 flush 에서 남은 처리용 key 를 먼저 반영하고, 새로 누적된 조회수는 다음 flush 에서 반영
+    await async_redis_client.hset(flusher.flushing_key, short_ids[0], 10)
+    await client.get(f"/v1/posts/{short_ids[0]}")
+    assert await flusher.flush(session) == 1
+    assert await flusher.flush(session) == 1
+    assert await session.scalar(select(Post.view_count).where(Post.short_id == short_ids[0])) == 13
+
+
+@pytest.mark.anyio
+async def test_trending_posts(
+    client: AsyncClient,
+    db_engine: AsyncEngine,
+    async_redis_client: Redis,
+    default_user_token_header: dict[str, str],
+):
+    """
+    - 조회/댓글/수정 시 가중치에 따라 인기 게시글 순위가 정해져야 합니다.
+    - 이전 활동의 점수는 시간이 지날수록 감쇠되어야 합니다.
+    - 순위는 상위 K개로 정리되고, 삭제된 게시글은 순위에서 제외되어야 합니다.
+    """
+    short_ids = []
+    for i in range(3):
+        response = await client.post(
+            "/v1/posts", json={"title": f"인기 {i}", "content": "내용"}, headers=default_user_token_header
+        )
+        short_ids.append(response.json()["short_id"])
+
+    # 조회(1) < 수정(2) < 댓글(5)
+    await client.get(f"/v1/posts/{short_ids[0]}")
+    await client.patch(f"/v1/posts/{short_ids[1]}", json={"content": "수정"}, headers=default_user_token_header)
+    await client.post(
+        "/v1/post-comments", json={"comment": "댓글", "short_id": short_ids[2]}, headers=default_user_token_header
+    )
+
+    with capture_statements(db_engine) as statements:
+        response = await client.get("/v1/posts/trending")
+    assert response.status_code == 200
+    assert [post["short_id"] for post in response.json()] == [short_ids[2], short_ids[1], short_ids[0]]
+    assert response.json()[0]["excerpt"] == "내용"
+    # 게시글 정보는 한 번의 쿼리로 조회
+    [statement] = statements
+    assert "= ANY (" in statement
+
+    response = await client.get("/v1/posts/trending", params={"limit": 1, "offset": 1})
+    assert [post["short_id"] for post in response.json()] == [short_ids[1]]
+
+    # 반감기 3번이 지난 뒤의 조회 1건(1 * 2^3)은 이전 댓글 1건(5)보다 높은 점수
+    half_life = get_setting().TRENDING_HALF_LIFE_SECONDS
+    await record_post_activity(async_redis_client, short_ids[0], "view", now=time.time() + half_life * 3)
+    response = await client.get("/v1/posts/trending")
+    assert [post["short_id"] for post in response.json()] == [short_ids[0], short_ids[2], short_ids[1]]
+
+    assert await trim_trending(async_redis_client, max_size=2) == 1
+    response = await client.delete(f"/v1/posts/{short_ids[0]}", headers=default_user_token_header)
+    assert response.status_code == 204
+    response = await client.get("/v1/posts/trending")
+    assert [post["short_id"] for post in response.json()] == [short_ids[2]]
+
+
+@pytest.mark.anyio
+async def test_batch_get_posts(client: AsyncClient, db_engine: AsyncEngine, default_user_token_header: dict[str, str]):
+    """
+    - 여러 게시글을 요청한 순서대로 반환하고, 존재하지 않는 short_id 는 missing 으로 알려야 합니다.
+    - 캐시에 없는 게시글만 한 번의 쿼리로 조회해야 합니다.
+    """
+    short_ids = []
+    for i in range(3):
+        response = await client.post(
+            "/v1/posts", json={"title": f"batch {i}", "content": "내용"}, headers=default_user_token_header
+        )
+        short_ids.append(response.json()["short_id"])
+
+    # 하나는 단건 조회로 미리 캐시
+    await client.get(f"/v1/posts/{short_ids[1]}")
+
+    request_ids = [short_ids[2], "non-existent-id", short_ids[0], short_ids[1], short_ids[2]]
+    with capture_statements(db_engine) as statements:
+        response = await client.post("/v1/posts/batch-get", json={"short_ids": request_ids})
+    assert response.status_code == 200
+    result = response.json()
+    assert [post["short_id"] for post in result["items"]] == [short_ids[2], short_ids[0], short_ids[1]]
+    assert result["items"][0]["user"]["nickname"]
+    assert result["missing"] == ["non-existent-id"]
+    [statement] = statements
+    assert "= ANY (" in statement
+
+    # 모두 캐시된 경우 DB를 조회하지 않음
+    with capture_statements(db_engine) as statements:
+        response = await client.post("/v1/posts/batch-get", json={"short_ids": short_ids})
+    assert [post["short_id"] for post in response.json()["items"]] == short_ids
+    assert statements == []
+
+    response = await client.post("/v1/posts/batch-get", json={"short_ids": []})
+    assert response.status_code == 422
+    response = await client.post("/v1/posts/batch-get", json={"short_ids": ["a"] * 301})
+    assert response.status_code == 422
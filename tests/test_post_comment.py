@@ -1,15 +1,19 @@
+from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING
 
 import pytest
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from tests.utils import create_random_post, create_random_user
+from app import crud
+from app.constants import NEXT_CURSOR_HEADER
+from app.crud.user import principal_cache
+from app.models import Post, PostComment, PostCommentArchive
+from tests.utils import capture_statements, create_random_post, create_random_user
 
 if TYPE_CHECKING:
     from httpx import AsyncClient
-    from sqlalchemy.ext.asyncio import AsyncSession
-
-    from app.models import Post
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 
 @pytest.fixture(scope="function")
@@ -98,6 +102,37 @@ async def test_edit_comment(client: AsyncClient, default_user_token_header: dict
     assert updated_comment["comment"] == "Updated Comment"
 
 
+@pytest.mark.anyio
+async def test_write_and_edit_comment_statement_count(
+    db_engine: AsyncEngine, client: AsyncClient, default_user_token_header: dict[str, str], sample_post: Post
+):
+    """
+    댓글 작성/수정은 commit 후 refresh 없이 INSERT/UPDATE ... RETURNING 한 번으로 처리되어야 합니다.
+    """
+    # 인증 사용자 정보가 캐시되도록 먼저 한 번 요청
+    # (이전 테스트에서 남은 로컬 캐시는 Redis 가 비워진 뒤 만료될 수 있으므로 비우고 다시 캐시)
+    principal_cache.local.clear()
+    await client.get("/v1/user/me", headers=default_user_token_header)
+
+    comment_data = {"comment": "Original Comment", "short_id": sample_post.short_id}
+    with capture_statements(db_engine) as statements:
+        response = await client.post("/v1/post-comments", json=comment_data, headers=default_user_token_header)
+    # 게시글 조회 + INSERT + 댓글 수 증가
+    assert len(statements) == 3
+    assert statements[1].startswith("INSERT INTO post_comments") and "RETURNING" in statements[1]
+    assert statements[2].startswith("UPDATE posts SET comment_count")
+
+    comment_id = response.json()["id"]
+    with capture_statements(db_engine) as statements:
+        response = await client.patch(
+            f"/v1/post-comments/{comment_id}", json={"comment": "Updated Comment"}, headers=default_user_token_header
+        )
+    assert response.json()["comment"] == "Updated Comment"
+    # 댓글 조회 + UPDATE
+    assert len(statements) == 2
+    assert statements[-1].startswith("UPDATE post_comments") and "RETURNING" in statements[-1]
+
+
 @pytest.mark.anyio
 async def test_edit_comment_no_change(
     client: AsyncClient, default_user_token_header: dict[str, str], sample_post: Post
@@ -131,6 +166,96 @@ async def test_delete_comment(client: AsyncClient, default_user_token_header: di
     assert response.status_code == 204
 
 
+@pytest.mark.anyio
+async def test_comment_count(client: AsyncClient, default_user_token_header: dict[str, str], sample_post: Post):
+    """
+    댓글 작성/삭제 시 게시글의 댓글 수가 증감해야 하며, 이미 삭제된 댓글은 다시 감소시키지 않아야 합니다.
+    댓글 수 변경은 게시글 수정이 아니므로 게시글의 updated_at 은 바뀌지 않아야 합니다.
+    """
+    # 캐시된 게시글도 댓글 수가 갱신되는지 확인하기 위해 먼저 조회
+    response = await client.get(f"/v1/posts/{sample_post.short_id}")
+    assert response.json()["comment_count"] == 0
+    updated_at = response.json()["updated_at"]
+
+    comment_ids = []
+    for i in range(2):
+        comment_data = {"comment": f"Comment {i}", "short_id": sample_post.short_id}
+        response = await client.post("/v1/post-comments", json=comment_data, headers=default_user_token_header)
+        comment_ids.append(response.json()["id"])
+
+    response = await client.get(f"/v1/posts/{sample_post.short_id}")
+    assert response.json()["comment_count"] == 2
+
+    response = await client.delete(f"/v1/post-comments/{comment_ids[0]}", headers=default_user_token_header)
+    assert response.status_code == 204
+    response = await client.delete(f"/v1/post-comments/{comment_ids[0]}", headers=default_user_token_header)
+    assert response.status_code == 404
+
+    response = await client.get(f"/v1/posts/{sample_post.short_id}")
+    assert response.json()["comment_count"] == 1
+
+    response = await client.get("/v1/posts", params={"limit": 100})
+    [post] = [post for post in response.json() if post["short_id"] == sample_post.short_id]
+    assert post["comment_count"] == 1
+    assert post["updated_at"] == updated_at
+
+
+@pytest.mark.anyio
+async def test_reconcile_comment_counts(session: AsyncSession, sample_post: Post):
+    """
+    어긋난 댓글 수를 배치 단위로 다시 계산해야 합니다.
+    """
+    await session.execute(update(Post).where(Post.id == sample_post.id).values(comment_count=10))
+    await session.commit()
+    updated_at = await session.scalar(select(Post.updated_at).where(Post.id == sample_post.id))
+
+    after_id, fixed = 0, []
+    while True:
+        last_id, short_ids = await crud.reconcile_post_comment_counts(session=session, after_id=after_id, batch_size=2)
+        if last_id is None:
+            break
+        assert last_id > after_id
+        fixed += short_ids
+        after_id = last_id
+
+    assert sample_post.short_id in fixed
+    assert await session.scalar(select(Post.comment_count).where(Post.id == sample_post.id)) == 0
+    assert await session.scalar(select(Post.updated_at).where(Post.id == sample_post.id)) == updated_at
+
+    # 다시 실행하면 수정할 게시글이 없음
+    _, short_ids = await crud.reconcile_post_comment_counts(session=session, batch_size=1_000_000)
+    assert short_ids == []
+
+
+@pytest.mark.anyio
+async def test_purge_deleted_comments(session: AsyncSession, sample_post: Post):
+    """
+    보관 기간이 지난 삭제된 댓글만 배치 단위로 archive 테이블에 옮겨야 합니다.
+    """
+    now = datetime.now(UTC)
+    comments = [
+        PostComment(comment="old", post_id=sample_post.id, is_delete=True, deleted_at=now - timedelta(days=40)),
+        PostComment(comment="old", post_id=sample_post.id, is_delete=True, deleted_at=now - timedelta(days=31)),
+        PostComment(comment="recent", post_id=sample_post.id, is_delete=True, deleted_at=now - timedelta(days=1)),
+        PostComment(comment="live", post_id=sample_post.id),
+    ]
+    session.add_all(comments)
+    await session.commit()
+    ids = [comment.id for comment in comments]
+
+    before = now - timedelta(days=30)
+    assert await crud.purge_deleted_post_comments(session=session, before=before, batch_size=1) == 1
+    assert await crud.purge_deleted_post_comments(session=session, before=before, batch_size=1) == 1
+    assert await crud.purge_deleted_post_comments(session=session, before=before, batch_size=1) == 0
+
+    remaining = await session.scalars(
+        select(PostComment.id).where(PostComment.id.in_(ids)).execution_options(include_deleted=True)
+    )
+    assert sorted(remaining) == ids[2:]
+    archived = await session.scalars(select(PostCommentArchive).where(PostCommentArchive.id.in_(ids)))
+    assert sorted((comment.id, comment.comment) for comment in archived) == [(ids[0], "old"), (ids[1], "old")]
+
+
 @pytest.mark.anyio
 async def test_delete_other_user_comment(
     client: AsyncClient,
@@ -150,3 +275,40 @@ async def test_delete_other_user_comment(
     # URL 수정: /v1/comments -> /v1/post-comments
     response = await client.delete(f"/v1/post-comments/{comment_id}", headers=random_user_token_header)
     assert response.status_code == 403
+
+
+@pytest.mark.anyio
+async def test_get_comments_with_cursor(
+    client: AsyncClient, default_user_token_header: dict[str, str], sample_post: Post
+):
+    """
+    X-Next-Cursor 헤더를 따라가며 특정 게시글의 댓글을 중복/누락 없이 조회할 수 있어야 합니다.
+    """
+    comments = [f"Comment {i}" for i in range(5)]
+    for comment in comments:
+        data = {"comment": comment, "short_id": sample_post.short_id}
+        await client.post("/v1/post-comments", json=data, headers=default_user_token_header)
+
+    result = []
+    params = {"post_short_id": sample_post.short_id, "order_direction": "asc", "limit": 2}
+    while True:
+        response = await client.get("/v1/post-comments", params=params)
+        assert response.status_code == 200
+        result += [comment["comment"] for comment in response.json()]
+
+        next_cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not next_cursor:
+            break
+        params["cursor"] = next_cursor
+
+    assert result == comments
+
+
+@pytest.mark.anyio
+async def test_get_comments_of_non_existent_post(client: AsyncClient):
+    """
+    존재하지 않는 게시글의 댓글 목록은 비어 있어야 합니다.
+    """
+    response = await client.get("/v1/post-comments", params={"post_short_id": "non-existent"})
+    assert response.status_code == 200
+    assert response.json() == []
@@ -1,16 +1,33 @@
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING
 
 import pytest
 from nanoid import generate
+from sqlalchemy import select, update
 
 from app import crud
-from app.models import User
-from app.schemas import PostCreate, PostFilterParams, UserCreate, VerificationCodeCreate, VerificationCodeRead
-from tests.utils import DEFAULT_USER_EMAIL, random_email, random_lower_string
+from app.models import Post, PostArchive, PostComment, PostCommentArchive, User
+from app.schemas import (
+    PostCreate,
+    PostFilterParams,
+    TimestampCursor,
+    UserCreate,
+    VerificationCodeCreate,
+    VerificationCodeRead,
+)
+from tests.utils import (
+    DEFAULT_USER_EMAIL,
+    DEFAULT_USER_NICKNAME,
+    capture_statements,
+    create_random_post,
+    create_random_user,
+    explain,
+    random_email,
+    random_lower_string,
+)
 
 if TYPE_CHECKING:
-    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 
 @pytest.mark.anyio
@@ -58,6 +75,74 @@ async def test_get_post_list_with_filter(session: AsyncSession):
     assert posts[0].created_at < posts[-1].created_at
 
 
+@pytest.mark.anyio
+async def test_get_post_list_order_by_updated_at(session: AsyncSession):
+    user = await create_random_user(session)
+    posts = [await create_random_post(session, user) for _ in range(3)]
+    await crud.update_returning(session=session, obj=posts[0], values={"title": "updated"})
+    await session.commit()
+
+    filter_params = PostFilterParams(order_by="updated_at", limit=2)
+    result = await crud.get_post_list(session=session, params=filter_params)
+    assert [post.id for post in result] == [posts[0].id, posts[2].id]
+
+    # 커서도 updated_at 기준으로 이어서 조회
+    page = await crud.get_post_page(session=session, params=filter_params)
+    filter_params = PostFilterParams(order_by="updated_at", limit=1, cursor=page.next_cursor)
+    result = await crud.get_post_list(session=session, params=filter_params)
+    assert [post.id for post in result] == [posts[1].id]
+
+
+@pytest.mark.anyio
+async def test_get_post_list_with_handle(session: AsyncSession):
+    user = await create_random_user(session)
+    posts = [await create_random_post(session, user) for _ in range(2)]
+
+    # 대소문자 구분 없이 작성자 닉네임으로 필터링
+    result = await crud.get_post_list(session=session, params=PostFilterParams(handle=user.nickname.upper()))
+    assert [post.id for post in result] == [posts[1].id, posts[0].id]
+
+    result = await crud.get_post_list(session=session, params=PostFilterParams(handle=random_lower_string(10)))
+    assert result == []
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("filter_params", "indexes"),
+    [
+        (PostFilterParams(), ["ix_posts_created_at_id"]),
+        (PostFilterParams(order_by="updated_at", end=datetime.now(UTC)), ["ix_posts_updated_at_id"]),
+        (PostFilterParams(handle=DEFAULT_USER_NICKNAME), ["ix_users_nickname_lower", "ix_posts_user_id_created_at_id"]),
+    ],
+)
+async def test_get_post_list_plan(
+    session: AsyncSession, db_engine: AsyncEngine, filter_params: PostFilterParams, indexes: list[str]
+):
+    """목록 조회 쿼리는 정렬 기준/작성자에 맞는 인덱스를 사용해야 합니다."""
+    with capture_statements(db_engine, with_parameters=True) as statements:
+        await crud.get_post_list(session=session, params=filter_params)
+
+    assert len(statements) == len(indexes)
+    for (statement, parameters), index in zip(statements, indexes, strict=True):
+        plan = await explain(session, statement, parameters)
+        assert index in plan, plan
+        # 정렬을 인덱스 순서로 처리
+        assert "Sort" not in plan, plan
+
+
+@pytest.mark.anyio
+async def test_get_post_list_with_cursor(session: AsyncSession):
+    posts = await crud.get_post_list(session=session, params=PostFilterParams(order_direction="asc"))
+    assert len(posts) > 2
+
+    cursor = TimestampCursor(at=posts[1].created_at, id=posts[1].id, order_direction="asc").encode()
+    filter_params = PostFilterParams(order_direction="asc", cursor=cursor, offset=1)
+    next_posts = await crud.get_post_list(session=session, params=filter_params)
+
+    # 커서 지정 시 offset은 무시되고 커서 다음 행부터 조회된다
+    assert [post.id for post in next_posts] == [post.id for post in posts[2:]]
+
+
 @pytest.mark.anyio
 async def test_get_post_by_short_id(session: AsyncSession):
     short_id = generate(size=12)
@@ -65,6 +150,70 @@ async def test_get_post_by_short_id(session: AsyncSession):
     assert not post
 
 
+@pytest.mark.anyio
+async def test_soft_deleted_post_excluded(session: AsyncSession):
+    """삭제(soft delete)된 게시글은 별도 조건 없이도 조회되지 않고, include_deleted 로만 조회할 수 있어야 합니다."""
+    user = await create_random_user(session)
+    posts = [await create_random_post(session, user) for _ in range(2)]
+    assert await crud.delete_post(session=session, post=posts[0])
+    assert not await crud.delete_post(session=session, post=posts[0])
+
+    assert await crud.get_post_by_short_id(session=session, short_id=posts[0].short_id) is None
+    result = await crud.get_post_list(session=session, params=PostFilterParams(handle=user.nickname))
+    assert [post.id for post in result] == [posts[1].id]
+    summaries = await crud.get_post_summaries(session=session, short_ids=[post.short_id for post in posts])
+    assert [summary.short_id for summary in summaries] == [posts[1].short_id]
+
+    stmt = select(Post).where(Post.id == posts[0].id).execution_options(include_deleted=True)
+    post = await session.scalar(stmt)
+    assert post.is_delete
+    assert post.deleted_at
+
+
+@pytest.mark.anyio
+async def test_purge_deleted_posts(session: AsyncSession):
+    """보관 기간이 지난 삭제된 게시글은 남아 있는 댓글을 배치 단위로 먼저 정리한 뒤 옮기거나 삭제해야 합니다."""
+    user = await create_random_user(session)
+    posts = [await create_random_post(session, user) for _ in range(3)]
+    session.add_all(
+        [
+            PostComment(comment="live", post_id=posts[0].id, user_id=user.id),
+            PostComment(comment="deleted", post_id=posts[0].id, user_id=user.id, is_delete=True),
+            PostComment(comment="live", post_id=posts[1].id, user_id=user.id),
+        ]
+    )
+    for post, days in zip(posts, [40, 1, 40], strict=True):
+        await crud.delete_post(session=session, post=post)
+        await session.execute(
+            update(Post).where(Post.id == post.id).values(deleted_at=datetime.now(UTC) - timedelta(days=days))
+        )
+    await session.commit()
+
+    before = datetime.now(UTC) - timedelta(days=30)
+    # 댓글이 남아 있는 게시글은 건너뛴다
+    assert await crud.purge_deleted_posts(session=session, before=before, batch_size=2) == 1
+    assert await crud.purge_comments_of_deleted_posts(session=session, before=before, batch_size=1) == 1
+    assert await crud.purge_comments_of_deleted_posts(session=session, before=before, batch_size=1) == 1
+    assert await crud.purge_comments_of_deleted_posts(session=session, before=before, batch_size=1) == 0
+    assert await crud.purge_deleted_posts(session=session, before=before, batch_size=2, archive=False) == 1
+    assert await crud.purge_deleted_posts(session=session, before=before, batch_size=2) == 0
+
+    ids = [post.id for post in posts]
+    remaining = await session.scalars(select(Post.id).where(Post.id.in_(ids)).execution_options(include_deleted=True))
+    assert list(remaining) == [posts[1].id]
+    archived = await session.scalars(select(PostArchive.short_id).where(PostArchive.id.in_(ids)))
+    assert list(archived) == [posts[2].short_id]
+    # 게시글에 남아 있던 댓글도 옮겨지고, 보관 기간이 지나지 않은 게시글의 댓글은 남아 있다
+    archived_comments = await session.scalars(
+        select(PostCommentArchive.comment).where(PostCommentArchive.post_id == ids[0])
+    )
+    assert sorted(archived_comments) == ["deleted", "live"]
+    remaining_comments = await session.scalars(
+        select(PostComment.post_id).where(PostComment.post_id.in_(ids)).execution_options(include_deleted=True)
+    )
+    assert list(remaining_comments) == [posts[1].id]
+
+
 @pytest.mark.anyio
 async def test_create_post(session: AsyncSession):
     user = await crud.get_user_by_email(session=session, email=DEFAULT_USER_EMAIL)
@@ -76,6 +225,25 @@ async def test_create_post(session: AsyncSession):
     assert post_in.title == post_db.title
     assert post_in.content == post_db.content
     assert post_db.user_id == user.id
+    assert post_db.created_at == post_db.updated_at
+
+
+@pytest.mark.anyio
+async def test_create_post_short_id_conflict(session: AsyncSession, monkeypatch):
+    """
+    short_id 가 충돌하면 rollback 없이 새 short_id 로 다시 생성해야 합니다.
+    """
+    user = await crud.get_user_by_email(session=session, email=DEFAULT_USER_EMAIL)
+    post_in = PostCreate(title=random_lower_string(20), content=random_lower_string(100), user_id=user.id)
+    exists_post = await crud.create_post(session=session, post_in=post_in)
+
+    short_ids = iter([exists_post.short_id, generate(size=12)])
+    monkeypatch.setattr("app.crud.post.generate", lambda size: next(short_ids))
+
+    post_db = await crud.create_post(session=session, post_in=post_in)
+    assert post_db.short_id != exists_post.short_id
+    assert post_db.id
+    assert post_db.created_at
 
 
 @pytest.mark.anyio
@@ -2,11 +2,13 @@ from typing import TYPE_CHECKING
 
 import pytest
 from fastapi import status
+from redis.exceptions import RedisError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud
 from app.core.security import verify_password
+from app.crud.user import principal_cache
 from app.models import User
 from app.schemas import VerificationCodeCreate
 from tests.utils import DEFAULT_USER_EMAIL, DEFAULT_USER_NICKNAME, random_email, random_lower_string
@@ -43,6 +45,26 @@ async def test_register_user(session: AsyncSession, async_redis_client, client:
     assert verify_password(password, user_db.hashed_password)
 
 
+@pytest.mark.anyio
+async def test_register_user_mail_enqueue_failure(async_redis_client, client: AsyncClient, monkeypatch) -> None:
+    """
+    가입 후 환영 메일 적재(Redis)에 실패해도 가입은 성공해야 합니다. (가입은 이미 commit 되어 재시도할 수 없음)
+    """
+    email = random_email()
+    code = "123456"
+    code_in = VerificationCodeCreate(email=email, action="signup", code=code)
+    await crud.create_verification_code(async_redis_client, code_in)
+
+    async def enqueue_mail(**_):
+        raise RedisError("connection lost")
+
+    monkeypatch.setattr(crud, "enqueue_mail", enqueue_mail)
+    data = {"nickname": random_lower_string(10), "email": email, "password": "Test1234!", "verification_code": code}
+    result = await client.post("/v1/user/register", json=data)
+    assert result.status_code == status.HTTP_201_CREATED
+    assert result.json()["email"] == email
+
+
 @pytest.mark.anyio
 async def test_get_user_me(client: AsyncClient, default_user_token_header: dict[str, str]) -> None:
     result = await client.get("/v1/user/me", headers=default_user_token_header)
@@ -89,3 +111,34 @@ async def test_update_user_me_without_data(
     user = await crud.get_user_by_email(session=session, email=DEFAULT_USER_EMAIL)
     assert result.status_code == status.HTTP_200_OK
     assert user.nickname == DEFAULT_USER_NICKNAME
+
+
+@pytest.mark.anyio
+async def test_principal_cache(session: AsyncSession, client: AsyncClient, default_user_token_header: dict[str, str]):
+    """
+    - 인증 사용자 정보는 캐시되고, 내 정보 수정 시 무효화되어야 합니다.
+    - 비활성화된 사용자는 인증에 실패해야 합니다.
+    """
+    user = await crud.get_user_by_email(session=session, email=DEFAULT_USER_EMAIL)
+
+    # 1. 인증 요청 후 캐시에 저장됨
+    await client.get("/v1/user/me", headers=default_user_token_header)
+    hits = principal_cache.stats.hits
+    await client.get("/v1/user/me", headers=default_user_token_header)
+    assert principal_cache.stats.hits == hits + 1
+
+    # 2. 닉네임 변경 시 캐시 무효화
+    await client.patch("/v1/user/me", headers=default_user_token_header, json={"nickname": "principal"})
+    principal = await crud.get_principal(session=session, user_id=user.id)
+    assert principal.nickname == "principal"
+
+    # 3. 비활성화 후 캐시를 무효화하면 인증 실패
+    user.is_active = False
+    await session.commit()
+    await crud.invalidate_principal(user_id=user.id)
+
+    result = await client.get("/v1/user/me", headers=default_user_token_header)
+    assert result.status_code == status.HTTP_401_UNAUTHORIZED
+
+    result = await client.delete("/v1/posts/non-existent-id", headers=default_user_token_header)
+    assert result.status_code == status.HTTP_401_UNAUTHORIZED
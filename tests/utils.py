@@ -1,13 +1,19 @@
 import random
 import string
-from typing import TYPE_CHECKING
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import event
 
 from app import crud
 from app.schemas import PostCreate, UserCreate
 
 if TYPE_CHECKING:
+    import asyncio
+    from collections.abc import Iterator
+
     from httpx import AsyncClient
-    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
     from app.models import Post, User
 
@@ -105,3 +111,73 @@ async def get_user_token(*, client: AsyncClient, email: str, password: str) -> d
     auth_token = response["access_token"]
     headers = {"Authorization": f"Bearer {auth_token}"}
     return headers
+
+
+class SMTPSink:
+    """
+    테스트용 최소 SMTP 서버. 받은 메일 원문을 messages 에, 연결 수를 connections 에 기록합니다.
+    """
+
+    def __init__(self):
+        self.messages: list[bytes] = []
+        self.connections = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        writer.write(b"220 sink ESMTP\r\n")
+        await writer.drain()
+
+        while line := await reader.readline():
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                writer.write(b"250 sink\r\n")
+            elif command == "DATA":
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                await writer.drain()
+                lines = []
+                while (data_line := await reader.readline()) not in (b".\r\n", b""):
+                    lines.append(data_line)
+                self.messages.append(b"".join(lines))
+                writer.write(b"250 OK\r\n")
+            elif command == "QUIT":
+                writer.write(b"221 Bye\r\n")
+                await writer.drain()
+                break
+            else:  # MAIL, RCPT, RSET, NOOP
+                writer.write(b"250 OK\r\n")
+            await writer.drain()
+
+        writer.close()
+
+
+@contextmanager
+def capture_statements(engine: AsyncEngine, *, with_parameters: bool = False) -> Iterator[list]:
+    """
+    블록 안에서 실행된 SQL 문을 기록합니다. (테스트 세션이 commit 시 사용하는 SAVEPOINT 관련 문은 제외)
+    with_parameters 를 지정하면 (SQL 문, 파라미터) 를 기록합니다.
+    """
+    statements: list = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not statement.startswith(("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")):
+            statements.append((statement, parameters) if with_parameters else statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def explain(session: AsyncSession, statement: str, parameters: Any) -> str:
+    """
+    SQL 문의 실행 계획을 반환합니다.
+    테스트 데이터가 적으면 인덱스가 있어도 seq scan 이 선택되므로 seq scan 을 끈 상태에서 확인합니다.
+    """
+    connection = await session.connection()
+    await connection.exec_driver_sql("SET enable_seqscan = off")
+    try:
+        result = await connection.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+        return "\n".join(row[0] for row in result)
+    finally:
+        await connection.exec_driver_sql("RESET enable_seqscan")